@@ -4,26 +4,44 @@ from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
-from app.repositories.registration import get_registration_by_member_id
-from app.services.member_session import extract_member_id_from_token
+from app.repositories.registration import get_member_auth_snapshot
+from app.services.member_cache import MemberAuthSnapshot
+from app.services.member_session import MemberTokenClaims, decode_member_token, session_registry
 
 settings = get_settings()
 
 
-def require_member_auth(authorization: Optional[str], db: Session):
+def _decode_member_claims(authorization: Optional[str]) -> MemberTokenClaims:
     if not authorization:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing Authorization header")
     parts = authorization.split(" ", 1)
     if len(parts) != 2 or parts[0].lower() != "bearer":
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid auth header format")
 
-    member_id = extract_member_id_from_token(parts[1].strip(), settings.member_session_secret)
-    if not member_id:
+    claims = decode_member_token(parts[1].strip(), settings.member_session_secret)
+    if not claims or (claims.legacy and not settings.member_session_accept_legacy_tokens):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid session token")
+    if claims.is_expired():
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Session expired. Please login again.")
+    return claims
 
-    registration = get_registration_by_member_id(db, member_id)
-    if not registration:
+
+def require_member_claims(authorization: Optional[str]) -> MemberTokenClaims:
+    """Authorize from the signed token and the in-memory revocation registry alone, without a DB read."""
+    claims = _decode_member_claims(authorization)
+    if not session_registry.is_current(claims):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Session expired. Please login again.")
+    return claims
+
+
+def require_member_auth(authorization: Optional[str], db: Session) -> MemberAuthSnapshot:
+    claims = _decode_member_claims(authorization)
+
+    snapshot = get_member_auth_snapshot(db, claims.member_id)
+    if not snapshot:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Member not found")
-    if not registration.is_active:
+    if not snapshot.is_active:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Your account is disabled. Contact support.")
-    return registration
+    if claims.session_version < snapshot.session_version or not session_registry.is_current(claims):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Session expired. Please login again.")
+    return snapshot
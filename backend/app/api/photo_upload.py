@@ -0,0 +1,123 @@
+from typing import Any, Optional
+
+from fastapi import HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+from app.services.photo_store import (
+    PhotoTooLargeError,
+    PhotoWriter,
+    StoredPhoto,
+    UnsupportedPhotoTypeError,
+    externalize_photo_value,
+    photo_store,
+)
+from app.services.photo_variants import photo_variants
+
+# Headroom for multipart boundaries and part headers on top of the photo size cap.
+_MULTIPART_OVERHEAD_BYTES = 16 * 1024
+
+
+class _PhotoPartCollector:
+    def __init__(self, field_name: str):
+        self.field_name = field_name
+        self.filename: Optional[str] = None
+        self.writer: Optional[PhotoWriter] = None
+        self.error: Optional[Exception] = None
+        self._header_field = b""
+        self._header_value = b""
+        self._headers: dict[bytes, bytes] = {}
+        self._receiving = False
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        }
+
+    def _on_part_begin(self) -> None:
+        self._headers = {}
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        name = options.get(b"name", b"").decode("utf-8", "replace")
+        if name == self.field_name and self.writer is None:
+            self.filename = options.get(b"filename", b"").decode("utf-8", "replace") or None
+            self.writer = photo_store.open_writer()
+            self._receiving = True
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._receiving and self.error is None:
+            try:
+                self.writer.write(data[start:end])
+            except PhotoTooLargeError as exc:
+                self.error = exc
+
+    def _on_part_end(self) -> None:
+        self._receiving = False
+
+
+async def receive_photo_upload(request: Request, field_name: str = "file") -> tuple[StoredPhoto, Optional[str]]:
+    """Stream a multipart photo upload straight into the photo store without buffering the request body."""
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    boundary = options.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Expected a multipart/form-data upload")
+
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit():
+        if int(content_length) > photo_store.max_bytes + _MULTIPART_OVERHEAD_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Photo must be {photo_store.max_bytes // (1024 * 1024)}MB or smaller",
+            )
+
+    collector = _PhotoPartCollector(field_name)
+    parser = MultipartParser(boundary, collector.callbacks())
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            if collector.error is not None:
+                raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(collector.error))
+        parser.finalize()
+        if collector.writer is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Missing '{field_name}' file part")
+        stored = await run_in_threadpool(collector.writer.commit)
+    except UnsupportedPhotoTypeError as exc:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(exc))
+    except Exception:
+        if collector.writer is not None:
+            collector.writer.abort()
+        raise
+    return stored, collector.filename
+
+
+def externalize_profile_photo(extra_data: Optional[dict[str, Any]]) -> Optional[dict[str, Any]]:
+    """Replace an inline data-URL profilePhoto in submitted extra data with a photo store reference."""
+    if not extra_data or "profilePhoto" not in extra_data:
+        return extra_data
+    try:
+        photo = externalize_photo_value(extra_data["profilePhoto"])
+    except PhotoTooLargeError as exc:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(exc))
+    except UnsupportedPhotoTypeError as exc:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(exc))
+    if photo is not extra_data["profilePhoto"]:
+        photo_variants.schedule(photo["hash"])
+    return {**extra_data, "profilePhoto": photo}
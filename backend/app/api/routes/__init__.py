@@ -1,3 +1,3 @@
-from app.api.routes import admin, auth, health, member_profiles, profile_share, public, registrations
+from app.api.routes import admin, auth, health, member_profiles, photos, profile_share, public, registrations
 
-__all__ = ["health", "registrations", "auth", "admin", "member_profiles", "profile_share", "public"]
+__all__ = ["health", "registrations", "auth", "admin", "member_profiles", "profile_share", "public", "photos"]
@@ -3,12 +3,15 @@ from math import ceil
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.api.dependencies import require_admin_auth
+from app.api.photo_upload import externalize_profile_photo
 from app.core.config import get_settings
 from app.db.session import get_db
 from app.repositories.registration import (
+    detach_registration,
     get_registration_by_member_id,
     list_registrations_paginated,
     reset_registration_password,
@@ -23,6 +26,18 @@ from app.schemas.admin import (
     AdminRegistrationUpdateRequest,
     AdminResetPasswordRequest,
 )
+from app.services.count_cache import registration_count_cache
+from app.services.member_cache import member_snapshot_cache
+from app.services.member_session import session_registry, verified_token_cache
+from app.services.photo_variants import photo_variants
+from app.services.profile_features import profile_feature_index
+from app.services.public_carousel import public_carousel_cache
+from app.services.recommendations import recommendation_pool_cache
+from app.services.security import hash_password_async, password_hasher
+from app.services.share_access import share_access_tracker
+from app.services.share_link_sweeper import share_link_sweeper
+from app.services.share_token import revoked_share_links
+from app.services.shared_profile_cache import shared_profile_cache
 
 router = APIRouter(prefix="/admin")
 settings = get_settings()
@@ -37,6 +52,25 @@ def admin_login(payload: AdminLoginRequest) -> AdminLoginResponse:
     return AdminLoginResponse(token=settings.admin_token)
 
 
+@router.get("/metrics", dependencies=[Depends(require_admin_auth)])
+def admin_metrics() -> dict[str, dict]:
+    return {
+        "password_hasher": password_hasher.metrics(),
+        "member_auth_cache": member_snapshot_cache.metrics(),
+        "member_token_cache": verified_token_cache.metrics(),
+        "member_session_registry": session_registry.metrics(),
+        "registration_count_cache": registration_count_cache.metrics(),
+        "photo_variants": photo_variants.metrics(),
+        "recommendation_pool_cache": recommendation_pool_cache.metrics(),
+        "similar_profiles": profile_feature_index.metrics(),
+        "share_access": share_access_tracker.metrics(),
+        "shared_profile_cache": shared_profile_cache.metrics(),
+        "share_tokens": revoked_share_links.metrics(),
+        "share_link_sweeper": share_link_sweeper.metrics(),
+        "public_carousel": public_carousel_cache.metrics(),
+    }
+
+
 @router.get(
     "/registrations",
     response_model=AdminRegistrationListResponse,
@@ -52,9 +86,12 @@ def admin_list_registrations(
     max_credits: Optional[int] = Query(default=None, alias="maxCredits", ge=0),
     sort_by: str = Query(default="created_at", alias="sortBy"),
     sort_order: str = Query(default="desc", alias="sortOrder"),
+    include_total: bool = Query(default=True, alias="includeTotal"),
+    estimate_total: bool = Query(default=False, alias="estimateTotal"),
+    fuzzy: bool = Query(default=False),
     db: Session = Depends(get_db),
 ) -> AdminRegistrationListResponse:
-    rows, total = list_registrations_paginated(
+    rows, total, total_estimated = list_registrations_paginated(
         db=db,
         page=page,
         page_size=page_size,
@@ -65,6 +102,9 @@ def admin_list_registrations(
         max_credits=max_credits,
         sort_by=sort_by,
         sort_order=sort_order,
+        include_total=include_total,
+        estimate_total=estimate_total,
+        fuzzy=fuzzy,
     )
 
     items = [
@@ -85,16 +125,19 @@ def admin_list_registrations(
             status=row.status,
             is_active=row.is_active,
             credits=row.credits,
-            extra_data=row.extra_data or {},
+            extra_data=extra_data,
             created_at=row.created_at,
             updated_at=row.updated_at,
         )
-        for row in rows
+        for row, extra_data in rows
     ]
-    total_pages = ceil(total / page_size) if total > 0 else 1
+    total_pages = None
+    if total is not None:
+        total_pages = ceil(total / page_size) if total > 0 else 1
     return AdminRegistrationListResponse(
         items=items,
         total=total,
+        total_estimated=total_estimated,
         page=page,
         page_size=page_size,
         total_pages=total_pages,
@@ -121,7 +164,9 @@ def admin_update_registration(
         if key == "isActive":
             updates["is_active"] = value
         elif key == "extraData":
-            updates["extra_data"] = value or {}
+            updates["extra_data"] = externalize_profile_photo(value) or {}
+        elif key == "status" and value is None:
+            continue
         else:
             updates[key] = value
 
@@ -154,7 +199,7 @@ def admin_update_registration(
     response_model=AdminActionResponse,
     dependencies=[Depends(require_admin_auth)],
 )
-def admin_reset_password(
+async def admin_reset_password(
     member_id: str,
     payload: AdminResetPasswordRequest,
     db: Session = Depends(get_db),
@@ -162,9 +207,12 @@ def admin_reset_password(
     if len(payload.newPassword) < 4:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Password must be at least 4 characters")
 
-    registration = get_registration_by_member_id(db, member_id)
+    registration = await run_in_threadpool(
+        lambda: detach_registration(db, get_registration_by_member_id(db, member_id))
+    )
     if not registration:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Member not found")
 
-    reset_registration_password(db, registration, payload.newPassword)
+    password_hash = await hash_password_async(payload.newPassword)
+    await run_in_threadpool(reset_registration_password, db, registration, password_hash)
     return AdminActionResponse(message="Password reset successful")
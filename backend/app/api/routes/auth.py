@@ -1,13 +1,18 @@
 from typing import Optional
 
 from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
+from app.api.dependencies_member import require_member_auth
+from app.api.photo_upload import externalize_profile_photo
 from app.db.session import get_db
 from app.core.config import get_settings
 from app.repositories.profile import list_recent_profiles_for_member
 from app.repositories.registration import (
+    detach_registration,
     get_registration_by_member_id,
+    reset_registration_password,
     update_registration_member_fields,
 )
 from app.schemas.auth import (
@@ -18,8 +23,8 @@ from app.schemas.auth import (
     MemberProfile,
     MemberProfileUpdateRequest,
 )
-from app.services.member_session import create_member_token, extract_member_id_from_token
-from app.services.security import hash_password, verify_password
+from app.services.member_session import create_member_token
+from app.services.security import hash_password_async, verify_password_async
 
 router = APIRouter()
 settings = get_settings()
@@ -41,16 +46,16 @@ ALLOWED_MEMBER_EDITABLE_EXTRA_FIELDS = {
 
 
 def _build_member_login_response(registration, db: Session) -> MemberLoginResponse:
-    profile_pairs, _ = list_recent_profiles_for_member(db, registration)
+    profile_pairs, _, _ = list_recent_profiles_for_member(db, registration)
     profiles = [profile for profile, _ in profile_pairs]
     response_profiles = [
         MemberProfile(
             sNo=index,
             profileId=profile.member_id,
             name=profile.name,
-            height="-",
-            starPadham="-",
-            hasPhoto=False,
+            height=profile.height or "-",
+            starPadham=profile.star_padham or "-",
+            hasPhoto=bool(profile.has_photo),
         )
         for index, profile in enumerate(profiles, start=1)
     ]
@@ -74,33 +79,34 @@ def _build_member_login_response(registration, db: Session) -> MemberLoginRespon
             credits=registration.credits,
         ),
         profiles=response_profiles,
-        token=create_member_token(registration.member_id, settings.member_session_secret),
+        token=_issue_member_token(registration),
     )
 
 
-def _get_member_from_auth_header(authorization: Optional[str], db: Session):
-    if not authorization:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing Authorization header")
-    parts = authorization.split(" ", 1)
-    if len(parts) != 2 or parts[0].lower() != "bearer":
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid auth header format")
+def _issue_member_token(registration) -> str:
+    return create_member_token(
+        registration.member_id,
+        settings.member_session_secret,
+        gender=registration.gender,
+        session_version=registration.session_version or 0,
+        ttl_seconds=settings.member_session_ttl_seconds,
+    )
 
-    member_id = extract_member_id_from_token(parts[1].strip(), settings.member_session_secret)
-    if not member_id:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid session token")
 
-    registration = get_registration_by_member_id(db, member_id)
+def _get_member_from_auth_header(authorization: Optional[str], db: Session):
+    snapshot = require_member_auth(authorization, db)
+    registration = get_registration_by_member_id(db, snapshot.member_id)
     if not registration:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Member not found")
-    if not registration.is_active:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Your account is disabled. Contact support.")
     return registration
 
 
 @router.post("/member-login", response_model=MemberLoginResponse)
-def member_login(payload: MemberLoginRequest, db: Session = Depends(get_db)) -> MemberLoginResponse:
-    registration = get_registration_by_member_id(db, payload.memberId)
-    if not registration or not verify_password(payload.password, registration.password_hash):
+async def member_login(payload: MemberLoginRequest, db: Session = Depends(get_db)) -> MemberLoginResponse:
+    registration = await run_in_threadpool(
+        lambda: detach_registration(db, get_registration_by_member_id(db, payload.memberId))
+    )
+    if not registration or not await verify_password_async(payload.password, registration.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid member ID or password",
@@ -116,7 +122,7 @@ def member_login(payload: MemberLoginRequest, db: Session = Depends(get_db)) ->
             detail="No credits remaining. Contact admin.",
         )
 
-    return _build_member_login_response(registration, db)
+    return await run_in_threadpool(_build_member_login_response, registration, db)
 
 
 @router.get("/member-session", response_model=MemberLoginResponse)
@@ -160,7 +166,7 @@ def member_update_profile(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"These fields are not editable: {', '.join(disallowed_keys)}",
             )
-        sanitized_extra_data = {key: payload.extraData[key] for key in submitted_keys}
+        sanitized_extra_data = externalize_profile_photo({key: payload.extraData[key] for key in submitted_keys})
 
     updated = update_registration_member_fields(
         db,
@@ -190,13 +196,15 @@ def member_update_profile(
 
 
 @router.post("/member-password")
-def member_change_password(
+async def member_change_password(
     payload: MemberChangePasswordRequest,
     authorization: Optional[str] = Header(default=None),
     db: Session = Depends(get_db),
 ) -> dict:
-    registration = _get_member_from_auth_header(authorization, db)
-    if not verify_password(payload.currentPassword, registration.password_hash):
+    registration = await run_in_threadpool(
+        lambda: detach_registration(db, _get_member_from_auth_header(authorization, db))
+    )
+    if not await verify_password_async(payload.currentPassword, registration.password_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect",
@@ -212,7 +220,6 @@ def member_change_password(
             detail="New password must be different from current password",
         )
 
-    registration.password_hash = hash_password(payload.newPassword)
-    db.add(registration)
-    db.commit()
-    return {"message": "Password updated successfully"}
+    password_hash = await hash_password_async(payload.newPassword)
+    updated = await run_in_threadpool(reset_registration_password, db, registration, password_hash)
+    return {"message": "Password updated successfully", "token": _issue_member_token(updated)}
@@ -1,5 +1,4 @@
 from math import ceil
-from datetime import date
 from typing import Optional
 
 from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
@@ -8,68 +7,69 @@ from sqlalchemy.orm import Session
 from app.api.dependencies_member import require_member_auth
 from app.db.session import get_db
 from app.repositories.profile import (
+    ProfileFeedFilters,
+    decode_profile_cursor,
+    decode_recommendation_cursor,
+    get_member_location,
     get_profile_for_member,
+    list_feed_facets,
     list_recent_profiles_for_member,
+    list_recommended_profiles_for_member,
+    list_similar_profiles_for_member,
     unlock_profile_for_member,
+    unlock_profiles_for_member,
 )
 from app.schemas.member_profiles import (
+    BulkUnlockedProfile,
+    BulkUnlockRequest,
+    BulkUnlockResponse,
     MemberProfileBasic,
     MemberProfileDetailResponse,
     MemberProfileDetails,
+    MemberProfileFacetValue,
+    MemberProfileFacetsResponse,
     MemberProfileListResponse,
+    MemberProfileSimilarResponse,
     UnlockProfileResponse,
 )
+from app.services.birth_date import calculate_age
+from app.services.gazetteer import resolve_location
+from app.services.photo_variants import CARD_WIDTH, photo_variant_url
 
 router = APIRouter(prefix="/member-profiles")
 
-
-def _calculate_age(dob: Optional[str]) -> Optional[int]:
-    if not dob:
-        return None
-    try:
-        year, month, day = [int(part) for part in dob.split("-")]
-        born = date(year, month, day)
-    except Exception:
-        return None
-    today = date.today()
-    return today.year - born.year - ((today.month, today.day) < (born.month, born.day))
+# Radius used when a feed request names a place (near=...) without radiusKm.
+DEFAULT_NEAR_RADIUS_KM = 100.0
 
 
-def _to_basic(profile, unlocked: bool) -> MemberProfileBasic:
-    extra_data = profile.extra_data if isinstance(profile.extra_data, dict) else {}
-    nakshatra = str(extra_data.get("nakshatra") or "").strip()
-    padham = str(extra_data.get("padham") or "").strip()
-    star_value = str(extra_data.get("starPadham") or "").strip()
-    if not star_value:
-        if nakshatra and padham:
-            star_value = f"{nakshatra} - {padham}"
-        elif nakshatra:
-            star_value = nakshatra
-        else:
-            star_value = "-"
-
-    image_url = extra_data.get("imageUrl")
-    if not image_url and isinstance(extra_data.get("profilePhoto"), dict):
-        image_url = None
+def _to_basic(profile, unlocked: bool, compatibility_score: Optional[int] = None) -> MemberProfileBasic:
+    image_url = profile.image_url
+    extra_data = getattr(profile, "extra_data", None)
+    if not image_url and isinstance(extra_data, dict) and isinstance(extra_data.get("imageUrl"), str):
+        # Full rows (detail, unlock) carry URLs too long for the card column only in extra_data.
+        image_url = extra_data["imageUrl"].strip() or None
+    if not image_url and profile.photo_hash:
+        image_url = photo_variant_url(profile.photo_hash, CARD_WIDTH)
 
     return MemberProfileBasic(
         profile_id=profile.member_id,
         name=profile.name,
         gender=profile.gender,
-        age=_calculate_age(profile.dob),
-        height=str(extra_data.get("height") or "-"),
-        star_padham=star_value,
-        rasi=str(extra_data.get("rasi") or "") or None,
-        nakshatra=nakshatra or None,
-        sect=str(extra_data.get("sect") or "") or None,
-        subsect=str(extra_data.get("subsect") or "") or None,
-        horoscope_matching_required=str(extra_data.get("horoscopeMatchingRequired") or "") or None,
-        city=profile.city or str(extra_data.get("currentLocation") or "") or None,
+        age=calculate_age(profile.birth_date),
+        height=profile.height or "-",
+        star_padham=profile.star_padham or "-",
+        rasi=profile.rasi,
+        nakshatra=profile.nakshatra,
+        sect=profile.sect,
+        subsect=profile.subsect,
+        horoscope_matching_required=profile.horoscope_matching_required,
+        city=profile.city or profile.current_location,
         education=profile.education,
         occupation=profile.occupation,
         image_url=image_url,
-        has_photo=bool(extra_data.get("hasPhoto", False) or extra_data.get("profilePhoto")),
+        has_photo=bool(profile.has_photo),
         unlocked=unlocked,
+        compatibility_score=compatibility_score,
     )
 
 
@@ -90,21 +90,78 @@ def _to_full_details(profile) -> MemberProfileDetails:
     )
 
 
+def _clean_values(values: Optional[list[str]]) -> tuple[str, ...]:
+    return tuple(sorted({value.strip() for value in values or [] if value.strip()}))
+
+
 @router.get("/recent", response_model=MemberProfileListResponse)
 def list_recent_profiles(
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=20, alias="pageSize", ge=1, le=100),
+    cursor: Optional[str] = Query(default=None),
+    include_total: bool = Query(default=True, alias="includeTotal"),
+    age_min: Optional[int] = Query(default=None, alias="ageMin", ge=18, le=100),
+    age_max: Optional[int] = Query(default=None, alias="ageMax", ge=18, le=100),
+    city: Optional[list[str]] = Query(default=None),
+    rasi: Optional[list[str]] = Query(default=None),
+    nakshatra: Optional[list[str]] = Query(default=None),
+    sect: Optional[list[str]] = Query(default=None),
+    subsect: Optional[list[str]] = Query(default=None),
+    education: Optional[list[str]] = Query(default=None),
+    has_photo: Optional[bool] = Query(default=None, alias="hasPhoto"),
+    near: Optional[str] = Query(default=None, max_length=200),
+    radius_km: Optional[float] = Query(default=None, alias="radiusKm", gt=0, le=2000),
     authorization: Optional[str] = Header(default=None),
     db: Session = Depends(get_db),
 ) -> MemberProfileListResponse:
     member = require_member_auth(authorization, db)
-    pairs, total = list_recent_profiles_for_member(
+    if age_min is not None and age_max is not None and age_min > age_max:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="ageMin cannot exceed ageMax")
+    centre = None
+    if near:
+        location = resolve_location(near)
+        if location is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unknown location")
+        centre = (location.latitude, location.longitude)
+        radius_km = radius_km or DEFAULT_NEAR_RADIUS_KM
+    elif radius_km is not None:
+        # "Near me": centred on the member's own resolved location.
+        centre = get_member_location(db, member.member_id)
+        if centre is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Add a recognised city to your profile to search by distance",
+            )
+    filters = ProfileFeedFilters(
+        age_min=age_min,
+        age_max=age_max,
+        cities=_clean_values(city),
+        rasis=_clean_values(rasi),
+        nakshatras=_clean_values(nakshatra),
+        sects=_clean_values(sect),
+        subsects=_clean_values(subsect),
+        educations=_clean_values(education),
+        has_photo=has_photo,
+        near=centre,
+        radius_km=radius_km if centre is not None else None,
+    )
+    decoded_cursor = None
+    if cursor:
+        decoded_cursor = decode_profile_cursor(cursor)
+        if decoded_cursor is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    pairs, total, next_cursor = list_recent_profiles_for_member(
         db,
         member,
         page=page,
         page_size=page_size,
+        cursor=decoded_cursor,
+        include_total=include_total,
+        filters=filters,
     )
-    total_pages = ceil(total / page_size) if total > 0 else 1
+    total_pages = None
+    if total is not None:
+        total_pages = ceil(total / page_size) if total > 0 else 1
     return MemberProfileListResponse(
         items=[_to_basic(profile, unlocked) for profile, unlocked in pairs],
         credits_remaining=member.credits,
@@ -112,6 +169,59 @@ def list_recent_profiles(
         page=page,
         page_size=page_size,
         total_pages=total_pages,
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/recommended", response_model=MemberProfileListResponse)
+def list_recommended_profiles(
+    page: int = Query(default=1, ge=1),
+    page_size: int = Query(default=20, alias="pageSize", ge=1, le=100),
+    cursor: Optional[str] = Query(default=None),
+    include_total: bool = Query(default=True, alias="includeTotal"),
+    authorization: Optional[str] = Header(default=None),
+    db: Session = Depends(get_db),
+) -> MemberProfileListResponse:
+    member = require_member_auth(authorization, db)
+    decoded_cursor = None
+    if cursor:
+        decoded_cursor = decode_recommendation_cursor(cursor)
+        if decoded_cursor is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    items, total, next_cursor = list_recommended_profiles_for_member(
+        db,
+        member,
+        page=page,
+        page_size=page_size,
+        cursor=decoded_cursor,
+        include_total=include_total,
+    )
+    total_pages = None
+    if total is not None:
+        total_pages = ceil(total / page_size) if total > 0 else 1
+    return MemberProfileListResponse(
+        items=[_to_basic(profile, unlocked, score) for profile, unlocked, score in items],
+        credits_remaining=member.credits,
+        total=total,
+        page=page,
+        page_size=page_size,
+        total_pages=total_pages,
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/facets", response_model=MemberProfileFacetsResponse)
+def list_profile_facets(
+    authorization: Optional[str] = Header(default=None),
+    db: Session = Depends(get_db),
+) -> MemberProfileFacetsResponse:
+    member = require_member_auth(authorization, db)
+    facets = list_feed_facets(db, member)
+    return MemberProfileFacetsResponse(
+        facets={
+            name: [MemberProfileFacetValue(value=value, count=count) for value, count in values]
+            for name, values in facets.items()
+        }
     )
 
 
@@ -139,6 +249,55 @@ def get_profile_detail(
     )
 
 
+@router.get("/{profile_id}/similar", response_model=MemberProfileSimilarResponse)
+def list_similar_profiles(
+    profile_id: str,
+    limit: int = Query(default=10, ge=1, le=50),
+    authorization: Optional[str] = Header(default=None),
+    db: Session = Depends(get_db),
+) -> MemberProfileSimilarResponse:
+    member = require_member_auth(authorization, db)
+    pairs = list_similar_profiles_for_member(db, member, profile_id, limit=limit)
+    if pairs is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return MemberProfileSimilarResponse(
+        items=[_to_basic(profile, unlocked) for profile, unlocked in pairs],
+        credits_remaining=member.credits,
+    )
+
+
+@router.post("/unlock", response_model=BulkUnlockResponse)
+def unlock_profiles(
+    payload: BulkUnlockRequest,
+    authorization: Optional[str] = Header(default=None),
+    db: Session = Depends(get_db),
+) -> BulkUnlockResponse:
+    """Unlock a shortlist at once. Credits are spent in list order; whatever the balance cannot cover is
+    returned in insufficientCredits (still locked, nothing charged for it) and unknown or ineligible IDs in
+    notFound, so a partially funded request still succeeds for the profiles it could pay for."""
+    member = require_member_auth(authorization, db)
+    result = unlock_profiles_for_member(db, member, payload.profileIds)
+    if result.insufficient_credits:
+        message = f"Unlocked {result.credits_spent} profile(s); not enough credits for {len(result.insufficient_credits)}"
+    else:
+        message = f"Unlocked {result.credits_spent} profile(s)"
+    return BulkUnlockResponse(
+        message=message,
+        items=[
+            BulkUnlockedProfile(
+                profile=_to_basic(profile, True),
+                full_details=_to_full_details(profile),
+                newly_unlocked=newly_unlocked,
+            )
+            for profile, newly_unlocked in result.unlocked
+        ],
+        not_found=result.not_found,
+        insufficient_credits=result.insufficient_credits,
+        credits_spent=result.credits_spent,
+        credits_remaining=result.credits_remaining,
+    )
+
+
 @router.post("/{profile_id}/unlock", response_model=UnlockProfileResponse)
 def unlock_profile(
     profile_id: str,
@@ -159,7 +318,7 @@ def unlock_profile(
         )
 
     try:
-        _, credits_remaining = unlock_profile_for_member(db, member, profile)
+        newly_unlocked, credits_remaining = unlock_profile_for_member(db, member, profile)
     except ValueError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -167,7 +326,7 @@ def unlock_profile(
         )
 
     return UnlockProfileResponse(
-        message="Full profile unlocked successfully",
+        message="Full profile unlocked successfully" if newly_unlocked else "Full profile already unlocked",
         profile=_to_basic(profile, True),
         full_details=_to_full_details(profile),
         credits_remaining=credits_remaining,
@@ -0,0 +1,76 @@
+import asyncio
+import re
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Request, status
+from fastapi.responses import FileResponse, Response
+
+from app.api.dependencies_member import require_member_claims
+from app.api.photo_upload import receive_photo_upload
+from app.services.http_cache import etag_matches
+from app.services.photo_store import photo_reference, photo_store
+from app.services.photo_variants import PHOTO_VARIANT_FORMATS, PHOTO_VARIANT_WIDTHS, photo_variants
+
+router = APIRouter(prefix="/photos")
+
+# Blobs are addressed by their SHA-256, so a URL never changes content and can be cached forever.
+PHOTO_CACHE_CONTROL = "public, max-age=31536000, immutable"
+VARIANT_NAME_PATTERN = re.compile(r"^w(\d+)\.([a-z]+)$")
+
+
+@router.post("", status_code=status.HTTP_201_CREATED)
+async def upload_photo(
+    request: Request,
+    authorization: Optional[str] = Header(default=None),
+) -> dict:
+    require_member_claims(authorization)
+    stored, filename = await receive_photo_upload(request)
+    photo_variants.schedule(stored.hash)
+    return photo_reference(stored, name=filename)
+
+
+@router.get("/{photo_hash}")
+def get_photo(
+    photo_hash: str,
+    if_none_match: Optional[str] = Header(default=None),
+) -> Response:
+    found = photo_store.find(photo_hash)
+    if found is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Photo not found")
+
+    path, content_type = found
+    etag = f'"{photo_hash}"'
+    headers = {"ETag": etag, "Cache-Control": PHOTO_CACHE_CONTROL}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    # FileResponse streams from disk and uses the server's zero-copy send extension when available.
+    return FileResponse(path, media_type=content_type, headers=headers)
+
+
+@router.get("/{photo_hash}/{variant}")
+async def get_photo_variant(
+    photo_hash: str,
+    variant: str,
+    if_none_match: Optional[str] = Header(default=None),
+) -> Response:
+    match = VARIANT_NAME_PATTERN.match(variant)
+    if (
+        match is None
+        or int(match.group(1)) not in PHOTO_VARIANT_WIDTHS
+        or match.group(2) not in PHOTO_VARIANT_FORMATS
+        or photo_store.find(photo_hash) is None
+    ):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Photo not found")
+
+    width, extension = int(match.group(1)), match.group(2)
+    etag = f'"{photo_hash}-{variant}"'
+    headers = {"ETag": etag, "Cache-Control": PHOTO_CACHE_CONTROL}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    # Generated on first request; later requests (and concurrent ones) reuse the cached file or in-flight job.
+    path = await asyncio.wrap_future(photo_variants.submit(photo_hash, width, extension))
+    if path is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Photo not found")
+    _, content_type = PHOTO_VARIANT_FORMATS[extension]
+    return FileResponse(path, media_type=content_type, headers=headers)
@@ -1,41 +1,40 @@
-from datetime import date
+from datetime import timezone
 from typing import Any, Optional
 
-from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 from sqlalchemy.orm import Session
 
-from app.api.dependencies_member import require_member_auth
+from app.api.dependencies_member import require_member_claims
+from app.core.config import get_settings
 from app.db.session import get_db
 from app.repositories.profile_share import (
     create_profile_share_link,
     get_profile_share_link_by_token,
     is_profile_share_link_expired,
-    mark_profile_share_accessed,
+    list_active_profile_share_links,
+    profile_share_access_stats,
     revoke_profile_share_link,
 )
-from app.repositories.registration import get_registration_by_member_id
+from app.repositories.registration import get_registration_by_member_id, get_registration_updated_at
 from app.schemas.profile_share import (
     ProfileShareCreateRequest,
     ProfileShareCreateResponse,
+    ProfileShareLinkListResponse,
+    ProfileShareLinkSummary,
     ProfileSharePublicResponse,
     ProfileShareRevokeResponse,
     SharedProfileContact,
     SharedProfileData,
 )
+from app.services.birth_date import calculate_age
+from app.services.photo_variants import CARD_WIDTH, profile_photo_variant_url
+from app.services.share_access import share_access_tracker
+from app.services.share_token import decode_share_token, is_signed_share_token, revoked_share_links
+from app.services.http_cache import etag_matches, strong_etag
+from app.services.shared_profile_cache import CachedSharedProfile, shared_profile_cache
 
 router = APIRouter(prefix="/profile/share")
-
-
-def _calculate_age(dob: Optional[str]) -> Optional[int]:
-    if not dob:
-        return None
-    try:
-        year, month, day = [int(part) for part in dob.split("-")]
-        born = date(year, month, day)
-    except Exception:
-        return None
-    today = date.today()
-    return today.year - born.year - ((today.month, today.day) < (born.month, born.day))
+settings = get_settings()
 
 
 def _extract_image_url(extra_data: Any) -> Optional[str]:
@@ -44,6 +43,10 @@ def _extract_image_url(extra_data: Any) -> Optional[str]:
     if isinstance(image_url, str) and image_url.strip():
         return image_url.strip()
 
+    variant_url = profile_photo_variant_url(data, CARD_WIDTH)
+    if variant_url:
+        return variant_url
+
     profile_photo = data.get("profilePhoto")
     if isinstance(profile_photo, str) and profile_photo.strip():
         return profile_photo.strip()
@@ -55,6 +58,15 @@ def _extract_image_url(extra_data: Any) -> Optional[str]:
     return None
 
 
+def _find_link(db: Session, token: str):
+    return get_profile_share_link_by_token(
+        db,
+        token,
+        settings.share_token_secret,
+        accept_legacy=settings.share_accept_legacy_tokens,
+    )
+
+
 def _link_status(link) -> str:
     if link.revoked_at is not None:
         return "revoked"
@@ -63,6 +75,20 @@ def _link_status(link) -> str:
     return "active"
 
 
+def _link_summary(link) -> ProfileShareLinkSummary:
+    view_count, last_accessed_at = profile_share_access_stats(link)
+    return ProfileShareLinkSummary(
+        token=link.token,
+        share_path=f"/profile/share/{link.token}",
+        created_at=link.created_at,
+        expires_at=link.expires_at,
+        include_contact_details=link.include_contact_details,
+        link_status=_link_status(link),
+        last_accessed_at=last_accessed_at,
+        view_count=view_count,
+    )
+
+
 def _build_shared_profile(registration, include_contact_details: bool) -> SharedProfileData:
     extra_data = registration.extra_data if isinstance(registration.extra_data, dict) else {}
     contact = None
@@ -80,7 +106,7 @@ def _build_shared_profile(registration, include_contact_details: bool) -> Shared
         name=registration.name,
         gender=registration.gender,
         dob=registration.dob,
-        age=_calculate_age(registration.dob),
+        age=calculate_age(registration.birth_date),
         location=registration.city or str(extra_data.get("currentLocation") or "") or None,
         education=registration.education or str(extra_data.get("highestQualification") or "") or None,
         occupation=registration.occupation,
@@ -101,10 +127,11 @@ def create_share_link(
     authorization: Optional[str] = Header(default=None),
     db: Session = Depends(get_db),
 ) -> ProfileShareCreateResponse:
-    member = require_member_auth(authorization, db)
+    member = require_member_claims(authorization)
     link = create_profile_share_link(
         db,
         member_id=member.member_id,
+        secret=settings.share_token_secret,
         expires_in_days=payload.expires_in_days,
         include_contact_details=payload.include_contact_details,
     )
@@ -118,14 +145,24 @@ def create_share_link(
     )
 
 
-@router.get("/{token}", response_model=ProfileSharePublicResponse)
-def get_shared_profile(token: str, db: Session = Depends(get_db)) -> ProfileSharePublicResponse:
-    link = get_profile_share_link_by_token(db, token)
+@router.get("", response_model=ProfileShareLinkListResponse)
+def list_share_links(
+    authorization: Optional[str] = Header(default=None),
+    db: Session = Depends(get_db),
+) -> ProfileShareLinkListResponse:
+    member = require_member_claims(authorization)
+    links = list_active_profile_share_links(db, member.member_id)
+    return ProfileShareLinkListResponse(items=[_link_summary(link) for link in links])
+
+
+def _render_shared_profile(db: Session, token: str) -> CachedSharedProfile:
+    link = _find_link(db, token)
     if not link:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Share link not found")
 
     status_value = _link_status(link)
     if status_value == "revoked":
+        revoked_share_links.add(link.id)
         raise HTTPException(status_code=status.HTTP_410_GONE, detail="Share link has been disabled")
     if status_value == "expired":
         raise HTTPException(status_code=status.HTTP_410_GONE, detail="Share link has expired")
@@ -134,23 +171,83 @@ def get_shared_profile(token: str, db: Session = Depends(get_db)) -> ProfileShar
     if not registration:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Shared profile unavailable")
 
-    mark_profile_share_accessed(db, link)
-    return ProfileSharePublicResponse(
+    body = ProfileSharePublicResponse(
         profile=_build_shared_profile(registration, link.include_contact_details),
         expires_at=link.expires_at,
         link_status="active",
         include_contact_details=link.include_contact_details,
+    ).model_dump_json(by_alias=True).encode()
+    expires_at = link.expires_at
+    return CachedSharedProfile(
+        link_id=link.id,
+        member_id=link.member_id,
+        link_expires_at=expires_at if expires_at.tzinfo else expires_at.replace(tzinfo=timezone.utc),
+        profile_updated_at=registration.updated_at,
+        etag=strong_etag(body),
+        body=body,
     )
 
 
+@router.get("/{token}", response_model=ProfileSharePublicResponse)
+def get_shared_profile(
+    token: str,
+    if_none_match: Optional[str] = Header(default=None),
+    db: Session = Depends(get_db),
+) -> Response:
+    # Signed tokens are checked in pure CPU first: forged, expired and revoked links never reach the cache
+    # or the database. Unsigned tokens are legacy links and take the lookup path.
+    if is_signed_share_token(token):
+        claims = decode_share_token(token, settings.share_token_secret)
+        if claims is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Share link not found")
+        if claims.link_id in revoked_share_links:
+            raise HTTPException(status_code=status.HTTP_410_GONE, detail="Share link has been disabled")
+        if claims.is_expired():
+            raise HTTPException(status_code=status.HTTP_410_GONE, detail="Share link has expired")
+
+    # Served from the per-process cache when possible; a miss renders once and caches the serialized body.
+    # A hit is confirmed against the profile's updated_at (one indexed single-column read), so an edit made
+    # through another worker is never served stale from this one.
+    cached = shared_profile_cache.get(token)
+    if cached is not None and cached.link_id in revoked_share_links:
+        # Revoked through another worker after this one cached the link (legacy tokens carry no claims).
+        shared_profile_cache.invalidate_token(token)
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail="Share link has been disabled")
+    if cached is not None and get_registration_updated_at(db, cached.member_id) != cached.profile_updated_at:
+        shared_profile_cache.invalidate_token(token)
+        cached = None
+    if cached is None:
+        cached = _render_shared_profile(db, token)
+        shared_profile_cache.put(token, cached)
+
+    share_access_tracker.record(cached.link_id)
+    headers = {"ETag": cached.etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, cached.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+
+@router.get("/{token}/stats", response_model=ProfileShareLinkSummary)
+def get_share_link_stats(
+    token: str,
+    authorization: Optional[str] = Header(default=None),
+    db: Session = Depends(get_db),
+) -> ProfileShareLinkSummary:
+    member = require_member_claims(authorization)
+    link = _find_link(db, token)
+    if not link or link.member_id != member.member_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Share link not found")
+    return _link_summary(link)
+
+
 @router.delete("/{token}", response_model=ProfileShareRevokeResponse)
 def revoke_shared_profile(
     token: str,
     authorization: Optional[str] = Header(default=None),
     db: Session = Depends(get_db),
 ) -> ProfileShareRevokeResponse:
-    member = require_member_auth(authorization, db)
-    link = get_profile_share_link_by_token(db, token)
+    member = require_member_claims(authorization)
+    link = _find_link(db, token)
     if not link or link.member_id != member.member_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Share link not found")
 
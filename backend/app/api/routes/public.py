@@ -1,26 +1,19 @@
-from datetime import date
 from typing import Any, Optional
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, Query, Response, status
 from sqlalchemy.orm import Session
 
+from app.core.config import get_settings
 from app.db.session import get_db
 from app.repositories.profile import list_recent_verified_profiles
 from app.schemas.public import PublicRecentProfileItem, PublicRecentProfilesResponse
+from app.services.birth_date import calculate_age
+from app.services.http_cache import etag_matches
+from app.services.photo_variants import THUMBNAIL_WIDTH, photo_variant_url, profile_photo_variant_url
+from app.services.public_carousel import public_carousel_cache
 
 router = APIRouter(prefix="/public")
-
-
-def _calculate_age(dob: Optional[str]) -> Optional[int]:
-    if not dob:
-        return None
-    try:
-        year, month, day = [int(part) for part in dob.split("-")]
-        born = date(year, month, day)
-    except Exception:
-        return None
-    today = date.today()
-    return today.year - born.year - ((today.month, today.day) < (born.month, born.day))
+settings = get_settings()
 
 
 def _get_profile_image(extra_data: Any) -> Optional[str]:
@@ -29,6 +22,10 @@ def _get_profile_image(extra_data: Any) -> Optional[str]:
     if isinstance(image_url, str) and image_url.strip():
         return image_url.strip()
 
+    variant_url = profile_photo_variant_url(data, THUMBNAIL_WIDTH)
+    if variant_url:
+        return variant_url
+
     profile_photo = data.get("profilePhoto")
     if isinstance(profile_photo, str) and profile_photo.strip():
         return profile_photo.strip()
@@ -40,24 +37,44 @@ def _get_profile_image(extra_data: Any) -> Optional[str]:
     return None
 
 
+def _carousel_image(row, extra_data: Any) -> Optional[str]:
+    if row.image_url:
+        return row.image_url
+    if row.photo_hash:
+        return photo_variant_url(row.photo_hash, THUMBNAIL_WIDTH)
+    return _get_profile_image(extra_data) if extra_data is not None else None
+
+
+def _load_carousel_items(db: Session, limit: int) -> list[PublicRecentProfileItem]:
+    return [
+        PublicRecentProfileItem(
+            profile_id=row.member_id,
+            age=calculate_age(row.birth_date),
+            profession=row.occupation or None,
+            location=row.city or row.current_location or None,
+            gothram=row.gothram or None,
+            image_url=_carousel_image(row, extra_data),
+        )
+        for row, extra_data in list_recent_verified_profiles(db, limit=limit)
+    ]
+
+
+def _render_carousel(items: list[PublicRecentProfileItem]) -> bytes:
+    return PublicRecentProfilesResponse(items=items).model_dump_json(by_alias=True).encode()
+
+
 @router.get("/profiles/recent-verified", response_model=PublicRecentProfilesResponse)
 def list_recent_verified(
     limit: int = Query(default=8, ge=1, le=20),
+    if_none_match: Optional[str] = Header(default=None),
     db: Session = Depends(get_db),
-) -> PublicRecentProfilesResponse:
-    rows = list_recent_verified_profiles(db, limit=limit)
-    items = []
-    for row in rows:
-        extra_data = row.extra_data if isinstance(row.extra_data, dict) else {}
-        items.append(
-            PublicRecentProfileItem(
-                profile_id=row.member_id,
-                age=_calculate_age(row.dob),
-                profession=row.occupation or None,
-                location=row.city or str(extra_data.get("currentLocation") or "") or None,
-                gothram=row.gothram or None,
-                image_url=_get_profile_image(extra_data),
-            )
-        )
-    return PublicRecentProfilesResponse(items=items)
-
+) -> Response:
+    # Served from the precomputed snapshot; the session only opens a connection when it is rebuilt.
+    carousel = public_carousel_cache.get(limit, lambda count: _load_carousel_items(db, count), _render_carousel)
+    headers = {
+        "ETag": carousel.etag,
+        "Cache-Control": f"public, max-age={int(settings.public_carousel_refresh_seconds)}, stale-while-revalidate=300",
+    }
+    if etag_matches(if_none_match, carousel.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=carousel.body, media_type="application/json", headers=headers)
@@ -1,17 +1,27 @@
 from fastapi import APIRouter, Depends
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
+from app.api.photo_upload import externalize_profile_photo
 from app.db.session import get_db
 from app.repositories.registration import create_registration
 from app.schemas.registration import (
     RegistrationCreate,
     RegistrationCreateResponse,
 )
+from app.services.security import hash_password_async
 
 router = APIRouter()
 
 
 @router.post("", response_model=RegistrationCreateResponse)
-def create_registration_handler(payload: RegistrationCreate, db: Session = Depends(get_db)) -> RegistrationCreateResponse:
-    registration = create_registration(db, payload)
+async def create_registration_handler(
+    payload: RegistrationCreate,
+    db: Session = Depends(get_db),
+) -> RegistrationCreateResponse:
+    # Hash first: a busy hasher (503) then rejects the request before any photo blob is written.
+    password_hash = await hash_password_async(payload.password)
+    if payload.model_extra:
+        payload.model_extra.update(await run_in_threadpool(externalize_profile_photo, payload.model_extra))
+    registration = await run_in_threadpool(create_registration, db, payload, password_hash)
     return RegistrationCreateResponse(id=registration.member_id)
@@ -13,6 +13,36 @@ class Settings(BaseSettings):
     admin_token: str = "dev-admin-token-change-me"
     enforce_credit_for_profile_access: bool = False
     member_session_secret: str = "change-me-member-session-secret"
+    member_session_ttl_seconds: int = 43200
+    member_session_token_cache_size: int = 4096
+    member_session_accept_legacy_tokens: bool = True
+    member_session_reload_seconds: float = 30.0
+    password_hash_executor: str = "thread"
+    password_hash_workers: int = 2
+    password_hash_max_concurrency: int = 2
+    password_hash_max_queue: int = 64
+    member_auth_cache_ttl_seconds: float = 30.0
+    member_auth_cache_max_entries: int = 10000
+    listing_count_cache_ttl_seconds: float = 10.0
+    feed_facet_cache_ttl_seconds: float = 60.0
+    recommendation_pool_ttl_seconds: float = 60.0
+    similar_profiles_rebuild_seconds: float = 3600.0
+    share_token_secret: str = "change-me-share-token-secret"
+    share_accept_legacy_tokens: bool = True
+    share_revoked_reload_seconds: float = 30.0
+    share_access_flush_seconds: float = 5.0
+    share_access_max_pending: int = 10000
+    share_link_retention_days: int = 30
+    share_link_sweep_interval_seconds: float = 3600.0
+    share_link_sweep_batch_size: int = 500
+    shared_profile_cache_ttl_seconds: float = 60.0
+    shared_profile_cache_max_entries: int = 5000
+    public_carousel_refresh_seconds: float = 60.0
+    photo_storage_dir: str = "./data/photos"
+    photo_max_bytes: int = 5 * 1024 * 1024
+    photo_public_url_prefix: str = ""
+    photo_variant_workers: int = 2
+    photo_variant_max_pending: int = 64
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -1,20 +1,72 @@
+import logging
+
 from sqlalchemy import inspect, select, text
 from sqlalchemy.orm import Session
 
 from app.db.base import Base
+from app.db.registration_search import install_registration_search
 from app.db.session import engine
 from app.models.member_profile_access import MemberProfileAccess  # noqa: F401
 from app.models.profile import Profile
 from app.models.profile_share_link import ProfileShareLink  # noqa: F401
-from app.models.registration import Registration  # noqa: F401
+from app.models.registration import (  # noqa: F401
+    REGISTRATION_GENDER_CHECK,
+    REGISTRATION_STATUS_CHECK,
+    VERIFIED_STATUS_PREDICATE,
+    Registration,
+)
+from app.repositories.registration import backfill_profile_card_columns, normalize_registration_enums
+
+logger = logging.getLogger(__name__)
+
+FEED_INDEXES = {
+    "ix_registrations_feed": ("is_active", "gender", "created_at", "id"),
+    "ix_registrations_feed_city": ("is_active", "gender", "city", "created_at"),
+    "ix_registrations_feed_star": ("is_active", "gender", "rasi", "nakshatra", "created_at"),
+    "ix_registrations_feed_sect": ("is_active", "gender", "sect", "subsect", "created_at"),
+    "ix_registrations_feed_education": ("is_active", "gender", "education", "created_at"),
+    "ix_registrations_feed_photo": ("is_active", "gender", "has_photo", "created_at"),
+    "ix_registrations_feed_birth_date": ("is_active", "gender", "birth_date"),
+    "ix_registrations_feed_geohash": ("is_active", "gender", "geohash"),
+}
+
+REGISTRATION_CHECK_CONSTRAINTS = {
+    "ck_registrations_status": REGISTRATION_STATUS_CHECK,
+    "ck_registrations_gender": REGISTRATION_GENDER_CHECK,
+}
+
+PROFILE_CARD_COLUMN_DDL = {
+    "birth_date": "DATE",
+    "name_phonetic": "VARCHAR(120)",
+    "city_id": "VARCHAR(64)",
+    "latitude": "FLOAT",
+    "longitude": "FLOAT",
+    "geohash": "VARCHAR(12)",
+    "height": "VARCHAR(32)",
+    "star_padham": "VARCHAR(100)",
+    "nakshatra": "VARCHAR(64)",
+    "padham": "VARCHAR(16)",
+    "rasi": "VARCHAR(64)",
+    "sect": "VARCHAR(120)",
+    "subsect": "VARCHAR(120)",
+    "horoscope_matching_required": "VARCHAR(32)",
+    "current_location": "VARCHAR(120)",
+    "image_url": "VARCHAR(1000)",
+    "photo_hash": "VARCHAR(64)",
+    "has_photo": "BOOLEAN DEFAULT FALSE",
+    "card_version": "INTEGER DEFAULT 0",
+}
 
 
 def init_db() -> None:
     Base.metadata.create_all(bind=engine)
     _run_lightweight_migrations()
     with Session(bind=engine) as db:
+        normalize_registration_enums(db)
+        _add_registration_check_constraints()
         _seed_profiles(db)
         _backfill_profile_data(db)
+        backfill_profile_card_columns(db)
 
 
 def _run_lightweight_migrations() -> None:
@@ -35,6 +87,50 @@ def _run_lightweight_migrations() -> None:
                 conn.execute(text("UPDATE registrations SET updated_at = created_at WHERE updated_at IS NULL"))
             if "address" not in columns:
                 conn.execute(text("ALTER TABLE registrations ADD COLUMN address VARCHAR(500)"))
+            if "session_version" not in columns:
+                conn.execute(text("ALTER TABLE registrations ADD COLUMN session_version INTEGER DEFAULT 0"))
+                conn.execute(text("UPDATE registrations SET session_version = 0 WHERE session_version IS NULL"))
+                # Members disabled before session versions existed start at 1, so their outstanding (including
+                # legacy) tokens fail the revocation registry check on routes that authorize from claims alone.
+                conn.execute(text("UPDATE registrations SET session_version = 1 WHERE is_active = FALSE"))
+            for column, ddl in PROFILE_CARD_COLUMN_DDL.items():
+                if column not in columns:
+                    conn.execute(text(f"ALTER TABLE registrations ADD COLUMN {column} {ddl}"))
+            for column in ("nakshatra", "rasi", "sect", "name_phonetic", "city_id"):
+                conn.execute(
+                    text(f"CREATE INDEX IF NOT EXISTS ix_registrations_{column} ON registrations ({column})")
+                )
+            install_registration_search(conn)
+            # Superseded by ix_registrations_feed_birth_date once age filters moved to the typed column.
+            conn.execute(text("DROP INDEX IF EXISTS ix_registrations_feed_dob"))
+            # The lower(coalesce(status, '')) expression index predates canonical statuses; a partial index
+            # over verified rows replaces it under a new name.
+            conn.execute(text("DROP INDEX IF EXISTS ix_registrations_recent_verified"))
+            conn.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS ix_registrations_verified_recent "
+                    f"ON registrations (is_active, created_at) WHERE {VERIFIED_STATUS_PREDICATE}"
+                )
+            )
+            for index_name, index_columns in FEED_INDEXES.items():
+                conn.execute(
+                    text(f"CREATE INDEX IF NOT EXISTS {index_name} ON registrations ({', '.join(index_columns)})")
+                )
+
+        if inspector.has_table("profile_share_links"):
+            share_columns = {col["name"] for col in inspector.get_columns("profile_share_links")}
+            if "view_count" not in share_columns:
+                conn.execute(text("ALTER TABLE profile_share_links ADD COLUMN view_count INTEGER DEFAULT 0"))
+                conn.execute(text("UPDATE profile_share_links SET view_count = 0 WHERE view_count IS NULL"))
+            conn.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS ix_profile_share_links_active_member "
+                    "ON profile_share_links (member_id, expires_at) WHERE revoked_at IS NULL"
+                )
+            )
+            conn.execute(
+                text("CREATE INDEX IF NOT EXISTS ix_profile_share_links_expires_at ON profile_share_links (expires_at)")
+            )
 
         if inspector.has_table("profiles"):
             profile_columns = {col["name"] for col in inspector.get_columns("profiles")}
@@ -56,6 +152,29 @@ def _run_lightweight_migrations() -> None:
                 conn.execute(text("ALTER TABLE profiles ADD COLUMN family_details VARCHAR(1200)"))
 
 
+def _add_registration_check_constraints() -> None:
+    # Runs after normalize_registration_enums, which leaves unrecognised values in place; a check is only added
+    # once no row violates it, so it is retried on each startup until an admin has fixed those rows. SQLite
+    # cannot add a constraint to an existing table; there the schema validators are the only guard for older
+    # databases.
+    if engine.dialect.name != "postgresql":
+        return
+    with engine.begin() as conn:
+        existing = set(
+            conn.scalars(
+                text("SELECT conname FROM pg_constraint WHERE conrelid = 'registrations'::regclass AND contype = 'c'")
+            )
+        )
+        for name, check in REGISTRATION_CHECK_CONSTRAINTS.items():
+            if name in existing:
+                continue
+            violations = conn.scalar(text(f"SELECT count(*) FROM registrations WHERE NOT ({check})"))
+            if violations:
+                logger.warning("Not adding %s yet: %d registration row(s) still violate it", name, violations)
+                continue
+            conn.execute(text(f"ALTER TABLE registrations ADD CONSTRAINT {name} CHECK ({check})"))
+
+
 def _seed_profiles(db: Session) -> None:
     existing = db.scalar(select(Profile.id).limit(1))
     if existing is not None:
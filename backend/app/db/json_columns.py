@@ -0,0 +1,56 @@
+from typing import Any
+
+from sqlalchemy import JSON, String, and_, cast, func, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ColumnElement, FunctionElement
+
+
+def json_text(column, key: str) -> ColumnElement:
+    """Extract a top-level key as text inside the database (json_extract / ->>)."""
+    return column[key].as_string()
+
+
+def json_path_text(column, *path: str) -> ColumnElement:
+    """Extract a nested value as text inside the database (json_extract with a path / #>>)."""
+    return column[path].as_string()
+
+
+def json_present(column, key: str) -> ColumnElement:
+    """True when a top-level key holds a non-null, non-empty value, evaluated without shipping the value."""
+    value = column[key].as_string()
+    return and_(value.is_not(None), value != "")
+
+
+def json_truthy(value: Any) -> bool:
+    # SQLite returns JSON booleans as 1/0 while PostgreSQL's ->> returns 'true'/'false'.
+    if isinstance(value, str):
+        return value.strip().lower() not in {"", "0", "false", "no", "null"}
+    return bool(value)
+
+
+class json_without_keys(FunctionElement):
+    """The JSON document with the given top-level keys removed, computed by the database."""
+
+    type = JSON()
+    inherit_cache = False
+
+    def __init__(self, column, *keys: str):
+        self.keys = keys
+        super().__init__(column)
+
+
+@compiles(json_without_keys)
+def _compile_json_without_keys_default(element, compiler, **kw):
+    (column,) = element.clauses
+    paths = [f"$.{key}" for key in element.keys]
+    return compiler.process(func.json_remove(column, *paths), **kw)
+
+
+@compiles(json_without_keys, "postgresql")
+def _compile_json_without_keys_postgresql(element, compiler, **kw):
+    (column,) = element.clauses
+    expression = cast(column, JSONB)
+    for key in element.keys:
+        expression = expression.op("-")(cast(key, String))
+    return compiler.process(type_coerce(expression, JSON), **kw)
@@ -0,0 +1,140 @@
+import logging
+from typing import Optional
+
+from sqlalchemy import Float, and_, column, func, literal, literal_column, or_, select, table, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import ColumnElement, Subquery
+
+from app.models.registration import Registration
+
+logger = logging.getLogger(__name__)
+
+# Columns covered by the admin search index, in index order.
+SEARCH_COLUMNS = ("name", "member_id", "phone", "email", "city", "occupation")
+# Trigram indexes cannot serve terms shorter than one trigram.
+MIN_INDEXED_TERM_LENGTH = 3
+
+_FTS_TABLE = "registrations_fts"
+_fts = table(_FTS_TABLE, column("rowid"), column("rank"), *(column(name) for name in SEARCH_COLUMNS))
+_postgres_trigram_available = False
+
+
+def _search_document() -> ColumnElement:
+    # Same expression as ix_registrations_search_trgm so PostgreSQL can match it to the index.
+    # Constants are rendered inline: a bound parameter would keep the planner from matching the index expression.
+    parts = [func.coalesce(getattr(Registration, name), literal_column("''")) for name in SEARCH_COLUMNS]
+    document = parts[0]
+    for part in parts[1:]:
+        document = document.op("||")(literal_column("' '")).op("||")(part)
+    return func.lower(document)
+
+
+def install_registration_search(conn: Connection) -> None:
+    """Create the admin search index for the connected backend and keep it in sync with registrations.
+
+    SQLite gets an external-content FTS5 table with the trigram tokenizer, maintained by triggers;
+    PostgreSQL gets a pg_trgm GIN index on the concatenated search columns, maintained by the database.
+    """
+    global _postgres_trigram_available
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        _install_sqlite_fts(conn)
+    elif dialect == "postgresql":
+        try:
+            with conn.begin_nested():
+                conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+                document_sql = " || ' ' || ".join(f"coalesce({name}, '')" for name in SEARCH_COLUMNS)
+                conn.execute(
+                    text(
+                        "CREATE INDEX IF NOT EXISTS ix_registrations_search_trgm ON registrations "
+                        f"USING gin ((lower({document_sql})) gin_trgm_ops)"
+                    )
+                )
+            _postgres_trigram_available = True
+        except Exception:
+            logger.warning("pg_trgm is unavailable; admin search falls back to unindexed ILIKE", exc_info=True)
+
+
+def _install_sqlite_fts(conn: Connection) -> None:
+    exists = conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": _FTS_TABLE}
+    ).first()
+    columns = ", ".join(SEARCH_COLUMNS)
+    new_values = ", ".join(f"new.{name}" for name in SEARCH_COLUMNS)
+    old_values = ", ".join(f"old.{name}" for name in SEARCH_COLUMNS)
+    conn.execute(
+        text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {_FTS_TABLE} USING fts5({columns}, "
+            "content='registrations', content_rowid='id', tokenize='trigram')"
+        )
+    )
+    conn.execute(
+        text(
+            f"CREATE TRIGGER IF NOT EXISTS {_FTS_TABLE}_ai AFTER INSERT ON registrations BEGIN "
+            f"INSERT INTO {_FTS_TABLE}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+        )
+    )
+    conn.execute(
+        text(
+            f"CREATE TRIGGER IF NOT EXISTS {_FTS_TABLE}_ad AFTER DELETE ON registrations BEGIN "
+            f"INSERT INTO {_FTS_TABLE}({_FTS_TABLE}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END"
+        )
+    )
+    conn.execute(
+        text(
+            f"CREATE TRIGGER IF NOT EXISTS {_FTS_TABLE}_au AFTER UPDATE OF {columns} ON registrations BEGIN "
+            f"INSERT INTO {_FTS_TABLE}({_FTS_TABLE}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+            f"INSERT INTO {_FTS_TABLE}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+        )
+    )
+    if exists is None:
+        conn.execute(text(f"INSERT INTO {_FTS_TABLE}({_FTS_TABLE}) VALUES ('rebuild')"))
+
+
+def _contains_pattern(word: str) -> str:
+    # Built in Python rather than '%' || :word || '%' so PostgreSQL sees a constant pattern it can index.
+    escaped = word.replace("/", "//").replace("%", "/%").replace("_", "/_")
+    return f"%{escaped}%"
+
+
+def _fts_phrase(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+def registration_search_matches(db: Session, term: str, column_name: Optional[str] = None) -> Optional[Subquery]:
+    """Registrations matching every word of term, as a subquery of (id, rank); lower rank is more relevant.
+
+    Searches all SEARCH_COLUMNS, or only column_name when given. Words shorter than a trigram cannot use
+    the index, so such terms fall back to a LIKE scan with a constant rank.
+    """
+    words = term.strip().lower().split()
+    if not words:
+        return None
+    columns = [column_name] if column_name else list(SEARCH_COLUMNS)
+    alias = f"{column_name or 'search'}_matches"
+    dialect = db.get_bind().dialect.name
+    indexable = all(len(word) >= MIN_INDEXED_TERM_LENGTH for word in words)
+
+    if dialect == "sqlite" and indexable:
+        column_filter = f"{{{' '.join(columns)}}} : " if column_name else ""
+        match_query = column_filter + "(" + " AND ".join(_fts_phrase(word) for word in words) + ")"
+        # bm25() is negative, more negative for better matches.
+        return (
+            select(_fts.c.rowid.label("id"), literal_column(f"bm25({_FTS_TABLE})", Float).label("rank"))
+            .select_from(_fts)
+            .where(literal_column(_FTS_TABLE).op("MATCH")(match_query))
+            .subquery(alias)
+        )
+
+    column_conditions = [
+        or_(*(func.lower(getattr(Registration, name)).like(_contains_pattern(word), escape="/") for name in columns))
+        for word in words
+    ]
+    rank = literal(0.0)
+    if dialect == "postgresql" and _postgres_trigram_available and indexable:
+        document = _search_document()
+        # The document predicate is implied by the column predicates and lets the trigram index prefilter.
+        column_conditions.extend(document.like(_contains_pattern(word), escape="/") for word in words)
+        rank = -func.similarity(document, term.strip().lower())
+    return select(Registration.id.label("id"), rank.label("rank")).where(and_(*column_conditions)).subquery(alias)
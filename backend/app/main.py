@@ -1,23 +1,83 @@
 from contextlib import asynccontextmanager
+from datetime import datetime
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from app.api import api_router
 from app.core.config import get_settings
 from app.db.init_db import init_db
+from app.db.session import SessionLocal
+from app.repositories.profile_share import (
+    delete_expired_profile_share_links,
+    list_revoked_profile_share_link_ids,
+    record_profile_share_access,
+)
+from app.repositories.registration import list_member_session_versions
+from app.services.member_session import session_registry
+from app.services.photo_variants import photo_variants
+from app.services.security import PasswordHasherBusyError, password_hasher
+from app.services.share_access import AccessBatch, share_access_tracker
+from app.services.share_link_sweeper import share_link_sweeper
+from app.services.share_token import revoked_share_links
 
 settings = get_settings()
 
 
+def _write_share_access(batch: AccessBatch) -> None:
+    with SessionLocal() as db:
+        record_profile_share_access(db, batch)
+
+
+def _sweep_share_links(cutoff: datetime, batch_size: int) -> int:
+    with SessionLocal() as db:
+        try:
+            return delete_expired_profile_share_links(db, cutoff, batch_size)
+        except Exception:
+            # Release any lock the failed batch holds before the sweeper logs it and waits for the next run.
+            db.rollback()
+            raise
+
+
+def _load_member_session_versions() -> list[tuple[str, int]]:
+    with SessionLocal() as db:
+        return list_member_session_versions(db)
+
+
+def _load_revoked_share_link_ids() -> list[int]:
+    with SessionLocal() as db:
+        return list_revoked_profile_share_link_ids(db)
+
+
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     init_db()
+    revoked_share_links.start(_load_revoked_share_link_ids)
+    session_registry.start(_load_member_session_versions)
+    share_access_tracker.start(_write_share_access)
+    share_link_sweeper.start(_sweep_share_links)
     yield
+    revoked_share_links.shutdown()
+    session_registry.shutdown()
+    share_link_sweeper.shutdown()
+    share_access_tracker.shutdown()
+    password_hasher.shutdown()
+    photo_variants.shutdown()
 
 
 app = FastAPI(title=settings.app_name, lifespan=lifespan)
 
+
+@app.exception_handler(PasswordHasherBusyError)
+async def password_hasher_busy_handler(_: Request, __: PasswordHasherBusyError) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Too many sign-in attempts in progress. Please retry shortly."},
+        headers={"Retry-After": "1"},
+    )
+
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins_list,
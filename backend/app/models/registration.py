@@ -1,33 +1,90 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 
-from sqlalchemy import DateTime, Integer, JSON, String, func
+from sqlalchemy import Boolean, CheckConstraint, Date, DateTime, Float, Index, Integer, JSON, String, func, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
+from app.services.registration_enums import GENDERS, REGISTRATION_STATUSES, STATUS_NEW, STATUS_VERIFIED
+
+
+def _in_list(values: tuple[str, ...]) -> str:
+    return ", ".join(f"'{value}'" for value in values)
+
+
+# Queries must compare status against this exact literal (not a bound parameter) to use the partial index.
+VERIFIED_STATUS_PREDICATE = f"status = '{STATUS_VERIFIED}'"
+REGISTRATION_STATUS_CHECK = f"status IN ({_in_list(REGISTRATION_STATUSES)})"
+REGISTRATION_GENDER_CHECK = f"gender IS NULL OR gender IN ({_in_list(GENDERS)})"
 
 
 class Registration(Base):
     __tablename__ = "registrations"
+    __table_args__ = (
+        Index("ix_registrations_feed", "is_active", "gender", "created_at", "id"),
+        # Feed facet filters: equality columns lead, created_at trails so filtered pages stay index-ordered.
+        Index("ix_registrations_feed_city", "is_active", "gender", "city", "created_at"),
+        Index("ix_registrations_feed_star", "is_active", "gender", "rasi", "nakshatra", "created_at"),
+        Index("ix_registrations_feed_sect", "is_active", "gender", "sect", "subsect", "created_at"),
+        Index("ix_registrations_feed_education", "is_active", "gender", "education", "created_at"),
+        Index("ix_registrations_feed_photo", "is_active", "gender", "has_photo", "created_at"),
+        Index("ix_registrations_feed_birth_date", "is_active", "gender", "birth_date"),
+        Index("ix_registrations_feed_geohash", "is_active", "gender", "geohash"),
+        # Public "recent verified" carousel: only verified rows are indexed.
+        Index(
+            "ix_registrations_verified_recent",
+            "is_active",
+            "created_at",
+            sqlite_where=text(VERIFIED_STATUS_PREDICATE),
+            postgresql_where=text(VERIFIED_STATUS_PREDICATE),
+        ),
+        # Values are normalized by app.services.registration_enums; see normalize_registration_enums.
+        CheckConstraint(REGISTRATION_STATUS_CHECK, name="ck_registrations_status"),
+        CheckConstraint(REGISTRATION_GENDER_CHECK, name="ck_registrations_gender"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     member_id: Mapped[str] = mapped_column(String(24), unique=True, index=True)
     name: Mapped[str] = mapped_column(String(120))
+    # Sound key of name for fuzzy admin lookup; see app.services.name_phonetics.
+    name_phonetic: Mapped[Optional[str]] = mapped_column(String(120), nullable=True, index=True)
     email: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     phone: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
     password_hash: Mapped[str] = mapped_column(String(255))
     gender: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
     dob: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    # Parsed from dob with the card columns; NULL when dob is empty or unparseable.
+    birth_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
     city: Mapped[Optional[str]] = mapped_column(String(120), nullable=True)
+    # city / currentLocation resolved against the bundled gazetteer; see app.services.gazetteer.
+    city_id: Mapped[Optional[str]] = mapped_column(String(64), nullable=True, index=True)
+    latitude: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    longitude: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    geohash: Mapped[Optional[str]] = mapped_column(String(12), nullable=True)
     address: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
     education: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     occupation: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     gothram: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     message: Mapped[Optional[str]] = mapped_column(String(1000), nullable=True)
-    status: Mapped[str] = mapped_column(String(32), default="New")
+    status: Mapped[str] = mapped_column(String(32), default=STATUS_NEW)
     is_active: Mapped[bool] = mapped_column(default=True)
     credits: Mapped[int] = mapped_column(Integer, default=0)
+    session_version: Mapped[int] = mapped_column(Integer, default=0)
     extra_data: Mapped[dict] = mapped_column(JSON, default=dict)
+    # Profile-card fields materialized from extra_data; see app.services.profile_card.
+    height: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    star_padham: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    nakshatra: Mapped[Optional[str]] = mapped_column(String(64), nullable=True, index=True)
+    padham: Mapped[Optional[str]] = mapped_column(String(16), nullable=True)
+    rasi: Mapped[Optional[str]] = mapped_column(String(64), nullable=True, index=True)
+    sect: Mapped[Optional[str]] = mapped_column(String(120), nullable=True, index=True)
+    subsect: Mapped[Optional[str]] = mapped_column(String(120), nullable=True)
+    horoscope_matching_required: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    current_location: Mapped[Optional[str]] = mapped_column(String(120), nullable=True)
+    image_url: Mapped[Optional[str]] = mapped_column(String(1000), nullable=True)
+    photo_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    has_photo: Mapped[bool] = mapped_column(Boolean, default=False)
+    card_version: Mapped[int] = mapped_column(Integer, default=0)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -1,120 +1,737 @@
+import base64
+import json
+import math
+from dataclasses import dataclass
+from datetime import date, datetime
 from typing import Optional
 
-from sqlalchemy import and_, desc, func, select
-from sqlalchemy.orm import Session
+from sqlalchemy import String, and_, cast, delete, desc, func, literal, literal_column, or_, select, union_all, update
+from sqlalchemy.orm import Session, load_only
 
+from app.db.json_columns import json_text, json_truthy
 from app.models.member_profile_access import MemberProfileAccess
 from app.models.registration import Registration
+from app.services.birth_date import birth_date_range_for_ages
+from app.services.count_cache import feed_facet_cache, registration_count_cache
+from app.services.gazetteer import KM_PER_DEGREE, geohash_cover, geohash_prefix_upper_bound
+from app.services.member_cache import MemberAuthSnapshot, invalidate_member_snapshot
+from app.services.profile_features import FeatureSource, profile_feature_index
+from app.services.recommendations import CandidatePool, Seeker, rank_candidates, recommendation_pool_cache
+from app.services.registration_enums import OPPOSITE_GENDER, STATUS_VERIFIED, normalize_gender
+
+
+@dataclass
+class ProfileCardRow:
+    id: int
+    member_id: str
+    name: str
+    gender: Optional[str]
+    dob: Optional[str]
+    birth_date: Optional[date]
+    city: Optional[str]
+    education: Optional[str]
+    occupation: Optional[str]
+    gothram: Optional[str]
+    height: Optional[str]
+    star_padham: Optional[str]
+    nakshatra: Optional[str]
+    rasi: Optional[str]
+    sect: Optional[str]
+    subsect: Optional[str]
+    horoscope_matching_required: Optional[str]
+    current_location: Optional[str]
+    image_url: Optional[str]
+    photo_hash: Optional[str]
+    has_photo: bool
+    created_at: datetime
+
+
+def _profile_card_column(name: str):
+    if name == "image_url":
+        # URLs too long for the card column stay NULL there (see profile_card); only those read extra_data.
+        return func.coalesce(Registration.image_url, json_text(Registration.extra_data, "imageUrl")).label(name)
+    return getattr(Registration, name)
+
+
+# Narrow columns read by the member feed card; extra_data itself is never loaded for a feed page.
+_PROFILE_CARD_COLUMNS = tuple(_profile_card_column(name) for name in ProfileCardRow.__dataclass_fields__)
+
+
+def _profile_card_select_columns() -> list:
+    return list(_PROFILE_CARD_COLUMNS)
+
+
+def _profile_card_from_row(row) -> ProfileCardRow:
+    return ProfileCardRow(**{name: getattr(row, name) for name in ProfileCardRow.__dataclass_fields__})
+
+
+@dataclass(frozen=True)
+class ProfileFeedFilters:
+    """Member feed filters; hashable so a filter set can key the count cache."""
+
+    age_min: Optional[int] = None
+    age_max: Optional[int] = None
+    cities: tuple[str, ...] = ()
+    rasis: tuple[str, ...] = ()
+    nakshatras: tuple[str, ...] = ()
+    sects: tuple[str, ...] = ()
+    subsects: tuple[str, ...] = ()
+    educations: tuple[str, ...] = ()
+    has_photo: Optional[bool] = None
+    # (latitude, longitude) of the centre and the radius around it.
+    near: Optional[tuple[float, float]] = None
+    radius_km: Optional[float] = None
+
+    def __bool__(self) -> bool:
+        return self != ProfileFeedFilters()
+
+
+# Facet name -> card column; values are counted over the member's feed pool.
+FEED_FACET_COLUMNS = {
+    "city": Registration.city,
+    "rasi": Registration.rasi,
+    "nakshatra": Registration.nakshatra,
+    "sect": Registration.sect,
+    "subsect": Registration.subsect,
+    "education": Registration.education,
+}
+FEED_FACET_VALUE_LIMIT = 50
+
+
+def _feed_filter_conditions(filters: ProfileFeedFilters) -> list:
+    conditions = []
+    in_filters = (
+        (Registration.city, filters.cities),
+        (Registration.rasi, filters.rasis),
+        (Registration.nakshatra, filters.nakshatras),
+        (Registration.sect, filters.sects),
+        (Registration.subsect, filters.subsects),
+        (Registration.education, filters.educations),
+    )
+    for column, values in in_filters:
+        if values:
+            conditions.append(column.in_(values))
+    if filters.has_photo is not None:
+        conditions.append(Registration.has_photo.is_(filters.has_photo))
+
+    # Age bands become a birth_date range so they can use ix_registrations_feed_birth_date.
+    earliest_birth_date, latest_birth_date = birth_date_range_for_ages(filters.age_min, filters.age_max)
+    if earliest_birth_date is not None:
+        conditions.append(Registration.birth_date >= earliest_birth_date)
+    if latest_birth_date is not None:
+        conditions.append(Registration.birth_date <= latest_birth_date)
+    if filters.near is not None and filters.radius_km is not None:
+        conditions.extend(_radius_conditions(*filters.near, filters.radius_km))
+    return conditions
+
+
+def _radius_conditions(latitude: float, longitude: float, radius_km: float) -> list:
+    """Rows within radius_km of the point: geohash prefix ranges pick candidates off
+    ix_registrations_feed_geohash, and an equirectangular distance on the stored coordinates, evaluated by
+    the database, trims the corners of the covering cells."""
+    conditions = [Registration.geohash.is_not(None)]
+    prefixes = geohash_cover(latitude, longitude, radius_km)
+    if prefixes is not None:
+        ranges = []
+        for prefix in prefixes:
+            upper = geohash_prefix_upper_bound(prefix)
+            ranges.append(
+                and_(Registration.geohash >= prefix, Registration.geohash < upper)
+                if upper is not None
+                else Registration.geohash >= prefix
+            )
+        conditions.append(or_(*ranges))
+    lat_scale = KM_PER_DEGREE
+    lon_scale = KM_PER_DEGREE * math.cos(math.radians(latitude))
+    lat_delta = (Registration.latitude - latitude) * lat_scale
+    lon_delta = (Registration.longitude - longitude) * lon_scale
+    conditions.append(lat_delta * lat_delta + lon_delta * lon_delta <= radius_km * radius_km)
+    return conditions
+
+
+def _feed_pool_conditions(member: MemberAuthSnapshot, preferred_gender: Optional[str]) -> list:
+    conditions = [Registration.is_active.is_(True), Registration.member_id != member.member_id]
+    if preferred_gender:
+        conditions.append(Registration.gender == preferred_gender)
+    return conditions
+
+
+def _feed_count_key(member: MemberAuthSnapshot, preferred_gender: Optional[str], filters: ProfileFeedFilters):
+    # Unfiltered counts are shared per gender bucket and adjusted for the requesting member (see below).
+    # A member without a preferred gender may or may not match a filter set, so those counts are their own.
+    if filters and preferred_gender is None:
+        return ("feed", None, filters, member.member_id)
+    return ("feed", preferred_gender, filters)
 
 
 def _preferred_gender_for_member(member_gender: Optional[str]) -> Optional[str]:
-    if not member_gender:
+    # Stored genders are canonical; normalizing still covers session tokens issued before the backfill.
+    return OPPOSITE_GENDER.get(normalize_gender(member_gender))
+
+
+def _encode_cursor(payload: dict) -> str:
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("utf-8").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> dict:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode("utf-8")).decode("utf-8"))
+
+
+def encode_profile_cursor(created_at: datetime, row_id: int) -> str:
+    return _encode_cursor({"c": created_at.isoformat(), "i": row_id})
+
+
+def decode_profile_cursor(cursor: str) -> Optional[tuple[datetime, int]]:
+    try:
+        payload = _decode_cursor(cursor)
+        created_at = datetime.fromisoformat(payload["c"])
+        row_id = int(payload["i"])
+    except Exception:
         return None
-    normalized = member_gender.strip().lower()
-    if normalized in {"male", "m"}:
-        return "Female"
-    if normalized in {"female", "f"}:
-        return "Male"
-    return None
+    return created_at, row_id
+
+
+def encode_recommendation_cursor(score: int, row_id: int) -> str:
+    return _encode_cursor({"s": score, "i": row_id})
+
+
+def decode_recommendation_cursor(cursor: str) -> Optional[tuple[int, int]]:
+    try:
+        payload = _decode_cursor(cursor)
+        score = int(payload["s"])
+        row_id = int(payload["i"])
+    except Exception:
+        return None
+    if score < 0 or row_id < 0:
+        return None
+    return score, row_id
+
+
+def _created_at_bound(db: Session, value: datetime):
+    # SQLite stores server-default timestamps as "YYYY-MM-DD HH:MM:SS" text, while a bound datetime is
+    # rendered with microseconds; bind the stored text form so equality on the cursor row holds.
+    if db.get_bind().dialect.name == "sqlite":
+        text_format = "%Y-%m-%d %H:%M:%S.%f" if value.microsecond else "%Y-%m-%d %H:%M:%S"
+        return literal(value.strftime(text_format), String)
+    return value
+
+
+def _unlocked_flag_join(member_id: str):
+    return and_(
+        MemberProfileAccess.member_id == member_id,
+        MemberProfileAccess.profile_id == Registration.member_id,
+    )
 
 
 def list_recent_profiles_for_member(
     db: Session,
-    member: Registration,
+    member: MemberAuthSnapshot,
     page: int = 1,
     page_size: int = 20,
-) -> tuple[list[tuple[Registration, bool]], int]:
+    cursor: Optional[tuple[datetime, int]] = None,
+    include_total: bool = True,
+    filters: ProfileFeedFilters = ProfileFeedFilters(),
+) -> tuple[list[tuple[ProfileCardRow, bool]], Optional[int], Optional[str]]:
+    """Return one feed page with per-row unlock flags in a single statement.
+
+    Only the materialized card columns are read, so extra_data (and any photo payload in it) never leaves
+    the database.
+
+    The unlock flag comes from a LEFT JOIN on member_profile_access scoped to the page rows. When the total
+    is requested, not cached, and the page is offset-based, it is read from a window count on the same
+    statement; cursor pages fall back to the cached count query because the seek predicate narrows the window.
+    """
     preferred_gender = _preferred_gender_for_member(member.gender)
-    stmt = select(Registration).where(
-        and_(
-            Registration.is_active.is_(True),
-            Registration.member_id != member.member_id,
+    count_key = _feed_count_key(member, preferred_gender, filters)
+    cached_total = registration_count_cache.get(count_key) if include_total else None
+    use_window_total = include_total and cached_total is None and cursor is None
+
+    # The page is chosen by a narrow inner query (ids, sort key, unlock flag, window total); card columns are
+    # then read for the page rows only.
+    page_columns = [
+        Registration.id.label("page_id"),
+        Registration.created_at.label("page_created_at"),
+        MemberProfileAccess.id.is_not(None).label("unlocked"),
+    ]
+    if use_window_total:
+        page_columns.append(func.count().over().label("window_total"))
+    page_stmt = (
+        select(*page_columns)
+        .outerjoin(MemberProfileAccess, _unlocked_flag_join(member.member_id))
+        .where(*_feed_pool_conditions(member, preferred_gender), *_feed_filter_conditions(filters))
+    )
+    page_stmt = page_stmt.order_by(desc(Registration.created_at), desc(Registration.id))
+    if cursor is not None:
+        cursor_created_at, cursor_id = cursor
+        created_at_bound = _created_at_bound(db, cursor_created_at)
+        page_stmt = page_stmt.where(
+            or_(
+                Registration.created_at < created_at_bound,
+                and_(Registration.created_at == created_at_bound, Registration.id < cursor_id),
+            )
         )
+    else:
+        page_stmt = page_stmt.offset((page - 1) * page_size)
+    page_rows = page_stmt.limit(page_size + 1).subquery("page")
+
+    columns = [*_profile_card_select_columns(), page_rows.c.unlocked]
+    if use_window_total:
+        columns.append(page_rows.c.window_total)
+    stmt = (
+        select(*columns)
+        .join(page_rows, page_rows.c.page_id == Registration.id)
+        .order_by(desc(page_rows.c.page_created_at), desc(page_rows.c.page_id))
     )
-    count_stmt = select(func.count(Registration.id)).where(
-        and_(
+    rows = db.execute(stmt).all()
+
+    total = None
+    if include_total:
+        if cached_total is not None:
+            total = _exclude_requesting_member(cached_total, member, count_key)
+        elif use_window_total and rows:
+            total = rows[0].window_total
+            registration_count_cache.put(count_key, _include_requesting_member(total, member, count_key))
+        else:
+            total = _count_feed_profiles(db, member, preferred_gender, filters)
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_profile_cursor(rows[-1].created_at, rows[-1].id)
+
+    return [(_profile_card_from_row(row), bool(row.unlocked)) for row in rows], total, next_cursor
+
+
+# Feed counts are cached per gender bucket and filter set and shared by every member in it; the requesting
+# member can only fall inside a shared bucket when no preferred gender applies, so they are added or removed
+# around it. Per-member keys (see _feed_count_key) are counted without them.
+def _count_includes_requester(count_key: tuple) -> bool:
+    return count_key[1] is None and len(count_key) == 3
+
+
+def _exclude_requesting_member(total: int, member: MemberAuthSnapshot, count_key: tuple) -> int:
+    if _count_includes_requester(count_key) and member.is_active:
+        total -= 1
+    return max(total, 0)
+
+
+def _include_requesting_member(total: int, member: MemberAuthSnapshot, count_key: tuple) -> int:
+    if _count_includes_requester(count_key) and member.is_active:
+        total += 1
+    return total
+
+
+def _count_feed_profiles(
+    db: Session,
+    member: MemberAuthSnapshot,
+    preferred_gender: Optional[str],
+    filters: ProfileFeedFilters,
+) -> int:
+    count_key = _feed_count_key(member, preferred_gender, filters)
+
+    def compute() -> int:
+        count_stmt = select(func.count(Registration.id)).where(
             Registration.is_active.is_(True),
-            Registration.member_id != member.member_id,
+            *_feed_filter_conditions(filters),
         )
+        if preferred_gender:
+            count_stmt = count_stmt.where(Registration.gender == preferred_gender)
+        if len(count_key) == 4:
+            count_stmt = count_stmt.where(Registration.member_id != member.member_id)
+        return db.scalar(count_stmt) or 0
+
+    total = registration_count_cache.get_or_compute(count_key, compute)
+    return _exclude_requesting_member(total, member, count_key)
+
+
+def get_member_location(db: Session, member_id: str) -> Optional[tuple[float, float]]:
+    row = db.execute(
+        select(Registration.latitude, Registration.longitude).where(Registration.member_id == member_id)
+    ).first()
+    if row is None or row.latitude is None or row.longitude is None:
+        return None
+    return row.latitude, row.longitude
+
+
+def _recommendation_pool(db: Session, preferred_gender: Optional[str]) -> CandidatePool:
+    def compute() -> CandidatePool:
+        stmt = select(
+            Registration.id,
+            Registration.nakshatra,
+            Registration.rasi,
+            Registration.gothram,
+            Registration.horoscope_matching_required,
+        ).where(Registration.is_active.is_(True))
+        if preferred_gender:
+            stmt = stmt.where(Registration.gender == preferred_gender)
+        return CandidatePool.from_rows(db.execute(stmt))
+
+    return recommendation_pool_cache.get_or_compute(("pool", preferred_gender), compute)
+
+
+def list_recommended_profiles_for_member(
+    db: Session,
+    member: MemberAuthSnapshot,
+    page: int = 1,
+    page_size: int = 20,
+    cursor: Optional[tuple[int, int]] = None,
+    include_total: bool = True,
+) -> tuple[list[tuple[ProfileCardRow, bool, int]], Optional[int], Optional[str]]:
+    """Return one page of the member's feed ranked by porutham score, as (card, unlocked, score) triples.
+
+    The pool's compatibility inputs are cached as arrays per gender bucket and scored in one vectorized pass
+    (see app.services.recommendations); only the page rows' card columns are then read. Rows deactivated
+    since the pool was built are dropped from the page.
+    """
+    preferred_gender = _preferred_gender_for_member(member.gender)
+    seeker_row = db.execute(
+        select(
+            Registration.id,
+            Registration.nakshatra,
+            Registration.rasi,
+            Registration.gothram,
+            Registration.horoscope_matching_required,
+        ).where(Registration.member_id == member.member_id)
+    ).first()
+    if seeker_row is None:
+        return [], 0 if include_total else None, None
+    seeker = Seeker(
+        registration_id=seeker_row.id,
+        role={"Female": "groom", "Male": "bride"}.get(preferred_gender or ""),
+        nakshatra=seeker_row.nakshatra,
+        rasi=seeker_row.rasi,
+        gothram=seeker_row.gothram,
+        horoscope_matching_required=seeker_row.horoscope_matching_required,
     )
-    if preferred_gender:
-        stmt = stmt.where(Registration.gender == preferred_gender)
-        count_stmt = count_stmt.where(Registration.gender == preferred_gender)
-    total = db.scalar(count_stmt) or 0
-    offset = (page - 1) * page_size
-    stmt = stmt.order_by(desc(Registration.created_at)).offset(offset).limit(page_size)
-    profiles = list(db.scalars(stmt).all())
+    ranked, total = rank_candidates(
+        _recommendation_pool(db, preferred_gender),
+        seeker,
+        limit=page_size + 1,
+        offset=0 if cursor is not None else (page - 1) * page_size,
+        after=cursor,
+    )
+    next_cursor = None
+    if len(ranked) > page_size:
+        ranked = ranked[:page_size]
+        row_id, score = ranked[-1]
+        next_cursor = encode_recommendation_cursor(score, row_id)
+
+    rows_by_id = {}
+    if ranked:
+        stmt = (
+            select(*_profile_card_select_columns(), MemberProfileAccess.id.is_not(None).label("unlocked"))
+            .outerjoin(MemberProfileAccess, _unlocked_flag_join(member.member_id))
+            .where(Registration.id.in_([row_id for row_id, _ in ranked]), *_feed_pool_conditions(member, preferred_gender))
+        )
+        rows_by_id = {row.id: row for row in db.execute(stmt)}
+    items = [
+        (_profile_card_from_row(rows_by_id[row_id]), bool(rows_by_id[row_id].unlocked), score)
+        for row_id, score in ranked
+        if row_id in rows_by_id
+    ]
+    return items, total if include_total else None, next_cursor
 
-    unlocked_stmt = select(MemberProfileAccess.profile_id).where(MemberProfileAccess.member_id == member.member_id)
-    unlocked_profile_ids = set(db.scalars(unlocked_stmt).all())
-    return [(profile, profile.member_id in unlocked_profile_ids) for profile in profiles], total
 
+def _load_feature_sources(db: Session, *conditions) -> list[FeatureSource]:
+    stmt = select(
+        Registration.id,
+        Registration.gender,
+        Registration.is_active,
+        Registration.birth_date,
+        Registration.education,
+        func.coalesce(json_text(Registration.extra_data, "natureOfWork"), Registration.occupation).label("occupation"),
+        func.coalesce(Registration.city, Registration.current_location).label("city"),
+        Registration.sect,
+        json_text(Registration.extra_data, "salary").label("salary"),
+        json_text(Registration.extra_data, "salaryCurrency").label("salary_currency"),
+    ).where(*conditions)
+    return [
+        FeatureSource(
+            id=row.id,
+            gender=row.gender,
+            is_active=bool(row.is_active),
+            birth_date=row.birth_date,
+            education=row.education,
+            occupation_bucket=row.occupation,
+            city=row.city,
+            sect=row.sect,
+            salary=row.salary,
+            salary_currency=row.salary_currency,
+        )
+        for row in db.execute(stmt)
+    ]
+
+
+def list_similar_profiles_for_member(
+    db: Session,
+    member: MemberAuthSnapshot,
+    profile_id: str,
+    limit: int = 10,
+) -> Optional[list[tuple[ProfileCardRow, bool]]]:
+    """Profiles nearest to profile_id by the in-memory feature matrix, closest first; None when the member
+    cannot see profile_id.
 
-def get_profile_for_member(db: Session, member: Registration, profile_id: str) -> Optional[tuple[Registration, bool]]:
+    The matrix is refreshed first: stale rows are reloaded on their own, the whole matrix only when expired.
+    """
     preferred_gender = _preferred_gender_for_member(member.gender)
-    stmt = select(Registration).where(
-        and_(
+    target_id = db.scalar(
+        select(Registration.id).where(
             Registration.member_id == profile_id,
-            Registration.is_active.is_(True),
-            Registration.member_id != member.member_id,
+            *_feed_pool_conditions(member, preferred_gender),
         )
     )
-    if preferred_gender:
-        stmt = stmt.where(Registration.gender == preferred_gender)
-    profile = db.scalar(stmt)
-    if not profile:
+    if target_id is None:
         return None
+    profile_feature_index.refresh(
+        lambda: _load_feature_sources(db, Registration.is_active.is_(True)),
+        lambda ids: _load_feature_sources(db, Registration.id.in_(ids)),
+    )
+    # One extra neighbour in case the requesting member shares the bucket and is among them.
+    neighbours = profile_feature_index.similar(target_id, limit + 1)
+    if not neighbours:
+        return []
+    stmt = (
+        select(*_profile_card_select_columns(), MemberProfileAccess.id.is_not(None).label("unlocked"))
+        .outerjoin(MemberProfileAccess, _unlocked_flag_join(member.member_id))
+        .where(
+            Registration.id.in_([row_id for row_id, _ in neighbours]),
+            *_feed_pool_conditions(member, preferred_gender),
+        )
+    )
+    rows_by_id = {row.id: row for row in db.execute(stmt)}
+    items = [
+        (_profile_card_from_row(rows_by_id[row_id]), bool(rows_by_id[row_id].unlocked))
+        for row_id, _ in neighbours
+        if row_id in rows_by_id
+    ]
+    return items[:limit]
 
-    access = db.scalar(
-        select(MemberProfileAccess).where(
-            and_(
-                MemberProfileAccess.member_id == member.member_id,
-                MemberProfileAccess.profile_id == profile.member_id,
+
+def list_feed_facets(db: Session, member: MemberAuthSnapshot) -> dict[str, list[tuple[str, int]]]:
+    """Per-value counts for each feed filter over the member's pool, read in one UNION ALL statement.
+
+    Results are shared per gender bucket through a short-TTL cache; a member without a preferred gender
+    gets their own entry because they sit inside their own pool.
+    """
+    preferred_gender = _preferred_gender_for_member(member.gender)
+    cache_key = ("facets", preferred_gender, member.member_id if preferred_gender is None else None)
+
+    def compute() -> dict[str, list[tuple[str, int]]]:
+        pool = _feed_pool_conditions(member, preferred_gender)
+        facet_selects = [
+            select(
+                literal(name).label("facet"),
+                cast(column, String).label("value"),
+                func.count().label("total"),
             )
+            .where(*pool, column.is_not(None), column != "")
+            .group_by(column)
+            for name, column in FEED_FACET_COLUMNS.items()
+        ]
+        facet_selects.append(
+            select(
+                literal("hasPhoto").label("facet"),
+                cast(Registration.has_photo, String).label("value"),
+                func.count().label("total"),
+            )
+            .where(*pool)
+            .group_by(Registration.has_photo)
         )
-    )
-    return profile, access is not None
+        facets: dict[str, list[tuple[str, int]]] = {name: [] for name in (*FEED_FACET_COLUMNS, "hasPhoto")}
+        for row in db.execute(union_all(*facet_selects)):
+            value = row.value
+            if row.facet == "hasPhoto":
+                value = "true" if json_truthy(value) else "false"
+            facets[row.facet].append((value, row.total))
+        for name, values in facets.items():
+            values.sort(key=lambda item: (-item[1], item[0]))
+            facets[name] = values[:FEED_FACET_VALUE_LIMIT]
+        return facets
 
+    return feed_facet_cache.get_or_compute(cache_key, compute)
 
-def unlock_profile_for_member(db: Session, member: Registration, profile: Registration) -> tuple[bool, int]:
-    access = db.scalar(
-        select(MemberProfileAccess).where(
+
+def _visible_profiles_stmt(member: MemberAuthSnapshot):
+    """Registration rows the member may open, each with its unlocked flag."""
+    stmt = (
+        select(Registration, MemberProfileAccess.id.is_not(None).label("unlocked"))
+        .outerjoin(MemberProfileAccess, _unlocked_flag_join(member.member_id))
+        .where(
             and_(
-                MemberProfileAccess.member_id == member.member_id,
-                MemberProfileAccess.profile_id == profile.member_id,
+                Registration.is_active.is_(True),
+                Registration.member_id != member.member_id,
             )
         )
     )
-    if access:
-        return False, member.credits
+    preferred_gender = _preferred_gender_for_member(member.gender)
+    if preferred_gender:
+        stmt = stmt.where(Registration.gender == preferred_gender)
+    return stmt
 
-    if member.credits <= 0:
-        raise ValueError("No credits available")
 
-    member.credits -= 1
-    db.add(member)
-    db.add(
-        MemberProfileAccess(
-            member_id=member.member_id,
-            profile_id=profile.member_id,
-            credits_spent=1,
-        )
+def get_profile_for_member(db: Session, member: MemberAuthSnapshot, profile_id: str) -> Optional[tuple[Registration, bool]]:
+    row = db.execute(_visible_profiles_stmt(member).where(Registration.member_id == profile_id)).first()
+    if not row:
+        return None
+    return row[0], bool(row.unlocked)
+
+
+def _insert_access_if_absent(db: Session, member_id: str, profile_id: str) -> bool:
+    """Insert the access row unless the pair is already unlocked; True when this call inserted it."""
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    stmt = (
+        insert(MemberProfileAccess)
+        .values(member_id=member_id, profile_id=profile_id, credits_spent=1)
+        .on_conflict_do_nothing(index_elements=["member_id", "profile_id"])
+        .returning(MemberProfileAccess.id)
     )
+    return db.execute(stmt).first() is not None
+
+
+def unlock_profile_for_member(db: Session, member: MemberAuthSnapshot, profile: Registration) -> tuple[bool, int]:
+    """Spend one credit to unlock profile; (False, credits) when it was already unlocked.
+
+    One transaction: claim the (member, profile) access row with an insert-or-ignore, then take the credit
+    with a conditional UPDATE ... WHERE credits > 0 RETURNING credits. Concurrent taps therefore cannot
+    both pass the balance check or charge twice for the same profile; a refused debit rolls the claim back.
+    """
+    inserted = _insert_access_if_absent(db, member.member_id, profile.member_id)
+    if not inserted:
+        db.rollback()
+        credits = db.scalar(select(Registration.credits).where(Registration.member_id == member.member_id))
+        return False, credits if credits is not None else member.credits
+
+    credits = db.execute(
+        update(Registration)
+        .where(Registration.member_id == member.member_id, Registration.credits > 0)
+        .values(credits=Registration.credits - 1)
+        .returning(Registration.credits)
+        .execution_options(synchronize_session=False)
+    ).scalar_one_or_none()
+    if credits is None:
+        db.rollback()
+        raise ValueError("No credits available")
     db.commit()
-    db.refresh(member)
-    return True, member.credits
+    invalidate_member_snapshot(member.member_id)
+    return True, credits
 
 
-def list_recent_verified_profiles(db: Session, limit: int = 8) -> list[Registration]:
-    stmt = (
-        select(Registration)
-        .where(
-            and_(
-                Registration.is_active.is_(True),
-                func.lower(func.coalesce(Registration.status, "")) == "verified",
+@dataclass
+class BulkUnlockResult:
+    # (profile, newly unlocked by this request) in request order.
+    unlocked: list[tuple[Registration, bool]]
+    not_found: list[str]
+    insufficient_credits: list[str]
+    credits_spent: int
+    credits_remaining: int
+
+
+def unlock_profiles_for_member(db: Session, member: MemberAuthSnapshot, profile_ids: list[str]) -> BulkUnlockResult:
+    """Unlock several profiles in one transaction, spending credits in request order.
+
+    Eligibility and existing unlocks come from one query. Access rows for the locked subset are claimed with
+    a single insert-or-ignore; once the member's balance is read under that write lock, rows beyond the
+    balance are dropped again and the rest are paid for with one conditional debit. Profiles that could not
+    be paid for are reported in insufficient_credits rather than failing the whole request.
+    """
+    requested = list(dict.fromkeys(profile_ids))
+    rows = db.execute(_visible_profiles_stmt(member).where(Registration.member_id.in_(requested))).all()
+    found = {row[0].member_id: (row[0], bool(row.unlocked)) for row in rows}
+    eligible = [profile_id for profile_id in requested if profile_id in found]
+    not_found = [profile_id for profile_id in requested if profile_id not in found]
+    locked = [profile_id for profile_id in eligible if not found[profile_id][1]]
+
+    claimed: set[str] = set()
+    if locked:
+        if db.get_bind().dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        claimed = set(
+            db.scalars(
+                insert(MemberProfileAccess)
+                .values([{"member_id": member.member_id, "profile_id": profile_id, "credits_spent": 1} for profile_id in locked])
+                .on_conflict_do_nothing(index_elements=["member_id", "profile_id"])
+                .returning(MemberProfileAccess.profile_id)
+            ).all()
+        )
+    balance = db.scalar(
+        select(Registration.credits).where(Registration.member_id == member.member_id).with_for_update()
+    )
+    # A negative balance (admin correction) buys nothing; slicing by it would charge most of the list.
+    balance = max(balance or 0, 0)
+    to_charge = [profile_id for profile_id in locked if profile_id in claimed]
+    paid, unpaid = to_charge[:balance], to_charge[balance:]
+    if unpaid:
+        db.execute(
+            delete(MemberProfileAccess).where(
+                MemberProfileAccess.member_id == member.member_id,
+                MemberProfileAccess.profile_id.in_(unpaid),
             )
         )
+    credits_remaining = balance
+    if paid:
+        credits_remaining = db.execute(
+            update(Registration)
+            .where(Registration.member_id == member.member_id, Registration.credits >= len(paid))
+            .values(credits=Registration.credits - len(paid))
+            .returning(Registration.credits)
+            .execution_options(synchronize_session=False)
+        ).scalar_one()
+    # The profiles are returned with their details; keep the rows loaded above instead of letting the commit
+    # expire them into one lazy SELECT per profile. This transaction never modified them.
+    expire_on_commit = db.expire_on_commit
+    db.expire_on_commit = False
+    try:
+        db.commit()
+    finally:
+        db.expire_on_commit = expire_on_commit
+    if paid:
+        invalidate_member_snapshot(member.member_id)
+
+    newly = set(paid)
+    skipped = set(unpaid)
+    return BulkUnlockResult(
+        unlocked=[(found[profile_id][0], profile_id in newly) for profile_id in eligible if profile_id not in skipped],
+        not_found=not_found,
+        insufficient_credits=unpaid,
+        credits_spent=len(paid),
+        credits_remaining=credits_remaining,
+    )
+
+
+def list_recent_verified_profiles(db: Session, limit: int = 8) -> list[tuple]:
+    """Carousel columns of the newest verified profiles, read off the ix_registrations_verified_recent partial index.
+
+    extra_data is only fetched for the rare rows whose photo lives outside the card columns (legacy URLs).
+    """
+    rows = db.execute(
+        select(
+            Registration.id,
+            Registration.member_id,
+            Registration.birth_date,
+            Registration.occupation,
+            Registration.city,
+            Registration.current_location,
+            Registration.gothram,
+            _profile_card_column("image_url"),
+            Registration.photo_hash,
+            Registration.has_photo,
+        )
+        # A literal (not a bound parameter), so the planner can match the partial index predicate.
+        .where(Registration.is_active.is_(True), Registration.status == literal_column(f"'{STATUS_VERIFIED}'"))
         .order_by(desc(Registration.created_at))
         .limit(limit)
-    )
-    return list(db.scalars(stmt).all())
+    ).all()
+    legacy_ids = [row.id for row in rows if row.has_photo and not row.image_url and not row.photo_hash]
+    legacy_photos = {}
+    if legacy_ids:
+        legacy_photos = dict(
+            db.execute(select(Registration.id, Registration.extra_data).where(Registration.id.in_(legacy_ids))).all()
+        )
+    return [(row, legacy_photos.get(row.id)) for row in rows]
@@ -1,11 +1,15 @@
+import hmac
 import secrets
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, case, delete, func, or_, select, update
 from sqlalchemy.orm import Session
 
 from app.models.profile_share_link import ProfileShareLink
+from app.services.share_access import AccessBatch, share_access_tracker
+from app.services.share_token import create_share_token, decode_share_token, is_signed_share_token, revoked_share_links
+from app.services.shared_profile_cache import shared_profile_cache
 
 
 def _utc_now() -> datetime:
@@ -15,46 +19,135 @@ def _utc_now() -> datetime:
 def create_profile_share_link(
     db: Session,
     member_id: str,
+    secret: str,
     expires_in_days: int = 7,
     include_contact_details: bool = False,
 ) -> ProfileShareLink:
-    max_attempts = 8
-    for _ in range(max_attempts):
-        token = secrets.token_urlsafe(32)
-        existing = db.scalar(
-            select(ProfileShareLink).where(ProfileShareLink.token == token)
-        )
-        if existing:
-            continue
+    """Create a link whose token signs its own id, owner, expiry and contact flag (unique by construction)."""
+    expires_at = (_utc_now() + timedelta(days=expires_in_days)).replace(microsecond=0)
+    link = ProfileShareLink(
+        member_id=member_id,
+        # Placeholder until the row id needed by the signed token exists.
+        token=f"pending-{secrets.token_urlsafe(16)}",
+        include_contact_details=include_contact_details,
+        expires_at=expires_at,
+    )
+    db.add(link)
+    db.flush()
+    link.token = create_share_token(
+        link.id,
+        member_id,
+        int(expires_at.timestamp()),
+        include_contact_details,
+        secret,
+    )
+    db.commit()
+    db.refresh(link)
+    return link
+
+
+def get_profile_share_link_by_token(
+    db: Session,
+    token: str,
+    secret: str,
+    accept_legacy: bool = True,
+) -> Optional[ProfileShareLink]:
+    """Signed tokens are verified first and then fetched by primary key; unsigned legacy tokens fall back
+    to the token lookup while accept_legacy is on."""
+    if not is_signed_share_token(token):
+        if not accept_legacy:
+            return None
+        return db.scalar(select(ProfileShareLink).where(ProfileShareLink.token == token))
+    claims = decode_share_token(token, secret)
+    if claims is None:
+        return None
+    link = db.get(ProfileShareLink, claims.link_id)
+    if link is None or not hmac.compare_digest(link.token, token):
+        return None
+    return link
 
-        link = ProfileShareLink(
-            member_id=member_id,
-            token=token,
-            include_contact_details=include_contact_details,
-            expires_at=_utc_now() + timedelta(days=expires_in_days),
-        )
-        db.add(link)
-        db.commit()
-        db.refresh(link)
-        return link
 
-    raise RuntimeError("Failed to create unique share token")
+def list_active_profile_share_links(db: Session, member_id: str) -> list[ProfileShareLink]:
+    """The member's unrevoked, unexpired links, soonest expiry last (served by ix_profile_share_links_active_member)."""
+    return list(
+        db.scalars(
+            select(ProfileShareLink)
+            .where(
+                ProfileShareLink.member_id == member_id,
+                ProfileShareLink.revoked_at.is_(None),
+                ProfileShareLink.expires_at > _utc_now(),
+            )
+            .order_by(ProfileShareLink.expires_at.desc())
+        ).all()
+    )
+
+
+def delete_expired_profile_share_links(db: Session, cutoff: datetime, batch_size: int) -> int:
+    """Delete up to batch_size links that expired before cutoff; revoked links go once they have expired too,
+    so the in-memory revoked set never needs ids the table has forgotten."""
+    link_ids = list(
+        db.scalars(
+            select(ProfileShareLink.id)
+            .where(ProfileShareLink.expires_at < cutoff)
+            .order_by(ProfileShareLink.expires_at)
+            .limit(batch_size)
+        ).all()
+    )
+    if not link_ids:
+        return 0
+    db.execute(delete(ProfileShareLink).where(ProfileShareLink.id.in_(link_ids)))
+    db.commit()
+    return len(link_ids)
 
 
-def get_profile_share_link_by_token(db: Session, token: str) -> Optional[ProfileShareLink]:
-    return db.scalar(select(ProfileShareLink).where(ProfileShareLink.token == token))
+def list_revoked_profile_share_link_ids(db: Session) -> list[int]:
+    return list(
+        db.scalars(
+            select(ProfileShareLink.id).where(
+                ProfileShareLink.revoked_at.is_not(None),
+                ProfileShareLink.expires_at > _utc_now(),
+            )
+        ).all()
+    )
 
 
-def is_profile_share_link_expired(link: ProfileShareLink) -> bool:
-    expires_at = link.expires_at
-    if expires_at.tzinfo is None:
-        expires_at = expires_at.replace(tzinfo=timezone.utc)
-    return expires_at <= _utc_now()
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
 
 
-def mark_profile_share_accessed(db: Session, link: ProfileShareLink) -> None:
-    link.last_accessed_at = _utc_now()
-    db.add(link)
+def is_profile_share_link_expired(link: ProfileShareLink) -> bool:
+    return _as_utc(link.expires_at) <= _utc_now()
+
+
+def profile_share_access_stats(link: ProfileShareLink) -> tuple[int, Optional[datetime]]:
+    """(view count, last accessed) including views still buffered in this process."""
+    pending_views, pending_accessed_at = share_access_tracker.pending(link.id)
+    last_accessed_at = _as_utc(link.last_accessed_at) if link.last_accessed_at is not None else None
+    if pending_accessed_at is not None and (last_accessed_at is None or last_accessed_at < pending_accessed_at):
+        last_accessed_at = pending_accessed_at
+    return (link.view_count or 0) + pending_views, last_accessed_at
+
+
+def record_profile_share_access(db: Session, batch: AccessBatch) -> None:
+    """Apply buffered share views in one executemany UPDATE: add the view counts and move
+    last_accessed_at forward (never back, since several processes flush independently)."""
+    table = ProfileShareLink.__table__
+    accessed_at = bindparam("accessed_at")
+    db.execute(
+        update(table)
+        .where(table.c.id == bindparam("link_id"))
+        .values(
+            view_count=func.coalesce(table.c.view_count, 0) + bindparam("views"),
+            last_accessed_at=case(
+                (or_(table.c.last_accessed_at.is_(None), table.c.last_accessed_at < accessed_at), accessed_at),
+                else_=table.c.last_accessed_at,
+            ),
+        ),
+        [
+            {"link_id": link_id, "views": views, "accessed_at": latest}
+            for link_id, (views, latest) in sorted(batch.items())
+        ],
+    )
     db.commit()
 
 
@@ -62,5 +155,7 @@ def revoke_profile_share_link(db: Session, link: ProfileShareLink) -> ProfileSha
     link.revoked_at = _utc_now()
     db.add(link)
     db.commit()
+    revoked_share_links.add(link.id)
+    shared_profile_cache.invalidate_token(link.token)
     db.refresh(link)
     return link
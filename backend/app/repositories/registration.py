@@ -1,13 +1,36 @@
-from sqlalchemy import asc, desc, func, or_, select
-from sqlalchemy.orm import Session
+import logging
+from datetime import datetime
+from sqlalchemy import asc, desc, func, or_, select, text, update
+from sqlalchemy.orm import Session, defer
 from typing import Optional
 
+from app.db.json_columns import json_without_keys
+from app.db.registration_search import registration_search_matches
 from app.models.registration import Registration
 from app.schemas.registration import RegistrationCreate
-from app.services.security import hash_password
+from app.services.count_cache import invalidate_registration_counts, registration_count_cache
+from app.services.member_cache import MemberAuthSnapshot, invalidate_member_snapshot, member_snapshot_cache
+from app.services.member_session import session_registry
+from app.services.name_phonetics import name_distance, phonetic_key, phonetic_key_range
+from app.services.profile_card import PROFILE_CARD_VERSION, apply_profile_card_columns, profile_card_values
+from app.services.profile_features import profile_feature_index
+from app.services.public_carousel import public_carousel_cache
+from app.services.registration_enums import (
+    GENDERS,
+    REGISTRATION_STATUSES,
+    STATUS_NEW,
+    normalize_gender,
+    normalize_status,
+)
+from app.services.shared_profile_cache import shared_profile_cache
 
+logger = logging.getLogger(__name__)
 
-def create_registration(db: Session, payload: RegistrationCreate) -> Registration:
+# Most phonetic matches a fuzzy admin search will rank; a key shared by more rows than this is too vague anyway.
+FUZZY_CANDIDATE_LIMIT = 500
+
+
+def create_registration(db: Session, payload: RegistrationCreate, password_hash: str) -> Registration:
     payload_dict = payload.model_dump()
 
     known_fields = {
@@ -31,7 +54,7 @@ def create_registration(db: Session, payload: RegistrationCreate) -> Registratio
         name=payload.name,
         email=payload.email,
         phone=payload.phone,
-        password_hash=hash_password(payload.password),
+        password_hash=password_hash,
         gender=payload.gender,
         dob=payload.dob,
         city=payload.city,
@@ -40,16 +63,19 @@ def create_registration(db: Session, payload: RegistrationCreate) -> Registratio
         occupation=payload.occupation,
         gothram=payload.gothram,
         message=payload.message,
-        status="New",
+        status=STATUS_NEW,
         is_active=True,
         credits=3,
         extra_data=extra_data,
     )
+    apply_profile_card_columns(registration)
     db.add(registration)
     db.flush()
     registration.member_id = f"VV-{registration.id:06d}"
     db.commit()
     db.refresh(registration)
+    invalidate_registration_counts()
+    profile_feature_index.mark_stale(registration.id)
     return registration
 
 
@@ -69,21 +95,43 @@ def list_registrations_paginated(
     max_credits: Optional[int] = None,
     sort_by: str = "created_at",
     sort_order: str = "desc",
-) -> tuple[list[Registration], int]:
+    include_total: bool = True,
+    estimate_total: bool = False,
+    fuzzy: bool = False,
+) -> tuple[list[tuple[Registration, dict]], Optional[int], bool]:
+    """Return a page of registrations paired with their extra_data minus the photo payload.
+
+    extra_data and password_hash are deferred; the listing's extra_data is trimmed by the database so
+    profile photo data URLs are never read for admin list pages.
+
+    With fuzzy, the name (or else search) term is matched by sound through the indexed name_phonetic
+    column instead of by substring, and results are ordered by edit distance to the term.
+    """
     filters = []
+    fuzzy_term = (name or search or "").strip() if fuzzy else ""
+    if fuzzy_term:
+        key = phonetic_key(fuzzy_term)
+        if key is None:
+            return [], 0 if include_total else None, False
+        low, high = phonetic_key_range(key)
+        filters.extend([Registration.name_phonetic >= low, Registration.name_phonetic < high])
+        # Only the term used for the sound match is consumed; a search given alongside name still filters.
+        if name and name.strip():
+            name = None
+        else:
+            search = None
 
-    if search:
-        keyword = f"%{search.strip()}%"
-        filters.append(
-            or_(
-                Registration.name.ilike(keyword),
-                Registration.member_id.ilike(keyword),
-            )
+    # Text filters are served by the search index (FTS5 / pg_trgm); each yields an (id, rank) subquery that
+    # is joined in, and the free-text search's rank orders results when sorting by relevance.
+    search_matches = [
+        matches
+        for matches in (
+            registration_search_matches(db, search) if search else None,
+            registration_search_matches(db, member_id, column_name="member_id") if member_id else None,
+            registration_search_matches(db, name, column_name="name") if name else None,
         )
-    if member_id:
-        filters.append(Registration.member_id.ilike(f"%{member_id.strip()}%"))
-    if name:
-        filters.append(Registration.name.ilike(f"%{name.strip()}%"))
+        if matches is not None
+    ]
     if is_active is not None:
         filters.append(Registration.is_active == is_active)
     if max_credits is not None:
@@ -99,18 +147,81 @@ def list_registrations_paginated(
         "is_active": Registration.is_active,
     }
     sort_column = sortable_columns.get(sort_by, Registration.created_at)
-    sort_clause = asc(sort_column) if sort_order.lower() == "asc" else desc(sort_column)
+    sort_clauses = [asc(sort_column) if sort_order.lower() == "asc" else desc(sort_column)]
+    if sort_by == "relevance" and search_matches:
+        sort_clauses = [asc(search_matches[0].c.rank), desc(Registration.created_at)]
 
-    base_query = select(Registration)
+    base_query = select(Registration, json_without_keys(Registration.extra_data, "profilePhoto")).options(
+        defer(Registration.extra_data),
+        defer(Registration.password_hash),
+    )
     count_query = select(func.count(Registration.id))
+    for matches in search_matches:
+        base_query = base_query.join(matches, matches.c.id == Registration.id)
+        count_query = count_query.join(matches, matches.c.id == Registration.id)
     if filters:
         base_query = base_query.where(*filters)
         count_query = count_query.where(*filters)
 
-    total = db.scalar(count_query) or 0
+    if fuzzy_term:
+        return _fuzzy_registration_page(db, base_query, fuzzy_term, page, page_size, include_total)
+
+    total = None
+    total_estimated = False
+    if include_total:
+        if estimate_total and not filters and not search_matches:
+            total = _estimate_registration_count(db)
+            total_estimated = total is not None
+        if total is None:
+            count_key = (
+                "admin",
+                (search or "").strip().lower(),
+                (member_id or "").strip().lower(),
+                (name or "").strip().lower(),
+                is_active,
+                max_credits,
+            )
+            total = registration_count_cache.get_or_compute(count_key, lambda: db.scalar(count_query) or 0)
+
     offset = (page - 1) * page_size
-    rows = list(db.scalars(base_query.order_by(sort_clause).offset(offset).limit(page_size)).all())
-    return rows, total
+    rows = db.execute(base_query.order_by(*sort_clauses).offset(offset).limit(page_size)).all()
+    return [(row[0], row[1] or {}) for row in rows], total, total_estimated
+
+
+def _fuzzy_registration_page(
+    db: Session,
+    base_query,
+    term: str,
+    page: int,
+    page_size: int,
+    include_total: bool,
+) -> tuple[list[tuple[Registration, dict]], Optional[int], bool]:
+    # Only (id, name) of the phonetic candidates is read to rank them; full rows are loaded for one page.
+    # Walking the key index in order keeps exact key matches ahead of longer keys when the cap is hit.
+    candidate_query = (
+        base_query.with_only_columns(Registration.id, Registration.name)
+        .order_by(Registration.name_phonetic, Registration.id)
+        .limit(FUZZY_CANDIDATE_LIMIT)
+    )
+    candidates = db.execute(candidate_query).all()
+    ranked = sorted(candidates, key=lambda row: (name_distance(term, row.name), row.name.lower(), row.id))
+    offset = (page - 1) * page_size
+    page_ids = [row.id for row in ranked[offset : offset + page_size]]
+    rows_by_id = {}
+    if page_ids:
+        rows_by_id = {row[0].id: row for row in db.execute(base_query.where(Registration.id.in_(page_ids))).all()}
+    rows = [rows_by_id[row_id] for row_id in page_ids if row_id in rows_by_id]
+    total = len(candidates) if include_total else None
+    return [(row[0], row[1] or {}) for row in rows], total, False
+
+
+def _estimate_registration_count(db: Session) -> Optional[int]:
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    estimate = db.scalar(text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'registrations'::regclass"))
+    if estimate is None or estimate < 0:
+        return None
+    return int(estimate)
 
 
 def get_registration_by_member_id(db: Session, member_id: str) -> Optional[Registration]:
@@ -118,6 +229,58 @@ def get_registration_by_member_id(db: Session, member_id: str) -> Optional[Regis
     return db.scalar(stmt)
 
 
+def get_registration_updated_at(db: Session, member_id: str) -> Optional[datetime]:
+    """The profile's updated_at alone, for cheap freshness checks of rendered copies."""
+    return db.scalar(select(Registration.updated_at).where(Registration.member_id == member_id))
+
+
+def get_member_auth_snapshot(db: Session, member_id: str) -> Optional[MemberAuthSnapshot]:
+    snapshot = member_snapshot_cache.get(member_id)
+    if snapshot is not None:
+        return snapshot
+
+    row = db.execute(
+        select(
+            Registration.member_id,
+            Registration.gender,
+            Registration.is_active,
+            Registration.credits,
+            Registration.updated_at,
+            Registration.session_version,
+        ).where(Registration.member_id == member_id)
+    ).first()
+    if row is None:
+        return None
+    snapshot = MemberAuthSnapshot(
+        member_id=row.member_id,
+        gender=row.gender,
+        is_active=bool(row.is_active),
+        credits=row.credits or 0,
+        version=row.updated_at,
+        session_version=row.session_version or 0,
+    )
+    member_snapshot_cache.put(snapshot)
+    return snapshot
+
+
+def list_member_session_versions(db: Session) -> list[tuple[str, int]]:
+    stmt = select(Registration.member_id, Registration.session_version).where(Registration.session_version > 0)
+    return [(row.member_id, row.session_version) for row in db.execute(stmt)]
+
+
+def _revoke_member_sessions(registration: Registration) -> None:
+    registration.session_version = (registration.session_version or 0) + 1
+
+
+def detach_registration(db: Session, registration: Optional[Registration]) -> Optional[Registration]:
+    """Detach a loaded row and end the read transaction so the pooled connection is
+    released while the caller awaits slow work such as bcrypt."""
+    if registration is not None:
+        db.expunge(registration)
+    db.rollback()
+    return registration
+
+
 def update_registration_fields(db: Session, registration: Registration, updates: dict) -> Registration:
     editable_fields = {
         "name",
@@ -135,6 +298,8 @@ def update_registration_fields(db: Session, registration: Registration, updates:
         "is_active",
         "credits",
     }
+    if updates.get("is_active") is False and registration.is_active:
+        _revoke_member_sessions(registration)
     for key, value in updates.items():
         if key in editable_fields:
             setattr(registration, key, value)
@@ -148,18 +313,28 @@ def update_registration_fields(db: Session, registration: Registration, updates:
                 **(registration.extra_data or {}),
                 key: value,
             }
+    apply_profile_card_columns(registration)
 
     db.add(registration)
     db.commit()
     db.refresh(registration)
+    invalidate_member_snapshot(registration.member_id)
+    session_registry.record(registration.member_id, registration.session_version)
+    invalidate_registration_counts()
+    profile_feature_index.mark_stale(registration.id)
+    shared_profile_cache.invalidate_member(registration.member_id)
+    public_carousel_cache.invalidate()
     return registration
 
 
-def reset_registration_password(db: Session, registration: Registration, new_password: str) -> Registration:
-    registration.password_hash = hash_password(new_password)
+def reset_registration_password(db: Session, registration: Registration, password_hash: str) -> Registration:
+    registration.password_hash = password_hash
+    _revoke_member_sessions(registration)
     db.add(registration)
     db.commit()
     db.refresh(registration)
+    invalidate_member_snapshot(registration.member_id)
+    session_registry.record(registration.member_id, registration.session_version)
     return registration
 
 
@@ -168,6 +343,7 @@ def update_registration_address(db: Session, registration: Registration, address
     db.add(registration)
     db.commit()
     db.refresh(registration)
+    invalidate_member_snapshot(registration.member_id)
     return registration
 
 
@@ -199,8 +375,124 @@ def update_registration_member_fields(
             **(registration.extra_data or {}),
             **extra_data,
         }
+    if extra_data is not None or city is not None:
+        apply_profile_card_columns(registration)
 
     db.add(registration)
     db.commit()
     db.refresh(registration)
+    invalidate_member_snapshot(registration.member_id)
+    profile_feature_index.mark_stale(registration.id)
+    shared_profile_cache.invalidate_member(registration.member_id)
+    public_carousel_cache.invalidate()
     return registration
+
+
+def backfill_profile_card_columns(db: Session, batch_size: int = 500) -> int:
+    """Populate the materialized card columns for rows written before they existed (or by an older extractor).
+
+    Works through stale rows in id order with one executemany UPDATE and commit per batch, so a large table
+    is never held in one transaction. updated_at is carried through unchanged. dob values that cannot be
+    parsed into birth_date are logged. Returns the rows updated.
+    """
+    updated = 0
+    unparseable_dobs: list[tuple[str, str]] = []
+    last_id = 0
+    while True:
+        rows = db.execute(
+            select(
+                Registration.id,
+                Registration.member_id,
+                Registration.name,
+                Registration.city,
+                Registration.dob,
+                Registration.extra_data,
+                Registration.updated_at,
+            )
+            .where(
+                Registration.id > last_id,
+                or_(Registration.card_version.is_(None), Registration.card_version < PROFILE_CARD_VERSION),
+            )
+            .order_by(Registration.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        params = []
+        for row in rows:
+            values = profile_card_values(row.extra_data, row.dob, row.name, row.city)
+            if values["birth_date"] is None and (row.dob or "").strip():
+                unparseable_dobs.append((row.member_id, row.dob))
+            params.append({"id": row.id, "updated_at": row.updated_at, **values})
+        db.execute(update(Registration), params)
+        db.commit()
+        updated += len(rows)
+        last_id = rows[-1].id
+
+    if unparseable_dobs:
+        logger.warning(
+            "%d registration(s) have a dob that could not be parsed; birth_date left empty: %s",
+            len(unparseable_dobs),
+            ", ".join(f"{member_id}={dob!r}" for member_id, dob in unparseable_dobs[:50]),
+        )
+    return updated
+
+
+def normalize_registration_enums(db: Session, batch_size: int = 1000) -> int:
+    """Rewrite free-text status and gender values to their canonical spelling (see registration_enums).
+
+    Only non-canonical rows are selected, in id order, with one executemany UPDATE and commit per batch;
+    updated_at is carried through unchanged. Recognised spellings are rewritten, a missing status becomes
+    New and a blank gender is cleared. Unrecognised values are left as they are and logged so an admin can
+    fix them. Returns the rows updated.
+    """
+    updated = 0
+    unrecognised: list[tuple[str, str, str]] = []
+    last_id = 0
+    while True:
+        rows = db.execute(
+            select(
+                Registration.id,
+                Registration.member_id,
+                Registration.status,
+                Registration.gender,
+                Registration.updated_at,
+            )
+            .where(
+                Registration.id > last_id,
+                or_(
+                    Registration.status.is_(None),
+                    Registration.status.not_in(REGISTRATION_STATUSES),
+                    Registration.gender.not_in(GENDERS),
+                ),
+            )
+            .order_by(Registration.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        params = []
+        for row in rows:
+            status = normalize_status(row.status) if (row.status or "").strip() else STATUS_NEW
+            if status is None:
+                status = row.status
+                unrecognised.append((row.member_id, "status", row.status))
+            gender = normalize_gender(row.gender) if (row.gender or "").strip() else None
+            if gender is None and (row.gender or "").strip():
+                gender = row.gender
+                unrecognised.append((row.member_id, "gender", row.gender))
+            if (status, gender) != (row.status, row.gender):
+                params.append({"id": row.id, "status": status, "gender": gender, "updated_at": row.updated_at})
+        if params:
+            db.execute(update(Registration), params)
+            db.commit()
+        updated += len(params)
+        last_id = rows[-1].id
+
+    if unrecognised:
+        logger.warning(
+            "%d registration status/gender value(s) were not recognised and were left unchanged: %s",
+            len(unrecognised),
+            ", ".join(f"{member_id} {field}={value!r}" for member_id, field, value in unrecognised[:50]),
+        )
+    return updated
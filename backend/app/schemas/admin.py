@@ -1,7 +1,9 @@
 from datetime import datetime
 from typing import Any, Optional
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from app.services.registration_enums import GENDERS, REGISTRATION_STATUSES, normalize_gender, normalize_status
 
 
 class AdminLoginRequest(BaseModel):
@@ -51,11 +53,32 @@ class AdminRegistrationUpdateRequest(BaseModel):
     message: Optional[str] = None
     status: Optional[str] = None
     isActive: Optional[bool] = None
-    credits: Optional[int] = None
+    credits: Optional[int] = Field(default=None, ge=0)
     extraData: Optional[dict[str, Any]] = None
 
     model_config = ConfigDict(extra="allow")
 
+    @field_validator("gender")
+    @classmethod
+    def _canonical_gender(cls, value: Optional[str]) -> Optional[str]:
+        if value is None or not value.strip():
+            return None
+        gender = normalize_gender(value)
+        if gender is None:
+            raise ValueError(f"gender must be one of {', '.join(GENDERS)}")
+        return gender
+
+    @field_validator("status")
+    @classmethod
+    def _canonical_status(cls, value: Optional[str]) -> Optional[str]:
+        # An explicit null leaves the status unchanged, like an omitted field.
+        if value is None:
+            return None
+        status = normalize_status(value)
+        if status is None:
+            raise ValueError(f"status must be one of {', '.join(REGISTRATION_STATUSES)}")
+        return status
+
 
 class AdminResetPasswordRequest(BaseModel):
     newPassword: str
@@ -67,9 +90,10 @@ class AdminActionResponse(BaseModel):
 
 class AdminRegistrationListResponse(BaseModel):
     items: list[AdminRegistrationItem]
-    total: int
+    total: Optional[int] = None
+    total_estimated: bool = Field(default=False, serialization_alias="totalEstimated")
     page: int
     page_size: int = Field(serialization_alias="pageSize")
-    total_pages: int = Field(serialization_alias="totalPages")
+    total_pages: Optional[int] = Field(default=None, serialization_alias="totalPages")
 
     model_config = ConfigDict(populate_by_name=True)
@@ -23,6 +23,7 @@ class MemberProfileBasic(BaseModel):
     image_url: Optional[str] = Field(default=None, serialization_alias="imageUrl")
     has_photo: bool = Field(serialization_alias="hasPhoto")
     unlocked: bool
+    compatibility_score: Optional[int] = Field(default=None, serialization_alias="compatibilityScore")
 
     model_config = ConfigDict(populate_by_name=True)
 
@@ -54,14 +55,31 @@ class MemberProfileDetailResponse(BaseModel):
 class MemberProfileListResponse(BaseModel):
     items: list[MemberProfileBasic]
     credits_remaining: int = Field(serialization_alias="creditsRemaining")
-    total: int
+    total: Optional[int] = None
     page: int
     page_size: int = Field(serialization_alias="pageSize")
-    total_pages: int = Field(serialization_alias="totalPages")
+    total_pages: Optional[int] = Field(default=None, serialization_alias="totalPages")
+    next_cursor: Optional[str] = Field(default=None, serialization_alias="nextCursor")
 
     model_config = ConfigDict(populate_by_name=True)
 
 
+class MemberProfileSimilarResponse(BaseModel):
+    items: list[MemberProfileBasic]
+    credits_remaining: int = Field(serialization_alias="creditsRemaining")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class MemberProfileFacetValue(BaseModel):
+    value: str
+    count: int
+
+
+class MemberProfileFacetsResponse(BaseModel):
+    facets: dict[str, list[MemberProfileFacetValue]]
+
+
 class UnlockProfileResponse(BaseModel):
     message: str
     profile: MemberProfileBasic
@@ -69,3 +87,26 @@ class UnlockProfileResponse(BaseModel):
     credits_remaining: int = Field(serialization_alias="creditsRemaining")
 
     model_config = ConfigDict(populate_by_name=True)
+
+
+class BulkUnlockRequest(BaseModel):
+    profileIds: list[str] = Field(min_length=1, max_length=50)
+
+
+class BulkUnlockedProfile(BaseModel):
+    profile: MemberProfileBasic
+    full_details: MemberProfileDetails = Field(serialization_alias="fullDetails")
+    newly_unlocked: bool = Field(serialization_alias="newlyUnlocked")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class BulkUnlockResponse(BaseModel):
+    message: str
+    items: list[BulkUnlockedProfile]
+    not_found: list[str] = Field(serialization_alias="notFound")
+    insufficient_credits: list[str] = Field(serialization_alias="insufficientCredits")
+    credits_spent: int = Field(serialization_alias="creditsSpent")
+    credits_remaining: int = Field(serialization_alias="creditsRemaining")
+
+    model_config = ConfigDict(populate_by_name=True)
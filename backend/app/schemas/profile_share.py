@@ -61,6 +61,23 @@ class ProfileSharePublicResponse(BaseModel):
     model_config = ConfigDict(populate_by_name=True)
 
 
+class ProfileShareLinkSummary(BaseModel):
+    token: str
+    share_path: str = Field(serialization_alias="sharePath")
+    created_at: Optional[datetime] = Field(default=None, serialization_alias="createdAt")
+    expires_at: datetime = Field(serialization_alias="expiresAt")
+    include_contact_details: bool = Field(serialization_alias="includeContactDetails")
+    link_status: str = Field(serialization_alias="linkStatus")
+    last_accessed_at: Optional[datetime] = Field(default=None, serialization_alias="lastAccessedAt")
+    view_count: int = Field(serialization_alias="viewCount")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class ProfileShareLinkListResponse(BaseModel):
+    items: list[ProfileShareLinkSummary]
+
+
 class ProfileShareRevokeResponse(BaseModel):
     message: str
     link_status: str = Field(serialization_alias="linkStatus")
@@ -2,7 +2,9 @@ from datetime import datetime
 from typing import Any
 from typing import Optional
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from app.services.registration_enums import GENDERS, normalize_gender
 
 
 class RegistrationCreate(BaseModel):
@@ -21,6 +23,16 @@ class RegistrationCreate(BaseModel):
 
     model_config = ConfigDict(extra="allow")
 
+    @field_validator("gender")
+    @classmethod
+    def _canonical_gender(cls, value: Optional[str]) -> Optional[str]:
+        if value is None or not value.strip():
+            return None
+        gender = normalize_gender(value)
+        if gender is None:
+            raise ValueError(f"gender must be one of {', '.join(GENDERS)}")
+        return gender
+
 
 class RegistrationCreateResponse(BaseModel):
     id: str
@@ -0,0 +1,65 @@
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Optional, Union
+
+# Accepted spellings of a birth date, tried in order; the registration form submits ISO dates.
+_BIRTH_DATE_FORMATS = ("%Y-%m-%d", "%d-%m-%Y", "%d/%m/%Y", "%Y/%m/%d", "%d.%m.%Y")
+_MIN_BIRTH_YEAR = 1900
+
+
+@lru_cache(maxsize=65536)
+def _parse_date_text(text: str) -> Optional[date]:
+    # Cached without the today bound, so a value rejected as a future date is accepted once it is not.
+    text = text.split("T", 1)[0]
+    for date_format in _BIRTH_DATE_FORMATS:
+        try:
+            parsed = datetime.strptime(text, date_format).date()
+        except ValueError:
+            continue
+        return parsed if parsed.year >= _MIN_BIRTH_YEAR else None
+    return None
+
+
+def parse_birth_date(value: Optional[str]) -> Optional[date]:
+    """Normalize a free-form dob string to a date; None when it is empty or not a plausible birth date."""
+    text = (value or "").strip()
+    if not text:
+        return None
+    parsed = _parse_date_text(text)
+    if parsed is None or parsed > date.today():
+        return None
+    return parsed
+
+
+@lru_cache(maxsize=65536)
+def _age_on(born: date, today: date) -> int:
+    return today.year - born.year - ((today.month, today.day) < (born.month, born.day))
+
+
+def calculate_age(born: Union[date, str, None]) -> Optional[int]:
+    if isinstance(born, str):
+        born = parse_birth_date(born)
+    if born is None:
+        return None
+    return _age_on(born, date.today())
+
+
+def years_before(today: date, years: int) -> date:
+    try:
+        return today.replace(year=today.year - years)
+    except ValueError:  # 29 February in a non-leap target year
+        return today.replace(year=today.year - years, day=28)
+
+
+def birth_date_range_for_ages(
+    age_min: Optional[int],
+    age_max: Optional[int],
+    today: Optional[date] = None,
+) -> tuple[Optional[date], Optional[date]]:
+    """Inclusive (earliest, latest) birth dates for people aged age_min..age_max today."""
+    today = today or date.today()
+    latest = years_before(today, age_min) if age_min is not None else None
+    earliest = None
+    if age_max is not None:
+        earliest = date.fromordinal(years_before(today, age_max + 1).toordinal() + 1)
+    return earliest, latest
@@ -0,0 +1,67 @@
+import threading
+import time
+from typing import Any, Callable, Hashable, Optional
+
+from app.core.config import get_settings
+
+
+class CountCache:
+    """Short-TTL cache of listing totals (or per-value count maps) keyed by the normalized filter set."""
+
+    def __init__(self, ttl_seconds: float = 10.0, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._hits += 1
+                return entry[1]
+            self._misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+                if len(self._entries) >= self.max_entries:
+                    self._entries.clear()
+            self._entries[key] = (now + self.ttl_seconds, value)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+
+_settings = get_settings()
+registration_count_cache = CountCache(ttl_seconds=_settings.listing_count_cache_ttl_seconds)
+feed_facet_cache = CountCache(ttl_seconds=_settings.feed_facet_cache_ttl_seconds)
+
+
+def invalidate_registration_counts() -> None:
+    registration_count_cache.clear()
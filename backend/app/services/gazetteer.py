@@ -0,0 +1,156 @@
+"""Offline city gazetteer and geohash helpers for location filters.
+
+app/data/cities.csv lists Indian and diaspora cities with coordinates and the spellings members type
+("Madras", "Bangalore", "Bay Area"). Free-text locations are resolved against it on write so registrations
+carry (city_id, latitude, longitude, geohash); radius filters are then answered from the geohash index.
+"""
+import csv
+import math
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+GAZETTEER_PATH = Path(__file__).resolve().parent.parent / "data" / "cities.csv"
+# Stored geohash length: about 5m cells, far finer than a city-level location needs, so any cover prefix fits.
+GEOHASH_PRECISION = 9
+KM_PER_DEGREE = 111.195
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_NON_LETTERS = re.compile(r"[^a-z]+")
+_PART_SEPARATORS = re.compile(r"[,/;()|-]+")
+
+
+@dataclass(frozen=True)
+class City:
+    id: str
+    name: str
+    country: str
+    latitude: float
+    longitude: float
+
+    @property
+    def geohash(self) -> str:
+        return encode_geohash(self.latitude, self.longitude)
+
+
+def _normalize(value: str) -> str:
+    return " ".join(_NON_LETTERS.sub(" ", value.lower()).split())
+
+
+@lru_cache(maxsize=1)
+def _gazetteer() -> tuple[dict[str, City], dict[str, City]]:
+    by_id: dict[str, City] = {}
+    by_name: dict[str, City] = {}
+    with GAZETTEER_PATH.open(newline="", encoding="utf-8") as handle:
+        for row in csv.DictReader(handle):
+            city = City(row["id"], row["name"], row["country"], float(row["lat"]), float(row["lon"]))
+            by_id[city.id] = city
+            for alias in [city.name, *(row["aliases"] or "").split("|")]:
+                key = _normalize(alias)
+                if key:
+                    by_name.setdefault(key, city)
+    return by_id, by_name
+
+
+def get_city(city_id: str) -> Optional[City]:
+    return _gazetteer()[0].get(city_id)
+
+
+@lru_cache(maxsize=4096)
+def _resolve_text(text: str) -> Optional[City]:
+    by_id, by_name = _gazetteer()
+    if text in by_id:
+        return by_id[text]
+    # "Chennai, Tamil Nadu" / "Bay Area - CA": try each part, then each part's leading words, longest first.
+    for part in _PART_SEPARATORS.split(text.lower()):
+        words = _normalize(part).split()
+        for length in range(len(words), 0, -1):
+            city = by_name.get(" ".join(words[:length]))
+            if city is not None:
+                return city
+    return None
+
+
+def resolve_location(*texts: Optional[str]) -> Optional[City]:
+    """The gazetteer city for the first of texts that names one (by id, name or alias); None if none do."""
+    for text in texts:
+        if text and text.strip():
+            city = _resolve_text(text.strip()[:200])
+            if city is not None:
+                return city
+    return None
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+    while len(chars) < precision:
+        interval, coordinate = (lon_range, longitude) if even else (lat_range, latitude)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits = 0
+            value = 0
+    return "".join(chars)
+
+
+def _cell_size_degrees(precision: int) -> tuple[float, float]:
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lon_bits)
+
+
+def geohash_cover(latitude: float, longitude: float, radius_km: float) -> Optional[list[str]]:
+    """Geohash prefixes whose cells together contain the circle; None when the circle is too large to bother.
+
+    Uses the finest precision whose cells are at least radius_km on each side, so the centre cell and its
+    eight neighbours always cover the circle.
+    """
+    shrink = max(math.cos(math.radians(latitude)), 0.01)
+    precision = 0
+    for candidate in range(1, GEOHASH_PRECISION + 1):
+        lat_size, lon_size = _cell_size_degrees(candidate)
+        if lat_size * KM_PER_DEGREE < radius_km or lon_size * KM_PER_DEGREE * shrink < radius_km:
+            break
+        precision = candidate
+    if precision == 0:
+        return None
+    lat_size, lon_size = _cell_size_degrees(precision)
+    prefixes = set()
+    for lat_step in (-1, 0, 1):
+        neighbour_lat = latitude + lat_step * lat_size
+        if not -90.0 <= neighbour_lat <= 90.0:
+            continue
+        for lon_step in (-1, 0, 1):
+            neighbour_lon = (longitude + lon_step * lon_size + 180.0) % 360.0 - 180.0
+            prefixes.add(encode_geohash(neighbour_lat, neighbour_lon, precision))
+    return sorted(prefixes)
+
+
+def geohash_prefix_upper_bound(prefix: str) -> Optional[str]:
+    """Smallest geohash greater than every geohash starting with prefix; None when nothing sorts after it.
+
+    Steps within the base32 alphabet (carrying past "z") so the bound is alphanumeric and compares the same
+    under byte and locale collations.
+    """
+    chars = list(prefix)
+    while chars:
+        position = _BASE32.index(chars[-1])
+        if position + 1 < len(_BASE32):
+            chars[-1] = _BASE32[position + 1]
+            return "".join(chars)
+        chars.pop()
+    return None
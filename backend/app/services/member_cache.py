@@ -0,0 +1,92 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from app.core.config import get_settings
+
+
+@dataclass(frozen=True)
+class MemberAuthSnapshot:
+    member_id: str
+    gender: Optional[str]
+    is_active: bool
+    credits: int
+    version: Optional[datetime]
+    session_version: int = 0
+
+
+class MemberSnapshotCache:
+    """Per-process TTL + LRU cache of the slim member fields needed to authorize a request."""
+
+    def __init__(self, ttl_seconds: float = 30.0, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self._entries: OrderedDict[str, tuple[float, MemberAuthSnapshot]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get(self, member_id: str) -> Optional[MemberAuthSnapshot]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(member_id)
+            if entry is None:
+                self._misses += 1
+                return None
+            expires_at, snapshot = entry
+            if expires_at <= now:
+                del self._entries[member_id]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(member_id)
+            self._hits += 1
+            return snapshot
+
+    def put(self, snapshot: MemberAuthSnapshot) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[snapshot.member_id] = (time.monotonic() + self.ttl_seconds, snapshot)
+            self._entries.move_to_end(snapshot.member_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, member_id: str) -> None:
+        with self._lock:
+            self._entries.pop(member_id, None)
+            self._invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+            }
+
+
+_settings = get_settings()
+member_snapshot_cache = MemberSnapshotCache(
+    ttl_seconds=_settings.member_auth_cache_ttl_seconds,
+    max_entries=_settings.member_auth_cache_max_entries,
+)
+
+
+def invalidate_member_snapshot(member_id: str) -> None:
+    member_snapshot_cache.invalidate(member_id)
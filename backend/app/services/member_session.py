@@ -2,29 +2,189 @@ import base64
 import hashlib
 import hmac
 import json
-from typing import Optional
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from collections.abc import Callable
+from typing import Iterable, Optional
 
+from app.core.config import get_settings
 
-def create_member_token(member_id: str, secret: str) -> str:
-    payload = {"member_id": member_id}
+TOKEN_VERSION = 2
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class MemberTokenClaims:
+    member_id: str
+    gender: Optional[str] = None
+    session_version: int = 0
+    expires_at: Optional[int] = None
+    legacy: bool = False
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        if self.expires_at is None:
+            return False
+        return self.expires_at <= (now if now is not None else time.time())
+
+
+class VerifiedTokenCache:
+    """LRU of tokens whose signature and payload were already checked, so repeats skip HMAC and JSON parsing."""
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max(0, max_entries)
+        self._entries: OrderedDict[str, MemberTokenClaims] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, token: str) -> Optional[MemberTokenClaims]:
+        with self._lock:
+            claims = self._entries.get(token)
+            if claims is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self._hits += 1
+            return claims
+
+    def put(self, token: str, claims: MemberTokenClaims) -> None:
+        if self.max_entries == 0:
+            return
+        with self._lock:
+            self._entries[token] = claims
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+
+class SessionVersionRegistry:
+    """In-memory map of members whose sessions were revoked, keyed to the minimum valid session version.
+
+    Revocations made by this process are recorded immediately. Other workers' revocations are picked up by
+    a background reload every reload_interval seconds, which bounds how long a disabled or password-reset
+    member's token stays usable on routes that authorize from claims alone.
+    """
+
+    def __init__(self, reload_interval: float = 30.0) -> None:
+        self.reload_interval = max(1.0, reload_interval)
+        self._versions: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._loader: Optional[Callable[[], Iterable[tuple[str, int]]]] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._reloads = 0
+        self._failures = 0
+
+    def load(self, versions: Iterable[tuple[str, int]]) -> None:
+        # Session versions only grow, so keeping the higher of the two never resurrects a revoked token even
+        # when a reload read the table just before this process recorded a newer revocation.
+        loaded = {member_id: version for member_id, version in versions if version}
+        with self._lock:
+            for member_id, version in self._versions.items():
+                if version > loaded.get(member_id, 0):
+                    loaded[member_id] = version
+            self._versions = loaded
+
+    def record(self, member_id: str, session_version: int) -> None:
+        with self._lock:
+            if session_version:
+                self._versions[member_id] = session_version
+            else:
+                self._versions.pop(member_id, None)
+
+    def is_current(self, claims: MemberTokenClaims) -> bool:
+        return claims.session_version >= self._versions.get(claims.member_id, 0)
+
+    def reload(self) -> None:
+        if self._loader is None:
+            return
+        try:
+            self.load(self._loader())
+        except Exception:
+            logger.exception("Could not reload member session versions; keeping the previous set")
+            with self._lock:
+                self._failures += 1
+            return
+        with self._lock:
+            self._reloads += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.reload_interval):
+            self.reload()
+
+    def start(self, loader: Callable[[], Iterable[tuple[str, int]]]) -> None:
+        """Load now, then keep reloading in the background."""
+        self._loader = loader
+        self.reload()
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="member-session-reload", daemon=True)
+            self._thread.start()
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "revoked_members": len(self._versions),
+                "reload_interval_seconds": self.reload_interval,
+                "reloads": self._reloads,
+                "failures": self._failures,
+            }
+
+
+_settings = get_settings()
+verified_token_cache = VerifiedTokenCache(max_entries=_settings.member_session_token_cache_size)
+session_registry = SessionVersionRegistry(reload_interval=_settings.member_session_reload_seconds)
+
+
+def _sign(payload_b64: str, secret: str) -> str:
+    return hmac.new(secret.encode("utf-8"), payload_b64.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+def create_member_token(
+    member_id: str,
+    secret: str,
+    gender: Optional[str] = None,
+    session_version: int = 0,
+    ttl_seconds: int = 43200,
+) -> str:
+    payload = {
+        "v": TOKEN_VERSION,
+        "member_id": member_id,
+        "gender": gender,
+        "sv": session_version,
+        "exp": int(time.time()) + ttl_seconds,
+    }
     payload_json = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode("utf-8")
     payload_b64 = base64.urlsafe_b64encode(payload_json).decode("utf-8").rstrip("=")
-    signature = hmac.new(secret.encode("utf-8"), payload_b64.encode("utf-8"), hashlib.sha256).hexdigest()
-    return f"{payload_b64}.{signature}"
+    return f"{payload_b64}.{_sign(payload_b64, secret)}"
 
 
-def extract_member_id_from_token(token: str, secret: str) -> Optional[str]:
+def _decode_claims(token: str, secret: str) -> Optional[MemberTokenClaims]:
     try:
         payload_b64, signature = token.split(".", 1)
     except ValueError:
         return None
 
-    expected_signature = hmac.new(
-        secret.encode("utf-8"),
-        payload_b64.encode("utf-8"),
-        hashlib.sha256,
-    ).hexdigest()
-    if not hmac.compare_digest(signature, expected_signature):
+    if not hmac.compare_digest(signature, _sign(payload_b64, secret)):
         return None
 
     padded = payload_b64 + "=" * (-len(payload_b64) % 4)
@@ -33,8 +193,34 @@ def extract_member_id_from_token(token: str, secret: str) -> Optional[str]:
         payload = json.loads(payload_bytes.decode("utf-8"))
     except Exception:
         return None
+    if not isinstance(payload, dict):
+        return None
 
     member_id = payload.get("member_id")
     if not isinstance(member_id, str) or not member_id:
         return None
-    return member_id
+
+    if payload.get("v") != TOKEN_VERSION:
+        return MemberTokenClaims(member_id=member_id, legacy=True)
+
+    session_version = payload.get("sv")
+    expires_at = payload.get("exp")
+    gender = payload.get("gender")
+    if not isinstance(session_version, int) or not isinstance(expires_at, int):
+        return None
+    return MemberTokenClaims(
+        member_id=member_id,
+        gender=gender if isinstance(gender, str) else None,
+        session_version=session_version,
+        expires_at=expires_at,
+    )
+
+
+def decode_member_token(token: str, secret: str) -> Optional[MemberTokenClaims]:
+    claims = verified_token_cache.get(token)
+    if claims is None:
+        claims = _decode_claims(token, secret)
+        if claims is None:
+            return None
+        verified_token_cache.put(token, claims)
+    return claims
@@ -0,0 +1,92 @@
+import re
+from typing import Optional
+
+# Spelling variants that sound alike in romanized Tamil/Sanskrit names, folded before vowels are dropped.
+# Order matters: longer clusters first, and "zh" (Tamil retroflex, Tamizh/Tamil) before "sh".
+_FOLDS = (
+    ("ksh", "ks"),
+    ("x", "ks"),
+    ("zh", "l"),
+    ("sh", "s"),
+    ("ch", "c"),
+    ("th", "t"),
+    ("dh", "d"),
+    ("bh", "b"),
+    ("gh", "g"),
+    ("kh", "k"),
+    ("jh", "j"),
+    ("ph", "f"),
+    ("ck", "k"),
+    ("q", "k"),
+    ("w", "v"),
+    ("z", "j"),
+)
+_VOWELS = frozenset("aeiou")
+_NON_LETTERS = re.compile(r"[^a-z ]+")
+# Keys are stored in a VARCHAR(120) column; a few consonants per word is plenty to tell names apart.
+_MAX_WORD_KEY = 8
+_MAX_KEY = 120
+
+
+def _name_words(name: Optional[str]) -> list[str]:
+    # Single letters are initials ("R. Sriram") and carry no sound worth matching on.
+    return [word for word in _NON_LETTERS.sub(" ", (name or "").lower()).split() if len(word) > 1]
+
+
+def _word_key(word: str) -> str:
+    for spelling, folded in _FOLDS:
+        word = word.replace(spelling, folded)
+    # A leading vowel cluster collapses to one marker so Aishwarya/Ishwarya and Eshwar/Ishwar agree.
+    rest = word.lstrip("aeiou")
+    key = "a" if len(rest) < len(word) else ""
+    # Any h left after folding is aspiration; only a word-initial h is kept so Hari and Ari stay apart.
+    if not key and rest.startswith("h"):
+        key, rest = "h", rest[1:]
+    for letter in rest:
+        if letter in _VOWELS or letter == "h":
+            continue
+        # Doubled consonants (Rammesh, Sriraam) count once.
+        if not key.endswith(letter):
+            key += letter
+    return key[:_MAX_WORD_KEY].upper()
+
+
+def phonetic_key(name: Optional[str]) -> Optional[str]:
+    """Metaphone-style sound key for a romanized Indian name, one code per word separated by spaces.
+
+    Sriram and Shreeram both encode to SRM, Aishwarya and Ishwarya to ASVRY, Lakshmi and Laxmi to LKSM.
+    Returns None when the name has no usable words.
+    """
+    words = _name_words(name)
+    if not words:
+        return None
+    return " ".join(_word_key(word) for word in words)[:_MAX_KEY]
+
+
+def name_distance(query: str, name: Optional[str]) -> int:
+    """Levenshtein distance between query and the same number of leading words of name, ignoring case and initials."""
+    query_words = _name_words(query)
+    target = " ".join(_name_words(name)[: max(len(query_words), 1)])
+    source = " ".join(query_words)
+    previous = list(range(len(target) + 1))
+    for i, source_char in enumerate(source, start=1):
+        current = [i]
+        for j, target_char in enumerate(target, start=1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (source_char != target_char),
+                )
+            )
+        previous = current
+    return previous[-1]
+
+
+def phonetic_key_range(key: str) -> tuple[str, str]:
+    """Half-open [low, high) bounds covering every stored key that starts with key.
+
+    Bumping the last letter rather than appending a sentinel keeps the range correct under locale
+    collations that ignore spaces and punctuation, so a plain B-tree index on the column serves it.
+    """
+    return key, key[:-1] + chr(ord(key[-1]) + 1)
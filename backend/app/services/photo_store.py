@@ -0,0 +1,189 @@
+import base64
+import binascii
+import hashlib
+import os
+import re
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from app.core.config import get_settings
+
+PHOTO_CONTENT_TYPES = {
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/webp": "webp",
+    "image/gif": "gif",
+}
+PHOTO_HASH_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+class PhotoTooLargeError(ValueError):
+    pass
+
+
+class UnsupportedPhotoTypeError(ValueError):
+    pass
+
+
+def sniff_photo_content_type(head: bytes) -> Optional[str]:
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "image/gif"
+    return None
+
+
+@dataclass(frozen=True)
+class StoredPhoto:
+    hash: str
+    content_type: str
+    size: int
+
+    @property
+    def extension(self) -> str:
+        return PHOTO_CONTENT_TYPES[self.content_type]
+
+
+class PhotoWriter:
+    """Incrementally hashes and spools one upload, enforcing the size cap as bytes arrive."""
+
+    def __init__(self, store: "PhotoStore"):
+        self._store = store
+        self._digest = hashlib.sha256()
+        self._head = b""
+        self.size = 0
+        fd, temp_path = tempfile.mkstemp(dir=store.temp_dir, prefix="upload-")
+        self._file = os.fdopen(fd, "wb")
+        self._temp_path = Path(temp_path)
+
+    def write(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        if self.size > self._store.max_bytes:
+            raise PhotoTooLargeError(f"Photo must be {self._store.max_bytes // (1024 * 1024)}MB or smaller")
+        if len(self._head) < 16:
+            self._head += chunk[: 16 - len(self._head)]
+        self._digest.update(chunk)
+        self._file.write(chunk)
+
+    def commit(self) -> StoredPhoto:
+        self._file.close()
+        content_type = sniff_photo_content_type(self._head)
+        if content_type is None:
+            self.abort()
+            raise UnsupportedPhotoTypeError("Photo must be a JPEG, PNG, WebP or GIF image")
+
+        stored = StoredPhoto(hash=self._digest.hexdigest(), content_type=content_type, size=self.size)
+        final_path = self._store.blob_path(stored.hash, stored.extension)
+        if final_path.exists():
+            self._temp_path.unlink(missing_ok=True)
+        else:
+            final_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(self._temp_path, final_path)
+        return stored
+
+    def abort(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+        self._temp_path.unlink(missing_ok=True)
+
+
+class PhotoStore:
+    """Content-addressed blob store on local disk: <root>/<hash[:2]>/<sha256>.<ext>."""
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+
+    @property
+    def temp_dir(self) -> Path:
+        path = self.root / "tmp"
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def blob_path(self, photo_hash: str, extension: str) -> Path:
+        return self.root / photo_hash[:2] / f"{photo_hash}.{extension}"
+
+    def open_writer(self) -> PhotoWriter:
+        return PhotoWriter(self)
+
+    def save_bytes(self, data: bytes) -> StoredPhoto:
+        writer = self.open_writer()
+        try:
+            writer.write(data)
+        except Exception:
+            writer.abort()
+            raise
+        return writer.commit()
+
+    def find(self, photo_hash: str) -> Optional[tuple[Path, str]]:
+        if not PHOTO_HASH_PATTERN.match(photo_hash):
+            return None
+        for content_type, extension in PHOTO_CONTENT_TYPES.items():
+            path = self.blob_path(photo_hash, extension)
+            if path.is_file():
+                return path, content_type
+        return None
+
+
+_settings = get_settings()
+photo_store = PhotoStore(root=_settings.photo_storage_dir, max_bytes=_settings.photo_max_bytes)
+
+
+def photo_url(photo_hash: str) -> str:
+    prefix = _settings.photo_public_url_prefix or _settings.api_prefix
+    return f"{prefix.rstrip('/')}/photos/{photo_hash}"
+
+
+def photo_reference(stored: StoredPhoto, name: Optional[str] = None) -> dict[str, Any]:
+    reference = {
+        "hash": stored.hash,
+        "url": photo_url(stored.hash),
+        "contentType": stored.content_type,
+        "size": stored.size,
+    }
+    if name:
+        reference["name"] = name
+    return reference
+
+
+def decode_data_url(value: str) -> Optional[bytes]:
+    header, separator, data = value.strip().partition(",")
+    if not separator or not header.startswith("data:") or ";base64" not in header:
+        return None
+    try:
+        return base64.b64decode(data, validate=False)
+    except (binascii.Error, ValueError):
+        return None
+
+
+def _find_data_url(value: Any) -> Optional[str]:
+    if isinstance(value, str) and value.startswith("data:"):
+        return value
+    if isinstance(value, dict):
+        for key in ("dataUrl", "preview", "url"):
+            candidate = value.get(key)
+            if isinstance(candidate, str) and candidate.startswith("data:"):
+                return candidate
+    return None
+
+
+def externalize_photo_value(value: Any, store: Optional[PhotoStore] = None) -> Any:
+    """Move an inline data-URL photo into the blob store and return the small reference that replaces it.
+
+    Values without a data URL (already-stored references, external URLs, file names) are returned unchanged.
+    """
+    data_url = _find_data_url(value)
+    if data_url is None:
+        return value
+    payload = decode_data_url(data_url)
+    if payload is None:
+        raise UnsupportedPhotoTypeError("Photo data URL could not be decoded")
+    stored = (store or photo_store).save_bytes(payload)
+    name = value.get("name") if isinstance(value, dict) else None
+    return photo_reference(stored, name=name if isinstance(name, str) else None)
@@ -0,0 +1,171 @@
+import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Optional
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from app.core.config import get_settings
+from app.services.photo_store import PHOTO_HASH_PATTERN, PhotoStore, photo_store, photo_url
+
+PHOTO_VARIANT_WIDTHS = (160, 480)
+PHOTO_VARIANT_FORMATS = {
+    "webp": ("WEBP", "image/webp"),
+    "jpg": ("JPEG", "image/jpeg"),
+}
+THUMBNAIL_WIDTH = 160
+CARD_WIDTH = 480
+DEFAULT_VARIANT_FORMAT = "webp"
+
+logger = logging.getLogger(__name__)
+
+
+class PhotoVariantGenerator:
+    """Resizes stored photos into fixed-width variants, cached on disk next to the originals.
+
+    Variants are produced on a small worker pool. Concurrent requests for the same variant share one
+    in-flight job, and background warm-ups beyond max_pending are dropped because the first request for
+    a missing variant generates it anyway.
+    """
+
+    def __init__(self, store: PhotoStore, workers: int = 2, max_pending: int = 64, quality: int = 82):
+        self.store = store
+        self.workers = max(1, workers)
+        self.max_pending = max(0, max_pending)
+        self.quality = quality
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight: dict[tuple[str, int, str], Future] = {}
+        self._lock = threading.Lock()
+        self._generated = 0
+        self._failed = 0
+        self._dropped = 0
+
+    def variant_path(self, photo_hash: str, width: int, extension: str) -> Path:
+        return self.store.root / "variants" / photo_hash[:2] / f"{photo_hash}-w{width}.{extension}"
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="photo-variant")
+        return self._executor
+
+    def submit(self, photo_hash: str, width: int, extension: str) -> Future:
+        """Future resolving to the variant path, or None when the original is missing or unreadable."""
+        path = self.variant_path(photo_hash, width, extension)
+        if path.is_file():
+            done: Future = Future()
+            done.set_result(path)
+            return done
+
+        key = (photo_hash, width, extension)
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                return future
+            future = self._get_executor().submit(self._generate, photo_hash, width, extension)
+            self._in_flight[key] = future
+        # Registered outside the lock: the callback runs inline if the job has already finished.
+        future.add_done_callback(lambda _: self._forget(key))
+        return future
+
+    def schedule(self, photo_hash: str) -> None:
+        """Warm every variant of a newly set photo in the background."""
+        for width in PHOTO_VARIANT_WIDTHS:
+            for extension in PHOTO_VARIANT_FORMATS:
+                with self._lock:
+                    if len(self._in_flight) >= self.max_pending:
+                        self._dropped += 1
+                        continue
+                self.submit(photo_hash, width, extension)
+
+    def _forget(self, key: tuple[str, int, str]) -> None:
+        with self._lock:
+            self._in_flight.pop(key, None)
+
+    def _generate(self, photo_hash: str, width: int, extension: str) -> Optional[Path]:
+        found = self.store.find(photo_hash)
+        if found is None:
+            return None
+        source_path, _ = found
+        target = self.variant_path(photo_hash, width, extension)
+        image_format, _ = PHOTO_VARIANT_FORMATS[extension]
+        try:
+            with Image.open(source_path) as source:
+                image = ImageOps.exif_transpose(source)
+                if image.width > width:
+                    image = image.resize((width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+                if image_format == "JPEG" and image.mode != "RGB":
+                    image = image.convert("RGB")
+                elif image.mode not in ("RGB", "RGBA"):
+                    image = image.convert("RGBA")
+                target.parent.mkdir(parents=True, exist_ok=True)
+                fd, temp_path = tempfile.mkstemp(dir=self.store.temp_dir, prefix="variant-")
+                replaced = False
+                try:
+                    with os.fdopen(fd, "wb") as handle:
+                        image.save(handle, format=image_format, quality=self.quality)
+                    os.replace(temp_path, target)
+                    replaced = True
+                finally:
+                    if not replaced:
+                        Path(temp_path).unlink(missing_ok=True)
+        except (OSError, UnidentifiedImageError, Image.DecompressionBombError) as exc:
+            # Unreadable or oversized uploads are expected input, not a fault worth a traceback.
+            logger.warning("Could not generate %s w%d variant of photo %s: %s", extension, width, photo_hash, exc)
+            with self._lock:
+                self._failed += 1
+            return None
+        except Exception:
+            # Pillow raises well beyond OSError for bad input (ValueError, SyntaxError, ...); any of them is a
+            # failed variant, never a 500 for the request waiting on it.
+            logger.exception("Could not generate %s w%d variant of photo %s", extension, width, photo_hash)
+            with self._lock:
+                self._failed += 1
+            return None
+        with self._lock:
+            self._generated += 1
+        return target
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "in_flight": len(self._in_flight),
+                "generated": self._generated,
+                "failed": self._failed,
+                "dropped": self._dropped,
+            }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_settings = get_settings()
+photo_variants = PhotoVariantGenerator(
+    photo_store,
+    workers=_settings.photo_variant_workers,
+    max_pending=_settings.photo_variant_max_pending,
+)
+
+
+def photo_variant_url(photo_hash: str, width: int, extension: str = DEFAULT_VARIANT_FORMAT) -> str:
+    return f"{photo_url(photo_hash)}/w{width}.{extension}"
+
+
+def profile_photo_hash(extra_data: Any) -> Optional[str]:
+    photo = extra_data.get("profilePhoto") if isinstance(extra_data, dict) else None
+    photo_hash = photo.get("hash") if isinstance(photo, dict) else None
+    if isinstance(photo_hash, str) and PHOTO_HASH_PATTERN.match(photo_hash):
+        return photo_hash
+    return None
+
+
+def profile_photo_variant_url(extra_data: Any, width: int) -> Optional[str]:
+    """Variant URL for a stored profile photo; None when the photo is not in the photo store."""
+    photo_hash = profile_photo_hash(extra_data)
+    return photo_variant_url(photo_hash, width) if photo_hash else None
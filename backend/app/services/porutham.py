@@ -0,0 +1,201 @@
+"""Porutham (horoscope compatibility) tables.
+
+Every nakshatra- and rasi-based porutham depends only on the bride's and groom's stars and signs, so the
+whole 27x27 nakshatra table and 12x12 rasi table are computed once at import. Scoring a batch of candidates
+is then a pair of NumPy fancy-index lookups. Tables are indexed [bride, groom]; the last row and column of
+each stand for an unknown or unrecognized value and score neutral.
+"""
+import re
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+# Canonical order (index 0 = Ashwini); each entry lists the spellings accepted for that star, Tamil first
+# as submitted by the registration form.
+NAKSHATRAS = (
+    ("Ashwini", "aswini", "asvini", "ashvini", "aswathi"),
+    ("Bharani",),
+    ("Karthigai", "karthikai", "karthika", "krittika", "kritika", "kruthika", "krithika"),
+    ("Rohini",),
+    ("Mrigashirsha", "mrigashira", "mrigasira", "mrigasheersham", "mirugaseeridam", "mrigasirisham", "makayiram"),
+    ("Thiruvathirai", "thiruvadhirai", "ardra", "arudra", "aardra", "thiruvathira"),
+    ("Punarpoosam", "punarpusam", "punarvasu", "punartham"),
+    ("Poosam", "pusam", "pushya", "pushyami", "pooyam"),
+    ("Ayilyam", "ashlesha", "aslesha", "ayilya"),
+    ("Magam", "makam", "magha", "makha"),
+    ("Pooram", "puram", "purvaphalguni", "poorvaphalguni", "pubba"),
+    ("Uthiram", "uttiram", "uttaraphalguni", "uthraphalguni"),
+    ("Hastham", "hastha", "hasta", "astham", "atham"),
+    ("Chithirai", "chitirai", "chitra", "chithra", "chithira"),
+    ("Swathi", "swati", "svati", "chothi"),
+    ("Visakam", "vishakam", "vishakha", "visakha", "vishaka"),
+    ("Anusham", "anizham", "anuradha"),
+    ("Kettai", "ketta", "jyeshtha", "jyeshta", "jyestha", "triketta"),
+    ("Moolam", "mulam", "mula", "moola"),
+    ("Pooradam", "puradam", "purvashadha", "purvashada", "poorvashada"),
+    ("Uthiradam", "uthradam", "uttarashadha", "uttarashada"),
+    ("Thiruvonam", "thiruonam", "shravana", "sravana", "sravanam"),
+    ("Avittam", "dhanishta", "dhanishtha", "dhanista"),
+    ("Sathayam", "chathayam", "shatabhisha", "satabhisha", "shatabhishak", "sadhayam"),
+    ("Poorattadhi", "purattathi", "pooratathi", "purvabhadrapada", "purvabhadra", "poororuttathi"),
+    ("Uthirattadhi", "uthrattathi", "uthirattathi", "uttarabhadrapada", "uttarabhadra"),
+    ("Revathi", "revati"),
+)
+RASIS = (
+    ("Mesham", "mesha", "aries"),
+    ("Rishabam", "rishabham", "rishabha", "vrishabha", "vrushabam", "edavam", "taurus"),
+    ("Mithunam", "mithuna", "gemini"),
+    ("Kadagam", "katakam", "kataka", "karka", "karkataka", "karkidakam", "cancer"),
+    ("Simmam", "simham", "simha", "chingam", "leo"),
+    ("Kanni", "kanya", "virgo"),
+    ("Thulam", "tulam", "thula", "tula", "libra"),
+    ("Viruchigam", "vrichigam", "vrischika", "vrishchika", "vrischikam", "scorpio"),
+    ("Dhanusu", "dhanus", "dhanu", "dhanush", "sagittarius"),
+    ("Magaram", "makaram", "makara", "capricorn"),
+    ("Kumbam", "kumbham", "kumbha", "aquarius"),
+    ("Meenam", "meena", "pisces"),
+)
+UNKNOWN_NAKSHATRA = len(NAKSHATRAS)
+UNKNOWN_RASI = len(RASIS)
+
+_NON_LETTERS = re.compile(r"[^a-z]+")
+
+
+def _alias_index(table) -> dict[str, int]:
+    return {_NON_LETTERS.sub("", alias.lower()): index for index, aliases in enumerate(table) for alias in aliases}
+
+
+_NAKSHATRA_ALIASES = _alias_index(NAKSHATRAS)
+_RASI_ALIASES = _alias_index(RASIS)
+
+
+@lru_cache(maxsize=1024)
+def nakshatra_index(value: Optional[str]) -> int:
+    return _NAKSHATRA_ALIASES.get(_NON_LETTERS.sub("", (value or "").lower()), UNKNOWN_NAKSHATRA)
+
+
+@lru_cache(maxsize=1024)
+def rasi_index(value: Optional[str]) -> int:
+    return _RASI_ALIASES.get(_NON_LETTERS.sub("", (value or "").lower()), UNKNOWN_RASI)
+
+
+# Per-star attributes, in NAKSHATRAS order.
+_GANA = "DMRMDMDDRRMMDRDRDRRMMDRRMMD"  # Deva / Manushya / Rakshasa
+_YONI = (
+    "horse", "elephant", "sheep", "serpent", "serpent", "dog", "cat", "sheep", "cat", "rat", "rat", "cow",
+    "buffalo", "tiger", "buffalo", "tiger", "deer", "deer", "dog", "monkey", "mongoose", "monkey", "lion",
+    "horse", "lion", "cow", "elephant",
+)
+_YONI_ENEMIES = {
+    frozenset(pair)
+    for pair in (
+        ("horse", "buffalo"), ("elephant", "lion"), ("sheep", "monkey"), ("serpent", "mongoose"),
+        ("dog", "deer"), ("cat", "rat"), ("cow", "tiger"),
+    )
+}
+# Rajju runs feet, hip, navel, neck, head and back down in groups of nine stars.
+_RAJJU = tuple((0, 1, 2, 3, 4, 3, 2, 1, 0)[index % 9] for index in range(27))
+_VEDHA = {
+    frozenset(pair)
+    for pair in (
+        (0, 17), (1, 16), (2, 15), (3, 14), (5, 21), (6, 20), (7, 19), (8, 18),
+        (9, 26), (10, 25), (11, 24), (12, 23), (4, 22), (4, 13), (13, 22),
+    )
+}
+_MAHENDRA_COUNTS = {4, 7, 10, 13, 16, 19, 22, 25}
+
+# Per-sign attributes, in RASIS order.
+_RASI_LORD = (
+    "mars", "venus", "mercury", "moon", "sun", "mercury", "venus", "mars", "jupiter", "saturn", "saturn", "jupiter",
+)
+_LORD_ENEMIES = {
+    frozenset(pair)
+    for pair in (
+        ("sun", "venus"), ("sun", "saturn"), ("moon", "mercury"), ("moon", "venus"), ("moon", "saturn"),
+        ("mars", "mercury"), ("mars", "saturn"), ("mercury", "jupiter"), ("jupiter", "venus"),
+    )
+}
+_VASYA = ({4, 7}, {3, 6}, {5}, {7, 8}, {6}, {2, 11}, {5, 9}, {3}, {11}, {0, 10}, {0}, {9})
+
+# Points per porutham; Rajju carries the most weight as the porutham most families will not waive.
+NAKSHATRA_WEIGHTS = {"dina": 1, "gana": 1, "mahendra": 1, "stree_deergha": 1, "yoni": 1, "rajju": 2, "vedha": 1}
+RASI_WEIGHTS = {"rasi": 1, "rasi_adhipati": 1, "vasya": 1}
+MAX_POINTS = sum(NAKSHATRA_WEIGHTS.values()) + sum(RASI_WEIGHTS.values())
+
+
+def _nakshatra_poruthams(bride: int, groom: int) -> dict[str, bool]:
+    count = (groom - bride) % 27 + 1  # counted from the bride's star to the groom's
+    ganas = {_GANA[bride], _GANA[groom]}
+    return {
+        "dina": count % 9 in {0, 2, 4, 6, 8},
+        "gana": len(ganas) == 1 or ganas == {"D", "M"},
+        "mahendra": count in _MAHENDRA_COUNTS,
+        "stree_deergha": count >= 13,
+        "yoni": frozenset((_YONI[bride], _YONI[groom])) not in _YONI_ENEMIES,
+        "rajju": _RAJJU[bride] != _RAJJU[groom],
+        "vedha": frozenset((bride, groom)) not in _VEDHA,
+    }
+
+
+def _rasi_poruthams(bride: int, groom: int) -> dict[str, bool]:
+    count = (groom - bride) % 12 + 1
+    return {
+        "rasi": count not in {2, 6, 8, 12},
+        "rasi_adhipati": frozenset((_RASI_LORD[bride], _RASI_LORD[groom])) not in _LORD_ENEMIES,
+        "vasya": groom in _VASYA[bride] or bride in _VASYA[groom],
+    }
+
+
+def _build_tables() -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    stars = len(NAKSHATRAS)
+    nakshatra_points = np.full((stars + 1, stars + 1), sum(NAKSHATRA_WEIGHTS.values()) / 2, dtype=np.float32)
+    # Rajju and Vedha doshams: pairs that members requiring horoscope matching will not consider.
+    dosham = np.zeros((stars + 1, stars + 1), dtype=bool)
+    for bride in range(stars):
+        for groom in range(stars):
+            matches = _nakshatra_poruthams(bride, groom)
+            nakshatra_points[bride, groom] = sum(NAKSHATRA_WEIGHTS[name] for name, ok in matches.items() if ok)
+            dosham[bride, groom] = not (matches["rajju"] and matches["vedha"])
+
+    signs = len(RASIS)
+    rasi_points = np.full((signs + 1, signs + 1), sum(RASI_WEIGHTS.values()) / 2, dtype=np.float32)
+    for bride in range(signs):
+        for groom in range(signs):
+            matches = _rasi_poruthams(bride, groom)
+            rasi_points[bride, groom] = sum(RASI_WEIGHTS[name] for name, ok in matches.items() if ok)
+
+    scale = np.float32(100 / MAX_POINTS)
+    return nakshatra_points * scale, rasi_points * scale, dosham
+
+
+NAKSHATRA_SCORES, RASI_SCORES, NAKSHATRA_DOSHAM = _build_tables()
+# When it is not known who is the bride, either reading of the pair is equally likely.
+_SYMMETRIC_NAKSHATRA_SCORES = (NAKSHATRA_SCORES + NAKSHATRA_SCORES.T) / 2
+_SYMMETRIC_RASI_SCORES = (RASI_SCORES + RASI_SCORES.T) / 2
+for _table in (NAKSHATRA_SCORES, RASI_SCORES, NAKSHATRA_DOSHAM, _SYMMETRIC_NAKSHATRA_SCORES, _SYMMETRIC_RASI_SCORES):
+    _table.setflags(write=False)
+
+
+def compatibility_scores(
+    nakshatra: int,
+    rasi: int,
+    role: Optional[str],
+    candidate_nakshatras: np.ndarray,
+    candidate_rasis: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Scores (0-100, int64) and dosham flags of every candidate against one member.
+
+    role is the member's side of the match ("bride" or "groom"); None scores each pair both ways.
+    Candidate arrays hold indexes from nakshatra_index / rasi_index.
+    """
+    if role == "bride":
+        points = NAKSHATRA_SCORES[nakshatra, candidate_nakshatras] + RASI_SCORES[rasi, candidate_rasis]
+        dosham = NAKSHATRA_DOSHAM[nakshatra, candidate_nakshatras]
+    elif role == "groom":
+        points = NAKSHATRA_SCORES[candidate_nakshatras, nakshatra] + RASI_SCORES[candidate_rasis, rasi]
+        dosham = NAKSHATRA_DOSHAM[candidate_nakshatras, nakshatra]
+    else:
+        points = _SYMMETRIC_NAKSHATRA_SCORES[nakshatra, candidate_nakshatras] + _SYMMETRIC_RASI_SCORES[rasi, candidate_rasis]
+        dosham = NAKSHATRA_DOSHAM[nakshatra, candidate_nakshatras]
+    return np.rint(points).astype(np.int64), dosham
@@ -0,0 +1,78 @@
+from typing import Any, Optional
+
+from app.db.json_columns import json_truthy
+from app.services.birth_date import parse_birth_date
+from app.services.gazetteer import resolve_location
+from app.services.name_phonetics import phonetic_key
+from app.services.photo_variants import profile_photo_hash
+
+# Bump when the extraction below changes so the startup backfill recomputes existing rows.
+PROFILE_CARD_VERSION = 5
+
+# Card column -> (extra_data key, column length).
+_TEXT_FIELDS = {
+    "height": ("height", 32),
+    "nakshatra": ("nakshatra", 64),
+    "padham": ("padham", 16),
+    "rasi": ("rasi", 64),
+    "sect": ("sect", 120),
+    "subsect": ("subsect", 120),
+    "horoscope_matching_required": ("horoscopeMatchingRequired", 32),
+    "current_location": ("currentLocation", 120),
+}
+IMAGE_URL_MAX_LENGTH = 1000
+
+
+def _clean_text(value: Any, max_length: int) -> Optional[str]:
+    if value is None or isinstance(value, (dict, list)):
+        return None
+    text = str(value).strip()
+    return text[:max_length] or None
+
+
+def _clean_url(value: Any, max_length: int) -> Optional[str]:
+    # A cut URL is a broken image: leave over-length ones (signed CDN links, data URIs) to extra_data.
+    if not isinstance(value, str):
+        return None
+    url = value.strip()
+    return url if url and len(url) <= max_length else None
+
+
+def profile_card_values(
+    extra_data: Any,
+    dob: Optional[str] = None,
+    name: Optional[str] = None,
+    city: Optional[str] = None,
+) -> dict[str, Any]:
+    """Typed profile-card column values derived from a registration's extra_data, dob string, name and city."""
+    data = extra_data if isinstance(extra_data, dict) else {}
+    values: dict[str, Any] = {
+        column: _clean_text(data.get(key), max_length) for column, (key, max_length) in _TEXT_FIELDS.items()
+    }
+
+    values["image_url"] = _clean_url(data.get("imageUrl"), IMAGE_URL_MAX_LENGTH)
+
+    star_padham = _clean_text(data.get("starPadham"), 100)
+    if not star_padham and values["nakshatra"]:
+        star_padham = values["nakshatra"]
+        if values["padham"]:
+            star_padham = f"{star_padham} - {values['padham']}"[:100]
+    values["star_padham"] = star_padham
+    values["birth_date"] = parse_birth_date(dob)
+    values["name_phonetic"] = phonetic_key(name)
+    location = resolve_location(city, values["current_location"])
+    values["city_id"] = location.id if location else None
+    values["latitude"] = location.latitude if location else None
+    values["longitude"] = location.longitude if location else None
+    values["geohash"] = location.geohash if location else None
+    values["photo_hash"] = profile_photo_hash(data)
+    values["has_photo"] = json_truthy(data.get("hasPhoto", False)) or bool(data.get("profilePhoto"))
+    values["card_version"] = PROFILE_CARD_VERSION
+    return values
+
+
+def apply_profile_card_columns(registration) -> None:
+    """Refresh the materialized card columns after registration.extra_data, dob, name or city changes."""
+    values = profile_card_values(registration.extra_data, registration.dob, registration.name, registration.city)
+    for column, value in values.items():
+        setattr(registration, column, value)
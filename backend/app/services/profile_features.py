@@ -0,0 +1,360 @@
+"""In-memory feature matrix for "similar profiles".
+
+Each active registration becomes one row of numeric features (age, education level, income) and
+categorical codes (occupation bucket, city, sect), stored per gender bucket in growable NumPy arrays.
+Nearest neighbours are found by a vectorized weighted L1 distance over the numeric columns plus a fixed
+penalty per mismatched category (a Gower-style distance, so one-hot city columns are never materialized).
+
+Writes mark registrations stale; the next query reloads only those rows and patches them in place. A full
+rebuild runs on first use and then every similar_profiles_rebuild_seconds, which also compacts removed slots
+and picks up writes made by other processes.
+"""
+import math
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from typing import Callable, Iterable, Optional, Sequence
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.services.birth_date import calculate_age
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+# Ordered from highest; the first keyword found in the free-text qualification decides the level.
+_EDUCATION_LEVELS = (
+    (5, ("phd", "doctorate", "dphil")),
+    (4, ("master", "mba", "mtech", "me", "ms", "msc", "mcom", "ma", "mca", "md", "mds", "llm", "pgdm", "mphil")),
+    (3, ("bachelor", "be", "btech", "bsc", "bcom", "ba", "bca", "bba", "mbbs", "bds", "llb", "barch", "ca", "cs", "icwa")),
+    (2, ("diploma", "iti", "polytechnic")),
+    (1, ("hsc", "sslc", "12th", "10th", "school", "puc")),
+)
+# Rough INR value of one unit of the registration form's salary currencies; only the order of magnitude matters.
+_INR_PER_UNIT = {
+    "INR": 1.0, "USD": 83.0, "EUR": 90.0, "GBP": 105.0, "AUD": 55.0, "CAD": 61.0, "SGD": 62.0, "AED": 22.6,
+    "SAR": 22.1, "QAR": 22.8, "KWD": 270.0, "BHD": 220.0, "OMR": 216.0, "JPY": 0.56, "CNY": 11.5, "HKD": 10.6,
+    "NZD": 50.0,
+}
+
+NUMERIC_FEATURES = ("age", "education_level", "income")
+CATEGORICAL_FEATURES = ("occupation", "city", "sect")
+# Distance contributed by one unit of each numeric feature after scaling (age per 5 years, education per
+# level, income per tenfold) and by a mismatch of each category; a missing value on either side costs half.
+_NUMERIC_WEIGHTS = np.array([1.0, 0.6, 0.8], dtype=np.float32)
+_NUMERIC_SCALE = np.array([1 / 5, 1.0, 1.0], dtype=np.float32)
+_CATEGORY_WEIGHTS = np.array([0.8, 1.0, 0.6], dtype=np.float32)
+_INITIAL_CAPACITY = 1024
+
+
+@lru_cache(maxsize=4096)
+def education_level(value: Optional[str]) -> Optional[int]:
+    words = set(_NON_WORD.sub(" ", (value or "").lower()).split())
+    joined = "".join(_NON_WORD.sub("", (value or "").lower()).split())
+    if not joined:
+        return None
+    for level, keywords in _EDUCATION_LEVELS:
+        if any(keyword in words or (len(keyword) > 3 and keyword in joined) for keyword in keywords):
+            return level
+    return None
+
+
+def income_in_inr(amount, currency: Optional[str]) -> Optional[float]:
+    try:
+        value = float(str(amount).replace(",", "").strip())
+    except (TypeError, ValueError):
+        return None
+    if value <= 0 or math.isnan(value) or math.isinf(value):
+        return None
+    code = (currency or "INR").strip()[:3].upper()
+    return value * _INR_PER_UNIT.get(code, 1.0)
+
+
+@lru_cache(maxsize=8192)
+def _category_key(value: Optional[str]) -> str:
+    return " ".join(_NON_WORD.sub(" ", (value or "").lower()).split())
+
+
+@dataclass(frozen=True)
+class FeatureSource:
+    """The registration fields the feature matrix is derived from, as loaded by the repository."""
+
+    id: int
+    gender: Optional[str]
+    is_active: bool
+    birth_date: Optional[date]
+    education: Optional[str]
+    occupation_bucket: Optional[str]
+    city: Optional[str]
+    sect: Optional[str]
+    salary: Optional[str]
+    salary_currency: Optional[str]
+
+
+def partition_key(gender: Optional[str]) -> str:
+    return (gender or "").strip()
+
+
+class _Partition:
+    """Rows of one gender bucket; removed rows keep their slot, marked dead, until the next full rebuild."""
+
+    def __init__(self, capacity: int = _INITIAL_CAPACITY):
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.numeric = np.full((capacity, len(NUMERIC_FEATURES)), np.nan, dtype=np.float32)
+        self.categories = np.zeros((capacity, len(CATEGORICAL_FEATURES)), dtype=np.int32)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.size = 0
+        self.slots: dict[int, int] = {}
+
+    @classmethod
+    def from_rows(cls, ids: list[int], numeric: list[tuple], categories: list[tuple]) -> "_Partition":
+        partition = cls(capacity=max(_INITIAL_CAPACITY, len(ids) + len(ids) // 4))
+        count = len(ids)
+        if count:
+            partition.ids[:count] = ids
+            partition.numeric[:count] = numeric
+            partition.categories[:count] = categories
+            partition.alive[:count] = True
+        partition.size = count
+        partition.slots = {row_id: slot for slot, row_id in enumerate(ids)}
+        return partition
+
+    def _grow(self) -> None:
+        capacity = self.ids.size * 2
+        self.ids = np.resize(self.ids, capacity)
+        numeric = np.full((capacity, len(NUMERIC_FEATURES)), np.nan, dtype=np.float32)
+        numeric[: self.size] = self.numeric[: self.size]
+        self.numeric = numeric
+        categories = np.zeros((capacity, len(CATEGORICAL_FEATURES)), dtype=np.int32)
+        categories[: self.size] = self.categories[: self.size]
+        self.categories = categories
+        alive = np.zeros(capacity, dtype=bool)
+        alive[: self.size] = self.alive[: self.size]
+        self.alive = alive
+
+    def upsert(self, row_id: int, numeric: Sequence[float], categories: Sequence[int]) -> None:
+        slot = self.slots.get(row_id)
+        if slot is None:
+            if self.size == self.ids.size:
+                self._grow()
+            slot = self.size
+            self.size += 1
+            self.slots[row_id] = slot
+            self.ids[slot] = row_id
+        self.numeric[slot] = numeric
+        self.categories[slot] = categories
+        self.alive[slot] = True
+
+    def remove(self, row_id: int) -> None:
+        slot = self.slots.pop(row_id, None)
+        if slot is not None:
+            self.alive[slot] = False
+
+    def row(self, row_id: int) -> Optional[tuple[np.ndarray, np.ndarray]]:
+        slot = self.slots.get(row_id)
+        if slot is None:
+            return None
+        return self.numeric[slot], self.categories[slot]
+
+    def nearest(self, numeric: np.ndarray, categories: np.ndarray, limit: int, exclude: set[int]) -> list[tuple[int, float]]:
+        count = self.size
+        deltas = np.abs(self.numeric[:count] - numeric) * (_NUMERIC_SCALE * _NUMERIC_WEIGHTS)
+        # NaN marks a missing value on either side: charge half the feature's weight instead.
+        deltas = np.where(np.isnan(deltas), _NUMERIC_WEIGHTS * 0.5, deltas)
+        distance = deltas.sum(axis=1)
+        column_categories = self.categories[:count]
+        mismatch = np.where(
+            (column_categories == 0) | (categories == 0),
+            np.float32(0.5),
+            (column_categories != categories).astype(np.float32),
+        )
+        distance += mismatch @ _CATEGORY_WEIGHTS
+        distance[~self.alive[:count]] = np.inf
+        for row_id in exclude:
+            slot = self.slots.get(row_id)
+            if slot is not None:
+                distance[slot] = np.inf
+        wanted = min(limit, count)
+        if wanted <= 0:
+            return []
+        candidates = np.argpartition(distance, wanted - 1)[:wanted] if wanted < count else np.arange(count)
+        candidates = candidates[np.lexsort((-self.ids[candidates], distance[candidates]))]
+        return [(int(self.ids[slot]), float(distance[slot])) for slot in candidates if np.isfinite(distance[slot])]
+
+    def nbytes(self) -> int:
+        return self.ids.nbytes + self.numeric.nbytes + self.categories.nbytes + self.alive.nbytes
+
+
+class ProfileFeatureIndex:
+    """Per gender bucket feature matrices for similar-profile queries.
+
+    Full rebuilds read and encode the table without holding the query lock and swap the new partitions in
+    at the end, so /similar keeps answering from the previous matrix meanwhile. Write paths only touch the
+    stale set, which has its own lock and never waits on a rebuild.
+    """
+
+    def __init__(self, rebuild_seconds: float = 3600.0):
+        self.rebuild_seconds = rebuild_seconds
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._stale_lock = threading.Lock()
+        self._partitions: dict[str, _Partition] = {}
+        self._location: dict[int, str] = {}
+        self._vocabularies: tuple[dict[str, int], ...] = tuple({} for _ in CATEGORICAL_FEATURES)
+        self._built_at: Optional[float] = None
+        self._stale: set[int] = set()
+        self._full_builds = 0
+        self._incremental_rows = 0
+        self._last_build_ms = 0.0
+        self._queries = 0
+        self._last_query_ms = 0.0
+
+    def mark_stale(self, registration_id: Optional[int]) -> None:
+        if registration_id is None:
+            return
+        with self._stale_lock:
+            self._stale.add(registration_id)
+
+    def _take_stale(self) -> set[int]:
+        with self._stale_lock:
+            stale, self._stale = self._stale, set()
+        return stale
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._built_at = None
+
+    @staticmethod
+    def _encode(
+        source: FeatureSource, vocabularies: tuple[dict[str, int], ...]
+    ) -> tuple[tuple[float, ...], tuple[int, ...]]:
+        age = calculate_age(source.birth_date)
+        level = education_level(source.education)
+        income = income_in_inr(source.salary, source.salary_currency)
+        numeric = (
+            math.nan if age is None else float(age),
+            math.nan if level is None else float(level),
+            math.nan if income is None else math.log10(income),
+        )
+        codes = []
+        for vocabulary, value in zip(vocabularies, (source.occupation_bucket, source.city, source.sect)):
+            key = _category_key(value)
+            codes.append(vocabulary.setdefault(key, len(vocabulary) + 1) if key else 0)
+        return numeric, tuple(codes)
+
+    def _apply(self, source: FeatureSource) -> None:
+        previous = self._location.pop(source.id, None)
+        if previous is not None:
+            self._partitions[previous].remove(source.id)
+        if not source.is_active:
+            return
+        key = partition_key(source.gender)
+        partition = self._partitions.get(key)
+        if partition is None:
+            partition = self._partitions[key] = _Partition()
+        numeric, codes = self._encode(source, self._vocabularies)
+        partition.upsert(source.id, numeric, codes)
+        self._location[source.id] = key
+
+    def _needs_full_build(self) -> bool:
+        with self._lock:
+            return self._built_at is None or time.monotonic() - self._built_at > self.rebuild_seconds
+
+    def _full_build(self, load_all: Callable[[], Iterable[FeatureSource]]) -> None:
+        started = time.perf_counter()
+        # Every row marked so far was committed before this read starts, so the load covers it; rows marked
+        # from here on stay queued for the next incremental pass.
+        self._take_stale()
+        location: dict[int, str] = {}
+        vocabularies: tuple[dict[str, int], ...] = tuple({} for _ in CATEGORICAL_FEATURES)
+        # Encoded into plain lists per bucket first so each partition's arrays are filled in one copy.
+        buckets: dict[str, tuple[list, list, list]] = {}
+        for source in load_all():
+            if not source.is_active:
+                continue
+            key = partition_key(source.gender)
+            ids, numeric, codes = buckets.setdefault(key, ([], [], []))
+            row_numeric, row_codes = self._encode(source, vocabularies)
+            ids.append(source.id)
+            numeric.append(row_numeric)
+            codes.append(row_codes)
+            location[source.id] = key
+        partitions = {key: _Partition.from_rows(*rows) for key, rows in buckets.items()}
+        with self._lock:
+            self._partitions = partitions
+            self._location = location
+            self._vocabularies = vocabularies
+            self._built_at = time.monotonic()
+            self._full_builds += 1
+            self._last_build_ms = (time.perf_counter() - started) * 1000
+
+    def refresh(
+        self,
+        load_all: Callable[[], Iterable[FeatureSource]],
+        load_ids: Callable[[set[int]], Iterable[FeatureSource]],
+    ) -> None:
+        """Bring the matrix up to date: a full build when missing or expired, else reload only stale rows.
+
+        Only one caller refreshes at a time. Once a matrix exists, other callers skip the refresh and are
+        served the current one instead of waiting for a rebuild.
+        """
+        with self._lock:
+            built = self._built_at is not None
+        if not self._build_lock.acquire(blocking=not built):
+            return
+        try:
+            if self._needs_full_build():
+                self._full_build(load_all)
+                return
+            stale = self._take_stale()
+            if not stale:
+                return
+            try:
+                sources = list(load_ids(stale))
+            except Exception:
+                with self._stale_lock:
+                    self._stale |= stale
+                raise
+            with self._lock:
+                found = set()
+                for source in sources:
+                    self._apply(source)
+                    found.add(source.id)
+                for missing in stale - found:  # deleted rows
+                    self._apply(FeatureSource(missing, None, False, None, None, None, None, None, None, None))
+                self._incremental_rows += len(stale)
+        finally:
+            self._build_lock.release()
+
+    def similar(self, registration_id: int, limit: int, exclude: Iterable[int] = ()) -> list[tuple[int, float]]:
+        """Nearest rows to registration_id within its own gender bucket, closest first, as (id, distance)."""
+        started = time.perf_counter()
+        with self._lock:
+            key = self._location.get(registration_id)
+            if key is None:
+                return []
+            partition = self._partitions[key]
+            numeric, codes = partition.row(registration_id)
+            result = partition.nearest(numeric, codes, limit, {registration_id, *exclude})
+            self._queries += 1
+            self._last_query_ms = (time.perf_counter() - started) * 1000
+        return result
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "partitions": {key or "unspecified": len(partition.slots) for key, partition in self._partitions.items()},
+                "bytes": sum(partition.nbytes() for partition in self._partitions.values()),
+                "full_builds": self._full_builds,
+                "last_build_ms": round(self._last_build_ms, 2),
+                "incremental_rows": self._incremental_rows,
+                "pending_stale": len(self._stale),
+                "queries": self._queries,
+                "last_query_ms": round(self._last_query_ms, 3),
+            }
+
+
+profile_feature_index = ProfileFeatureIndex(rebuild_seconds=get_settings().similar_profiles_rebuild_seconds)
@@ -0,0 +1,100 @@
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from app.core.config import get_settings
+from app.services.http_cache import strong_etag
+
+
+@dataclass(frozen=True)
+class RenderedCarousel:
+    body: bytes
+    etag: str
+
+
+@dataclass
+class _Snapshot:
+    built_at: float
+    items: list[Any]
+    rendered: dict[int, RenderedCarousel] = field(default_factory=dict)
+
+
+class PublicCarouselCache:
+    """Precomputed "recent verified" landing-page carousel.
+
+    One query loads the newest max_items profiles; every limit is served as a slice of that list, serialized
+    once per snapshot together with its ETag. The snapshot is rebuilt by the first request after it is older
+    than refresh_seconds or after invalidate() (admin status changes, profile edits); concurrent requests
+    during a rebuild wait for the single loader instead of querying in parallel.
+    """
+
+    def __init__(self, refresh_seconds: float = 60.0, max_items: int = 20):
+        self.refresh_seconds = max(0.0, refresh_seconds)
+        self.max_items = max_items
+        self._snapshot: Optional[_Snapshot] = None
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._generation = 0
+        self._hits = 0
+        self._builds = 0
+        self._invalidations = 0
+        self._last_build_ms = 0.0
+
+    def _fresh(self, snapshot: Optional[_Snapshot]) -> bool:
+        return snapshot is not None and time.monotonic() - snapshot.built_at < self.refresh_seconds
+
+    def get(
+        self,
+        limit: int,
+        load: Callable[[int], list[Any]],
+        render: Callable[[list[Any]], bytes],
+    ) -> RenderedCarousel:
+        snapshot = self._snapshot
+        if self._fresh(snapshot):
+            with self._lock:
+                self._hits += 1
+        else:
+            with self._build_lock:
+                snapshot = self._snapshot
+                if not self._fresh(snapshot):
+                    started = time.perf_counter()
+                    generation = self._generation
+                    snapshot = _Snapshot(built_at=time.monotonic(), items=load(self.max_items))
+                    with self._lock:
+                        # An invalidate() during the load means the rows may already be stale: serve, don't keep.
+                        if generation == self._generation:
+                            self._snapshot = snapshot
+                        self._builds += 1
+                        self._last_build_ms = round((time.perf_counter() - started) * 1000, 2)
+
+        rendered = snapshot.rendered.get(limit)
+        if rendered is None:
+            body = render(snapshot.items[:limit])
+            rendered = RenderedCarousel(body=body, etag=strong_etag(body))
+            snapshot.rendered[limit] = rendered
+        return rendered
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._snapshot = None
+            self._generation += 1
+            self._invalidations += 1
+
+    def metrics(self) -> dict:
+        with self._lock:
+            snapshot = self._snapshot
+            return {
+                "refresh_seconds": self.refresh_seconds,
+                "items": len(snapshot.items) if snapshot else 0,
+                "age_seconds": round(time.monotonic() - snapshot.built_at, 1) if snapshot else None,
+                "hits": self._hits,
+                "builds": self._builds,
+                "invalidations": self._invalidations,
+                "last_build_ms": self._last_build_ms,
+            }
+
+
+_settings = get_settings()
+public_carousel_cache = PublicCarouselCache(refresh_seconds=_settings.public_carousel_refresh_seconds)
@@ -0,0 +1,122 @@
+import re
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.services.count_cache import CountCache
+from app.services.porutham import compatibility_scores, nakshatra_index, rasi_index
+
+_NON_LETTERS = re.compile(r"[^a-z]+")
+_REQUIRED_ANSWERS = {"yes", "y", "true", "1", "required"}
+# Rank keys pack (score, registration id) into one int64 so one descending sort orders by score, then newest.
+_ID_BITS = 32
+_ID_MASK = (1 << _ID_BITS) - 1
+
+
+def normalize_gothram(value: Optional[str]) -> str:
+    return _NON_LETTERS.sub("", (value or "").lower())
+
+
+def horoscope_matching_required(value: Optional[str]) -> bool:
+    return (value or "").strip().lower() in _REQUIRED_ANSWERS
+
+
+@dataclass(frozen=True)
+class CandidatePool:
+    """Compatibility inputs of one feed pool as parallel NumPy arrays, one slot per registration."""
+
+    ids: np.ndarray
+    nakshatras: np.ndarray
+    rasis: np.ndarray
+    gothrams: np.ndarray
+    requires_matching: np.ndarray
+    gothram_codes: dict[str, int]
+
+    @classmethod
+    def from_rows(cls, rows: Iterable) -> "CandidatePool":
+        """Build from (id, nakshatra, rasi, gothram, horoscope_matching_required) rows.
+
+        Gothrams are interned to small integer codes (0 = none given) so exclusion is an array compare.
+        """
+        gothram_codes: dict[str, int] = {}
+        ids, nakshatras, rasis, gothrams, requires = [], [], [], [], []
+        for row_id, nakshatra, rasi, gothram, matching in rows:
+            ids.append(row_id)
+            nakshatras.append(nakshatra_index(nakshatra))
+            rasis.append(rasi_index(rasi))
+            key = normalize_gothram(gothram)
+            gothrams.append(gothram_codes.setdefault(key, len(gothram_codes) + 1) if key else 0)
+            requires.append(horoscope_matching_required(matching))
+        return cls(
+            ids=np.asarray(ids, dtype=np.int64),
+            nakshatras=np.asarray(nakshatras, dtype=np.intp),
+            rasis=np.asarray(rasis, dtype=np.intp),
+            gothrams=np.asarray(gothrams, dtype=np.int32),
+            requires_matching=np.asarray(requires, dtype=bool),
+            gothram_codes=gothram_codes,
+        )
+
+    def __len__(self) -> int:
+        return int(self.ids.size)
+
+
+@dataclass(frozen=True)
+class Seeker:
+    """The member recommendations are ranked for."""
+
+    registration_id: int
+    role: Optional[str]
+    nakshatra: Optional[str] = None
+    rasi: Optional[str] = None
+    gothram: Optional[str] = None
+    horoscope_matching_required: Optional[str] = None
+
+
+def rank_candidates(
+    pool: CandidatePool,
+    seeker: Seeker,
+    limit: int,
+    offset: int = 0,
+    after: Optional[tuple[int, int]] = None,
+) -> tuple[list[tuple[int, int]], int]:
+    """Return ([(registration id, score)] best first, eligible total) for one page of the pool.
+
+    Excludes the seeker, candidates of the same gothram, and Rajju/Vedha dosham pairs when either side
+    requires horoscope matching. Order is score descending, then id descending; after is the (score, id)
+    of the previous page's last row and gives a stable seek, since a pair's score never changes.
+    """
+    scores, dosham = compatibility_scores(
+        nakshatra_index(seeker.nakshatra),
+        rasi_index(seeker.rasi),
+        seeker.role,
+        pool.nakshatras,
+        pool.rasis,
+    )
+    eligible = pool.ids != seeker.registration_id
+    gothram_code = pool.gothram_codes.get(normalize_gothram(seeker.gothram))
+    if gothram_code:
+        eligible &= pool.gothrams != gothram_code
+    if horoscope_matching_required(seeker.horoscope_matching_required):
+        eligible &= ~dosham
+    else:
+        eligible &= ~(dosham & pool.requires_matching)
+    total = int(np.count_nonzero(eligible))
+
+    keys = (scores << _ID_BITS) | pool.ids
+    if after is not None:
+        eligible &= keys < ((after[0] << _ID_BITS) | after[1])
+    keys = keys[eligible]
+    wanted = min(offset + limit, keys.size)
+    if wanted <= 0:
+        return [], total
+    if wanted < keys.size:
+        keys = keys[np.argpartition(keys, keys.size - wanted)[keys.size - wanted :]]
+    keys = np.sort(keys)[::-1][offset : offset + limit]
+    return [(int(key & _ID_MASK), int(key >> _ID_BITS)) for key in keys], total
+
+
+_settings = get_settings()
+# Pools are shared by every member of a gender bucket; a short TTL bounds how stale a new profile can be.
+recommendation_pool_cache = CountCache(ttl_seconds=_settings.recommendation_pool_ttl_seconds, max_entries=8)
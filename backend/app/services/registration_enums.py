@@ -0,0 +1,58 @@
+"""Canonical registration status and gender values.
+
+Both columns used to take free text ("verified", "m", " Female "), so every reader had to lower/strip them.
+Writes now go through normalize_status / normalize_gender (schema validators and the startup backfill) and
+the columns are CHECK-constrained to these values, so queries compare against plain constants.
+"""
+from typing import Optional
+
+STATUS_NEW = "New"
+STATUS_IN_REVIEW = "In Review"
+STATUS_VERIFIED = "Verified"
+STATUS_ON_HOLD = "On Hold"
+STATUS_CLOSED = "Closed"
+REGISTRATION_STATUSES = (STATUS_NEW, STATUS_IN_REVIEW, STATUS_VERIFIED, STATUS_ON_HOLD, STATUS_CLOSED)
+
+GENDER_MALE = "Male"
+GENDER_FEMALE = "Female"
+GENDERS = (GENDER_MALE, GENDER_FEMALE)
+OPPOSITE_GENDER = {GENDER_MALE: GENDER_FEMALE, GENDER_FEMALE: GENDER_MALE}
+
+_STATUS_ALIASES = {
+    "new": STATUS_NEW,
+    "in review": STATUS_IN_REVIEW,
+    "review": STATUS_IN_REVIEW,
+    "pending": STATUS_IN_REVIEW,
+    "verified": STATUS_VERIFIED,
+    "approved": STATUS_VERIFIED,
+    "on hold": STATUS_ON_HOLD,
+    "hold": STATUS_ON_HOLD,
+    "closed": STATUS_CLOSED,
+    "rejected": STATUS_CLOSED,
+}
+_GENDER_ALIASES = {
+    "male": GENDER_MALE,
+    "m": GENDER_MALE,
+    "groom": GENDER_MALE,
+    "female": GENDER_FEMALE,
+    "f": GENDER_FEMALE,
+    "bride": GENDER_FEMALE,
+}
+
+
+def _key(value: str) -> str:
+    return " ".join(value.replace("_", " ").replace("-", " ").lower().split())
+
+
+def normalize_status(value: Optional[str]) -> Optional[str]:
+    """Canonical status for value; None when it is not a recognised spelling."""
+    if value is None:
+        return None
+    return _STATUS_ALIASES.get(_key(value))
+
+
+def normalize_gender(value: Optional[str]) -> Optional[str]:
+    """Canonical gender for value; None when it is blank or not a recognised spelling."""
+    if value is None:
+        return None
+    return _GENDER_ALIASES.get(_key(value))
@@ -1,7 +1,20 @@
+import asyncio
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
 from passlib.context import CryptContext
 
+from app.core.config import get_settings
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+T = TypeVar("T")
+
+
+class PasswordHasherBusyError(RuntimeError):
+    pass
+
 
 def hash_password(raw_password: str) -> str:
     return pwd_context.hash(raw_password)
@@ -9,3 +22,102 @@ def hash_password(raw_password: str) -> str:
 
 def verify_password(raw_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(raw_password, hashed_password)
+
+
+class PasswordHasher:
+    """Runs bcrypt work on a dedicated pool so it never occupies the shared AnyIO threadpool."""
+
+    def __init__(self, mode: str = "thread", workers: int = 2, max_concurrency: int = 2, max_queue: int = 64):
+        self.mode = mode
+        self.workers = max(1, workers)
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max(0, max_queue)
+        self._executor: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+        # Separate from _lock, which shutdown() holds while waiting for the pool to drain.
+        self._counters_lock = threading.Lock()
+        self._in_flight = 0
+        self._queued = 0
+        self._max_queued_seen = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.mode == "process":
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hasher")
+            return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        semaphore = self._get_semaphore()
+        with self._counters_lock:
+            if self._queued >= self.max_queue and self._in_flight >= self.max_concurrency:
+                self._rejected += 1
+                raise PasswordHasherBusyError("Password hashing queue is full")
+            self._queued += 1
+            self._max_queued_seen = max(self._max_queued_seen, self._queued)
+        try:
+            await semaphore.acquire()
+        finally:
+            with self._counters_lock:
+                self._queued -= 1
+
+        with self._counters_lock:
+            self._in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            with self._counters_lock:
+                self._in_flight -= 1
+                self._completed += 1
+            semaphore.release()
+
+    def metrics(self) -> dict:
+        with self._counters_lock:
+            return {
+                "mode": self.mode,
+                "workers": self.workers,
+                "max_concurrency": self.max_concurrency,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "queued": self._queued,
+                "max_queued_seen": self._max_queued_seen,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+_settings = get_settings()
+password_hasher = PasswordHasher(
+    mode=_settings.password_hash_executor,
+    workers=_settings.password_hash_workers,
+    max_concurrency=_settings.password_hash_max_concurrency,
+    max_queue=_settings.password_hash_max_queue,
+)
+
+
+async def hash_password_async(raw_password: str) -> str:
+    return await password_hasher.run(hash_password, raw_password)
+
+
+async def verify_password_async(raw_password: str, hashed_password: str) -> bool:
+    return await password_hasher.run(verify_password, raw_password, hashed_password)
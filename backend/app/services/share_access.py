@@ -0,0 +1,131 @@
+import logging
+import threading
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.core.config import get_settings
+
+# link id -> (views since the last flush, latest view time)
+AccessBatch = dict[int, tuple[int, datetime]]
+
+logger = logging.getLogger(__name__)
+
+
+class ShareAccessTracker:
+    """Write-behind buffer for share-link views.
+
+    Public share pages only record a view in memory; a background thread hands the accumulated counts and
+    latest timestamps to the writer every flush_interval seconds (sooner once half of max_pending links are
+    buffered), which applies them as one batched UPDATE. A failed flush is logged and its batch put back for
+    the next attempt. The buffer never holds more than max_pending links: while the database keeps failing,
+    views of further links are dropped and counted instead. shutdown() stops the thread after a final flush.
+    """
+
+    def __init__(self, flush_interval: float = 5.0, max_pending: int = 10000):
+        self.flush_interval = max(0.1, flush_interval)
+        self.max_pending = max(1, max_pending)
+        self._pending: AccessBatch = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._writer: Optional[Callable[[AccessBatch], None]] = None
+        self._recorded = 0
+        self._flushes = 0
+        self._flushed_links = 0
+        self._failures = 0
+        self._dropped_views = 0
+        self._last_flush_ms = 0.0
+
+    def record(self, link_id: int, accessed_at: Optional[datetime] = None) -> None:
+        accessed_at = accessed_at or datetime.now(timezone.utc)
+        with self._lock:
+            self._recorded += 1
+            if link_id not in self._pending and len(self._pending) >= self.max_pending:
+                self._dropped_views += 1
+                return
+            views, latest = self._pending.get(link_id, (0, accessed_at))
+            self._pending[link_id] = (views + 1, max(latest, accessed_at))
+            flush_soon = len(self._pending) * 2 >= self.max_pending
+        if flush_soon:
+            self._wake.set()
+
+    def pending(self, link_id: int) -> tuple[int, Optional[datetime]]:
+        """Views and latest view time not yet written, so owners see counts that include the current buffer."""
+        with self._lock:
+            views, latest = self._pending.get(link_id, (0, None))
+            return views, latest
+
+    def flush(self) -> int:
+        """Write everything buffered so far; returns the number of links updated."""
+        if self._writer is None:
+            return 0
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+            started = time.perf_counter()
+            try:
+                self._writer(batch)
+            except Exception:
+                logger.exception("Could not write %d share link view count(s); retrying later", len(batch))
+                with self._lock:
+                    for link_id, (views, latest) in batch.items():
+                        if link_id not in self._pending and len(self._pending) >= self.max_pending:
+                            self._dropped_views += views
+                            continue
+                        pending_views, pending_latest = self._pending.get(link_id, (0, latest))
+                        self._pending[link_id] = (pending_views + views, max(pending_latest, latest))
+                    self._failures += 1
+                return 0
+            with self._lock:
+                self._flushes += 1
+                self._flushed_links += len(batch)
+                self._last_flush_ms = round((time.perf_counter() - started) * 1000, 2)
+            return len(batch)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def start(self, writer: Callable[[AccessBatch], None]) -> None:
+        self._writer = writer
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="share-access-flush", daemon=True)
+            self._thread.start()
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 5)
+            self._thread = None
+        self.flush()
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "flush_interval_seconds": self.flush_interval,
+                "pending_links": len(self._pending),
+                "pending_views": sum(views for views, _ in self._pending.values()),
+                "recorded": self._recorded,
+                "flushes": self._flushes,
+                "flushed_links": self._flushed_links,
+                "failures": self._failures,
+                "dropped_views": self._dropped_views,
+                "last_flush_ms": self._last_flush_ms,
+            }
+
+
+_settings = get_settings()
+share_access_tracker = ShareAccessTracker(
+    flush_interval=_settings.share_access_flush_seconds,
+    max_pending=_settings.share_access_max_pending,
+)
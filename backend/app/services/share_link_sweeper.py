@@ -0,0 +1,113 @@
+import logging
+import threading
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class ShareLinkSweeper:
+    """Background deletion of share links that expired more than retention_days ago.
+
+    Every interval seconds the sweeper asks the delete callback to remove up to batch_size rows at a time,
+    committing each batch, until a short batch shows the backlog is cleared or max_batches is reached, so one
+    run never holds long locks or monopolises the database.
+    """
+
+    def __init__(
+        self,
+        interval: float = 3600.0,
+        retention_days: int = 30,
+        batch_size: int = 500,
+        max_batches: int = 20,
+    ):
+        self.interval = max(1.0, interval)
+        self.retention_days = max(0, retention_days)
+        self.batch_size = max(1, batch_size)
+        self.max_batches = max(1, max_batches)
+        self._delete_batch: Optional[Callable[[datetime, int], int]] = None
+        self._sweep_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._runs = 0
+        self._deleted = 0
+        self._last_deleted = 0
+        self._last_run_ms = 0.0
+        self._last_run_at: Optional[datetime] = None
+        self._failures = 0
+
+    def cutoff(self, now: Optional[datetime] = None) -> datetime:
+        return (now or datetime.now(timezone.utc)) - timedelta(days=self.retention_days)
+
+    def sweep(self) -> int:
+        """Run one sweep now; returns the number of links deleted."""
+        if self._delete_batch is None:
+            return 0
+        with self._sweep_lock:
+            started = time.perf_counter()
+            cutoff = self.cutoff()
+            deleted = 0
+            try:
+                for _ in range(self.max_batches):
+                    removed = self._delete_batch(cutoff, self.batch_size)
+                    deleted += removed
+                    if removed < self.batch_size or self._stop.is_set():
+                        break
+            except Exception:
+                logger.exception("Share link sweep failed after deleting %d link(s); retrying next interval", deleted)
+                with self._lock:
+                    self._failures += 1
+            with self._lock:
+                self._runs += 1
+                self._deleted += deleted
+                self._last_deleted = deleted
+                self._last_run_ms = round((time.perf_counter() - started) * 1000, 2)
+                self._last_run_at = datetime.now(timezone.utc)
+            return deleted
+
+    def _run(self) -> None:
+        # Sweep once at startup so frequently restarted processes still make progress.
+        while True:
+            self.sweep()
+            if self._stop.wait(self.interval):
+                return
+
+    def start(self, delete_batch: Callable[[datetime, int], int]) -> None:
+        self._delete_batch = delete_batch
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="share-link-sweeper", daemon=True)
+            self._thread.start()
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "interval_seconds": self.interval,
+                "retention_days": self.retention_days,
+                "batch_size": self.batch_size,
+                "runs": self._runs,
+                "deleted": self._deleted,
+                "last_deleted": self._last_deleted,
+                "last_run_ms": self._last_run_ms,
+                "last_run_at": self._last_run_at.isoformat() if self._last_run_at else None,
+                "failures": self._failures,
+            }
+
+
+_settings = get_settings()
+share_link_sweeper = ShareLinkSweeper(
+    interval=_settings.share_link_sweep_interval_seconds,
+    retention_days=_settings.share_link_retention_days,
+    batch_size=_settings.share_link_sweep_batch_size,
+)
@@ -0,0 +1,175 @@
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from app.core.config import get_settings
+
+SHARE_TOKEN_VERSION = 1
+# URL-safe, outside the base64url alphabet (so legacy secrets.token_urlsafe() tokens never contain it) and,
+# unlike ".", not mistaken for a file extension by static hosts serving /profile/share/<token>.
+SEPARATOR = "~"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ShareTokenClaims:
+    link_id: int
+    member_id: str
+    expires_at: int
+    include_contact_details: bool
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        return self.expires_at <= (now if now is not None else time.time())
+
+
+class RevokedShareLinks:
+    """In-memory set of revoked share link ids, so views of disabled links are refused without a query.
+
+    Loaded at startup with the revoked links that have not expired yet (expired tokens are refused on their
+    own claims), extended as this process revokes links or finds them revoked, and reloaded in the
+    background every reload_interval seconds so revocations handled by other workers are picked up.
+    """
+
+    def __init__(self, reload_interval: float = 30.0) -> None:
+        self.reload_interval = max(1.0, reload_interval)
+        self._ids: set[int] = set()
+        self._added_during_load: Optional[set[int]] = None
+        self._lock = threading.Lock()
+        self._loader: Optional[Callable[[], Iterable[int]]] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._reloads = 0
+        self._failures = 0
+
+    def load(self, link_ids: Iterable[int]) -> None:
+        with self._lock:
+            self._ids = set(link_ids)
+
+    def add(self, link_id: int) -> None:
+        with self._lock:
+            self._ids.add(link_id)
+            if self._added_during_load is not None:
+                self._added_during_load.add(link_id)
+
+    def __contains__(self, link_id: int) -> bool:
+        return link_id in self._ids
+
+    def reload(self) -> None:
+        if self._loader is None:
+            return
+        with self._lock:
+            self._added_during_load = set()
+        try:
+            loaded = set(self._loader())
+        except Exception:
+            logger.exception("Could not reload revoked share links; keeping the previous set")
+            with self._lock:
+                self._added_during_load = None
+                self._failures += 1
+            return
+        with self._lock:
+            # Revocations recorded while the read ran may not be in it yet; keep them.
+            self._ids = loaded | self._added_during_load
+            self._added_during_load = None
+            self._reloads += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.reload_interval):
+            self.reload()
+
+    def start(self, loader: Callable[[], Iterable[int]]) -> None:
+        """Load now, then keep reloading in the background."""
+        self._loader = loader
+        self.reload()
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="revoked-share-links-reload", daemon=True)
+            self._thread.start()
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "revoked_links": len(self._ids),
+                "reload_interval_seconds": self.reload_interval,
+                "reloads": self._reloads,
+                "failures": self._failures,
+            }
+
+
+revoked_share_links = RevokedShareLinks(reload_interval=get_settings().share_revoked_reload_seconds)
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+
+def _sign(payload_b64: str, secret: str) -> str:
+    return _b64(hmac.new(secret.encode("utf-8"), payload_b64.encode("ascii"), hashlib.sha256).digest())
+
+
+def create_share_token(
+    link_id: int,
+    member_id: str,
+    expires_at: int,
+    include_contact_details: bool,
+    secret: str,
+) -> str:
+    payload = {
+        "v": SHARE_TOKEN_VERSION,
+        "l": link_id,
+        "m": member_id,
+        "e": expires_at,
+        "c": int(include_contact_details),
+    }
+    payload_b64 = _b64(json.dumps(payload, separators=(",", ":"), sort_keys=True).encode("utf-8"))
+    return f"{payload_b64}{SEPARATOR}{_sign(payload_b64, secret)}"
+
+
+def is_signed_share_token(token: str) -> bool:
+    return SEPARATOR in token
+
+
+def decode_share_token(token: str, secret: str) -> Optional[ShareTokenClaims]:
+    """Claims of a correctly signed token; None for anything forged, truncated or malformed."""
+    try:
+        payload_b64, signature = token.split(SEPARATOR, 1)
+    except ValueError:
+        return None
+    try:
+        expected = _sign(payload_b64, secret)
+    except UnicodeEncodeError:
+        return None
+    if not hmac.compare_digest(signature.encode("utf-8"), expected.encode("ascii")):
+        return None
+
+    padded = payload_b64 + "=" * (-len(payload_b64) % 4)
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except Exception:
+        return None
+    if not isinstance(payload, dict) or payload.get("v") != SHARE_TOKEN_VERSION:
+        return None
+
+    link_id, member_id, expires_at = payload.get("l"), payload.get("m"), payload.get("e")
+    if not isinstance(link_id, int) or not isinstance(member_id, str) or not isinstance(expires_at, int):
+        return None
+    return ShareTokenClaims(
+        link_id=link_id,
+        member_id=member_id,
+        expires_at=expires_at,
+        include_contact_details=bool(payload.get("c")),
+    )
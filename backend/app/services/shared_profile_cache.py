@@ -0,0 +1,108 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.core.config import get_settings
+
+
+@dataclass(frozen=True)
+class CachedSharedProfile:
+    link_id: int
+    member_id: str
+    link_expires_at: datetime
+    profile_updated_at: Optional[datetime]
+    etag: str
+    body: bytes
+
+
+class SharedProfileCache:
+    """Per-process TTL + LRU cache of rendered public share responses, keyed by share token.
+
+    Each entry holds the serialized body and strong ETag rendered from one version of the profile, together
+    with that version's updated_at. Callers confirm a hit by comparing it with the row's current updated_at,
+    which skips the full load and serialization. Revoking a link drops its token; editing a profile drops
+    every token of that member in this process. The TTL bounds how long an entry lives otherwise.
+    """
+
+    def __init__(self, ttl_seconds: float = 60.0, max_entries: int = 5000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self._entries: OrderedDict[str, tuple[float, CachedSharedProfile]] = OrderedDict()
+        self._tokens_by_member: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def get(self, token: str) -> Optional[CachedSharedProfile]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is not None:
+                fresh_until, cached = entry
+                if fresh_until > now and cached.link_expires_at > datetime.now(timezone.utc):
+                    self._entries.move_to_end(token)
+                    self._hits += 1
+                    return cached
+                self._drop(token)
+            self._misses += 1
+            return None
+
+    def put(self, token: str, cached: CachedSharedProfile) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._drop(token)
+            self._entries[token] = (time.monotonic() + self.ttl_seconds, cached)
+            self._tokens_by_member.setdefault(cached.member_id, set()).add(token)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, token: str) -> None:
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        tokens = self._tokens_by_member.get(entry[1].member_id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_member[entry[1].member_id]
+
+    def invalidate_token(self, token: str) -> None:
+        with self._lock:
+            self._drop(token)
+            self._invalidations += 1
+
+    def invalidate_member(self, member_id: str) -> None:
+        with self._lock:
+            for token in list(self._tokens_by_member.get(member_id, ())):
+                self._drop(token)
+            self._invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_member.clear()
+
+    def metrics(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self._invalidations,
+            }
+
+
+_settings = get_settings()
+shared_profile_cache = SharedProfileCache(
+    ttl_seconds=_settings.shared_profile_cache_ttl_seconds,
+    max_entries=_settings.shared_profile_cache_max_entries,
+)
@@ -0,0 +1,118 @@
+"""Admin search benchmark.
+
+Seeds registrations with varied names, cities, occupations, phones and
+emails, then compares the old unindexed ILIKE scan against the indexed
+search used by the admin list (FTS5 trigram on SQLite, pg_trgm on
+PostgreSQL). Reports median latency per term. Run from the backend
+directory:
+
+    python scripts/bench_admin_search.py --rows 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench_search.db")
+
+from sqlalchemy import func, insert, or_, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.db.init_db import init_db  # noqa: E402
+from app.db.session import engine  # noqa: E402
+from app.models.registration import Registration  # noqa: E402
+from app.repositories.registration import list_registrations_paginated  # noqa: E402
+from app.services.count_cache import registration_count_cache  # noqa: E402
+
+FIRST_NAMES = ["Ravi", "Priya", "Karthik", "Lakshmi", "Srinivasan", "Meenakshi", "Venkat", "Divya", "Arjun", "Kavya"]
+LAST_NAMES = ["Iyer", "Iyengar", "Sharma", "Krishnan", "Raman", "Subramanian", "Natarajan", "Rao", "Bhat", "Menon"]
+CITIES = ["Chennai", "Bengaluru", "Coimbatore", "Madurai", "Hyderabad", "Pune", "Mumbai", "Trichy", "Salem", "Delhi"]
+OCCUPATIONS = ["Software Engineer", "Doctor", "Chartered Accountant", "Teacher", "Architect", "Lawyer", "Banker"]
+TERMS = ["srinivasan", "coimbatore", "chartered", "VV-0421", "98401", "meenakshi iyer", "zzqx"]
+
+
+def _seed(rows: int) -> None:
+    init_db()
+    rng = random.Random(7)
+    batch = []
+    with Session(bind=engine) as db:
+        for index in range(1, rows + 1):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            batch.append(
+                {
+                    "member_id": f"VV-{index:06d}",
+                    "name": f"{first} {last}",
+                    "password_hash": "x",
+                    "phone": f"9{rng.randrange(10**9):09d}",
+                    "email": f"{first.lower()}.{last.lower()}{index}@example.com",
+                    "city": rng.choice(CITIES),
+                    "occupation": rng.choice(OCCUPATIONS),
+                    "status": "New",
+                    "is_active": True,
+                    "credits": 3,
+                    "extra_data": {},
+                }
+            )
+            if len(batch) == 5000:
+                db.execute(insert(Registration), batch)
+                batch = []
+        if batch:
+            db.execute(insert(Registration), batch)
+        db.commit()
+
+
+def _ilike_page(db: Session, term: str, page_size: int):
+    keyword = f"%{term}%"
+    condition = or_(*(getattr(Registration, name).ilike(keyword) for name in ("name", "member_id", "phone", "email", "city", "occupation")))
+    total = db.scalar(select(func.count(Registration.id)).where(condition))
+    rows = db.scalars(
+        select(Registration.id).where(condition).order_by(Registration.created_at.desc()).limit(page_size)
+    ).all()
+    return total, rows
+
+
+def _time(run, repeats: int) -> tuple[float, object]:
+    timings = []
+    result = None
+    for _ in range(repeats):
+        registration_count_cache.clear()
+        with Session(bind=engine) as db:
+            started = time.perf_counter()
+            result = run(db)
+            timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    _seed(args.rows)
+    print(f"seeded {args.rows} rows in {time.perf_counter() - started:.1f}s ({engine.dialect.name})")
+    print(f"{'term':<18} {'matches':>8} {'ILIKE scan':>12} {'indexed':>10} {'relevance':>10}")
+    for term in TERMS:
+        scan_ms, (scan_total, _) = _time(lambda db: _ilike_page(db, term, args.page_size), args.repeats)
+        indexed_ms, (_, indexed_total, _) = _time(
+            lambda db: list_registrations_paginated(db, page=1, page_size=args.page_size, search=term),
+            args.repeats,
+        )
+        ranked_ms, _ = _time(
+            lambda db: list_registrations_paginated(
+                db, page=1, page_size=args.page_size, search=term, sort_by="relevance"
+            ),
+            args.repeats,
+        )
+        marker = "" if scan_total == indexed_total or " " in term else f"  (scan found {scan_total})"
+        print(f"{term:<18} {indexed_total:>8} {scan_ms:>10.1f}ms {indexed_ms:>8.1f}ms {ranked_ms:>8.1f}ms{marker}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""List-projection benchmark.
+
+Seeds registrations whose extra_data carries a ~200KB profile photo data URL,
+then compares loading full rows against the projected queries used by the
+member feed and admin list. Reports bytes returned by the database driver
+and median latency. Run from the backend directory:
+
+    python scripts/bench_list_projection.py --rows 300 --photo-kb 200
+"""
+import argparse
+import base64
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_projection.db"
+
+from sqlalchemy import desc, select  # noqa: E402
+from sqlalchemy.engine import cursor as cursor_module  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.db.init_db import init_db  # noqa: E402
+from app.db.session import engine  # noqa: E402
+from app.models.registration import Registration  # noqa: E402
+from app.repositories.profile import list_recent_profiles_for_member  # noqa: E402
+from app.repositories.registration import list_registrations_paginated  # noqa: E402
+from app.services.count_cache import registration_count_cache  # noqa: E402
+from app.services.member_cache import MemberAuthSnapshot  # noqa: E402
+from app.services.profile_card import apply_profile_card_columns  # noqa: E402
+
+
+def _seed(count: int, photo_kb: int) -> None:
+    init_db()
+    photo = "data:image/jpeg;base64," + base64.b64encode(os.urandom(photo_kb * 768)).decode("ascii")
+    with Session(bind=engine) as db:
+        rows = [
+            Registration(
+                member_id=f"VV-{index:06d}",
+                name=f"Member {index}",
+                password_hash="x",
+                gender="Female",
+                dob="1996-03-14",
+                city="Chennai",
+                status="Verified",
+                is_active=True,
+                credits=3,
+                extra_data={
+                    "nakshatra": "Rohini",
+                    "padham": "2",
+                    "rasi": "Rishabam",
+                    "height": "5'4\"",
+                    "profilePhoto": {"name": "photo.jpg", "dataUrl": photo, "preview": photo},
+                },
+            )
+            for index in range(1, count + 1)
+        ]
+        for row in rows:
+            apply_profile_card_columns(row)
+        db.add_all(rows)
+        db.commit()
+
+
+class _ByteCounter:
+    def __init__(self) -> None:
+        self.total = 0
+
+    def __call__(self, rows) -> None:
+        for row in rows:
+            for value in row:
+                if isinstance(value, (str, bytes)):
+                    self.total += len(value)
+                elif value is not None:
+                    self.total += 8
+
+
+def _measure(label: str, run, repeats: int) -> None:
+    counter = _ByteCounter()
+    original_fetchall = cursor_module.CursorResult._fetchall_impl
+
+    def counting_fetchall(result):
+        rows = original_fetchall(result)
+        counter(rows)
+        return rows
+
+    timings = []
+    cursor_module.CursorResult._fetchall_impl = counting_fetchall
+    try:
+        for _ in range(repeats):
+            registration_count_cache.clear()
+            with Session(bind=engine) as db:
+                started = time.perf_counter()
+                run(db)
+                timings.append((time.perf_counter() - started) * 1000)
+    finally:
+        cursor_module.CursorResult._fetchall_impl = original_fetchall
+    print(f"{label:<28} {counter.total / repeats / 1024:>10.1f} KiB/request  p50={statistics.median(timings):.1f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=300)
+    parser.add_argument("--photo-kb", type=int, default=200)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+
+    _seed(args.rows, args.photo_kb)
+    member = MemberAuthSnapshot(member_id="VV-BENCH", gender="Male", is_active=True, credits=3, version=None)
+    full_page = (
+        select(Registration)
+        .where(Registration.is_active.is_(True), Registration.gender == "Female")
+        .order_by(desc(Registration.created_at))
+        .limit(args.page_size)
+    )
+
+    _measure("feed: full rows", lambda db: db.scalars(full_page).all(), args.repeats)
+    _measure(
+        "feed: projected",
+        lambda db: list_recent_profiles_for_member(db, member, page_size=args.page_size),
+        args.repeats,
+    )
+    _measure("admin: full rows", lambda db: db.scalars(full_page).all(), args.repeats)
+    _measure(
+        "admin: projected",
+        lambda db: list_registrations_paginated(db, page=1, page_size=args.page_size),
+        args.repeats,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Login-storm benchmark.
+
+Fires a burst of concurrent member logins while sampling the latency of an
+ordinary sync endpoint, once with bcrypt on the dedicated hashing pool and
+once with bcrypt run inline on the shared AnyIO threadpool (the old
+behaviour). Run from the backend directory:
+
+    python scripts/bench_login_storm.py --logins 200 --probes 100
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_login.db"
+
+import httpx  # noqa: E402
+from fastapi.concurrency import run_in_threadpool  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.db.init_db import init_db  # noqa: E402
+from app.db.session import engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.registration import Registration  # noqa: E402
+from app.services.security import hash_password, password_hasher  # noqa: E402
+
+PASSWORD = "storm-password"
+
+
+def _seed(member_count: int) -> list[str]:
+    init_db()
+    password_hash = hash_password(PASSWORD)
+    with Session(bind=engine) as db:
+        rows = [
+            Registration(
+                member_id=f"VV-{index:06d}",
+                name=f"Member {index}",
+                password_hash=password_hash,
+                gender="Male" if index % 2 else "Female",
+                status="Verified",
+                is_active=True,
+                credits=3,
+                extra_data={},
+            )
+            for index in range(1, member_count + 1)
+        ]
+        db.add_all(rows)
+        db.commit()
+        return [row.member_id for row in rows]
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def _probe(client: httpx.AsyncClient, count: int) -> list[float]:
+    samples = []
+    for _ in range(count):
+        started = time.perf_counter()
+        response = await client.get("/api/public/profiles/recent-verified")
+        response.raise_for_status()
+        samples.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(0.005)
+    return samples
+
+
+async def _login(client: httpx.AsyncClient, member_id: str) -> int:
+    response = await client.post("/api/member-login", json={"memberId": member_id, "password": PASSWORD})
+    return response.status_code
+
+
+async def _run(member_ids: list[str], logins: int, probes: int) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        idle = await _probe(client, probes)
+        started = time.perf_counter()
+        storm = asyncio.gather(*[_login(client, member_ids[i % len(member_ids)]) for i in range(logins)])
+        loaded = await _probe(client, probes)
+        statuses = await storm
+        elapsed = time.perf_counter() - started
+    return {
+        "idle_p50": statistics.median(idle),
+        "idle_p95": _percentile(idle, 0.95),
+        "storm_p50": statistics.median(loaded),
+        "storm_p95": _percentile(loaded, 0.95),
+        "logins_per_sec": logins / elapsed,
+        "ok": statuses.count(200),
+        "busy": statuses.count(503),
+    }
+
+
+def _print(label: str, result: dict) -> None:
+    print(
+        f"{label:<10} probe p50 idle={result['idle_p50']:.1f}ms storm={result['storm_p50']:.1f}ms | "
+        f"p95 idle={result['idle_p95']:.1f}ms storm={result['storm_p95']:.1f}ms | "
+        f"logins/s={result['logins_per_sec']:.1f} ok={result['ok']} busy={result['busy']}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--members", type=int, default=50)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--probes", type=int, default=100)
+    args = parser.parse_args()
+
+    member_ids = _seed(args.members)
+
+    _print("pool", asyncio.run(_run(member_ids, args.logins, args.probes)))
+    print("hasher:", password_hasher.metrics())
+
+    async def _inline(func, *func_args):
+        return await run_in_threadpool(func, *func_args)
+
+    password_hasher.run = _inline
+    _print("inline", asyncio.run(_run(member_ids, args.logins, args.probes)))
+    password_hasher.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Recommendation scoring benchmark.
+
+Builds a synthetic candidate pool (random stars, signs, gothrams and horoscope preferences) and times
+rank_candidates, the per-request vectorized scoring + top-k selection behind
+/api/member-profiles/recommended. Also reports the one-off cost of building the pool arrays, which is
+cached per gender bucket. Run from the backend directory:
+
+    python scripts/bench_recommendations.py --candidates 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.porutham import NAKSHATRAS, RASIS  # noqa: E402
+from app.services.recommendations import CandidatePool, Seeker, rank_candidates  # noqa: E402
+
+GOTHRAMS = ["Kashyapa", "Bharadwaja", "Vasishta", "Kaushika", "Atreya", "Srivatsa", "Harita", "Gautama", None]
+
+
+def _rows(count: int, rng: random.Random):
+    for row_id in range(1, count + 1):
+        yield (
+            row_id,
+            rng.choice(NAKSHATRAS)[0] if rng.random() > 0.1 else None,
+            rng.choice(RASIS)[0] if rng.random() > 0.1 else None,
+            rng.choice(GOTHRAMS),
+            rng.choice(["Yes", "No", None]),
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=100000)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    started = time.perf_counter()
+    pool = CandidatePool.from_rows(_rows(args.candidates, rng))
+    print(f"built pool of {len(pool)} candidates in {(time.perf_counter() - started) * 1000:.0f}ms (cached per bucket)")
+
+    seekers = [
+        ("groom, matching required", Seeker(0, "groom", "Ashwini", "Mesham", "Kashyapa", "Yes")),
+        ("bride, no preference", Seeker(0, "bride", "Rohini", "Rishabam", "Atreya", "No")),
+        ("unknown side and star", Seeker(0, None)),
+    ]
+    for label, seeker in seekers:
+        timings = []
+        page = []
+        for _ in range(args.repeats):
+            started = time.perf_counter()
+            page, total = rank_candidates(pool, seeker, limit=args.page_size + 1)
+            timings.append((time.perf_counter() - started) * 1000)
+        cursor = page[args.page_size - 1]
+        started = time.perf_counter()
+        rank_candidates(pool, seeker, limit=args.page_size + 1, after=(cursor[1], cursor[0]))
+        seek_ms = (time.perf_counter() - started) * 1000
+        timings.sort()
+        print(
+            f"{label:<26} eligible={total:>6}  p50={statistics.median(timings):6.2f}ms  "
+            f"p95={timings[int(len(timings) * 0.95) - 1]:6.2f}ms  cursor page={seek_ms:6.2f}ms  top score={page[0][1]}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Similar-profiles benchmark.
+
+Builds the in-memory feature matrix from synthetic registrations split across gender buckets and reports
+build time, memory, nearest-neighbour query latency, and the cost of an incremental refresh after a batch
+of edits. Run from the backend directory:
+
+    python scripts/bench_similar_profiles.py --rows 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.profile_features import FeatureSource, ProfileFeatureIndex  # noqa: E402
+
+EDUCATION = ["BE", "B.Tech", "M.Tech", "MBA", "MBBS", "B.Com", "M.Sc", "PhD", "Diploma", None]
+WORK = ["IT", "Banking", "Doctor", "Engineering", "Government", "Business", "Education", "Other", None]
+CITIES = ["Chennai", "Bengaluru", "Coimbatore", "Madurai", "Hyderabad", "Pune", "Mumbai", "Delhi", "Singapore", None]
+SECTS = ["Vadakalai", "Thenkalai", "Smartha", "Madhwa", None]
+CURRENCIES = ["INR - Indian Rupee"] * 8 + ["USD - US Dollar", "AED - UAE Dirham"]
+
+
+def _source(row_id: int, rng: random.Random, active: bool = True) -> FeatureSource:
+    return FeatureSource(
+        id=row_id,
+        gender="Female" if row_id % 2 else "Male",
+        is_active=active,
+        birth_date=date(rng.randint(1975, 2003), rng.randint(1, 12), rng.randint(1, 28)) if rng.random() > 0.05 else None,
+        education=rng.choice(EDUCATION),
+        occupation_bucket=rng.choice(WORK),
+        city=rng.choice(CITIES),
+        sect=rng.choice(SECTS),
+        salary=str(rng.randint(2, 400) * 10000) if rng.random() > 0.2 else None,
+        salary_currency=rng.choice(CURRENCIES),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--edits", type=int, default=100)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    sources = [_source(row_id, rng) for row_id in range(1, args.rows + 1)]
+    index = ProfileFeatureIndex()
+    index.refresh(lambda: sources, lambda ids: [])
+    metrics = index.metrics()
+    print(
+        f"built {args.rows} rows in {metrics['last_build_ms']:.0f}ms; partitions={metrics['partitions']}; "
+        f"arrays={metrics['bytes'] / 1024 / 1024:.1f} MiB ({metrics['bytes'] / args.rows:.0f} B/row incl. headroom)"
+    )
+
+    timings = []
+    for _ in range(args.queries):
+        target = rng.randint(1, args.rows)
+        started = time.perf_counter()
+        index.similar(target, args.limit)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    print(
+        f"similar (limit {args.limit}): p50={statistics.median(timings):.2f}ms "
+        f"p95={timings[int(len(timings) * 0.95) - 1]:.2f}ms max={timings[-1]:.2f}ms"
+    )
+
+    edited = {rng.randint(1, args.rows) for _ in range(args.edits)}
+    for row_id in edited:
+        index.mark_stale(row_id)
+    replacements = {row_id: _source(row_id, rng, active=rng.random() > 0.1) for row_id in edited}
+    started = time.perf_counter()
+    index.refresh(lambda: sources, lambda ids: [replacements[row_id] for row_id in ids])
+    print(f"incremental refresh of {len(edited)} edited rows: {(time.perf_counter() - started) * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Feed and profile detail round-trip check.
+
+Counts the SQL statements issued by GET /api/member-profiles/recent (with
+the count cache cold, warm and with includeTotal=false) and by
+GET /api/member-profiles/{profileId} for a locked and an unlocked profile.
+The page rows, their unlocked flags and the total come from one statement,
+so each request must issue exactly one once the member auth cache is warm.
+Exits with status 1 otherwise. Run from the backend directory:
+
+    python scripts/count_feed_statements.py --profiles 30
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/count_feed.db"
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.db.session import engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.registration import Registration  # noqa: E402
+from app.services.count_cache import registration_count_cache  # noqa: E402
+
+PASSWORD = "count-password"
+
+
+class _StatementCounter:
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.statements.append(statement)
+
+
+def _register(client: TestClient, name: str, gender: str) -> str:
+    response = client.post("/api/registrations", json={"name": name, "password": PASSWORD, "gender": gender})
+    response.raise_for_status()
+    return response.json()["id"]
+
+
+def _login(client: TestClient, member_id: str) -> dict:
+    response = client.post("/api/member-login", json={"memberId": member_id, "password": PASSWORD})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['token']}"}
+
+
+def _set_credits(member_id: str, credits: int) -> None:
+    with Session(bind=engine) as db:
+        db.execute(Registration.__table__.update().where(Registration.member_id == member_id).values(credits=credits))
+        db.commit()
+
+
+def _count(client: TestClient, path: str, headers: dict) -> tuple[int, list[str]]:
+    counter = _StatementCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    try:
+        response = client.get(path, headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", counter)
+    response.raise_for_status()
+    return len(counter.statements), counter.statements
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", type=int, default=30)
+    args = parser.parse_args()
+
+    failures = []
+    with TestClient(app) as client:
+        profiles = [_register(client, f"Bride {index}", "Female") for index in range(args.profiles)]
+        member = _register(client, "Feed Reader", "Male")
+        _set_credits(member, 1)
+        headers = _login(client, member)
+        client.post(f"/api/member-profiles/{profiles[0]}/unlock", headers=headers).raise_for_status()
+        # Warm the member auth cache so only the feed and detail queries are counted.
+        client.get(f"/api/member-profiles/{profiles[1]}", headers=headers).raise_for_status()
+
+        registration_count_cache.clear()
+        checks = [
+            ("feed, count cache cold", "/api/member-profiles/recent?pageSize=10"),
+            ("feed, count cache warm", "/api/member-profiles/recent?pageSize=10"),
+            ("feed, includeTotal=false", "/api/member-profiles/recent?pageSize=10&page=2&includeTotal=false"),
+            ("detail, unlocked", f"/api/member-profiles/{profiles[0]}"),
+            ("detail, locked", f"/api/member-profiles/{profiles[2]}"),
+        ]
+        for label, path in checks:
+            count, statements = _count(client, path, headers)
+            print(f"{label:<28} {count} statement(s)")
+            if count != 1:
+                failures.append(f"{label}: {count} statements, expected 1")
+                for statement in statements:
+                    print(f"    {' '.join(statement.split())[:140]}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
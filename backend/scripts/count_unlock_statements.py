@@ -0,0 +1,99 @@
+"""Bulk unlock statement-count check.
+
+Counts the SQL statements issued by POST /api/member-profiles/unlock for
+shortlists of different sizes. Eligibility, the access claim, the balance
+read and the debit are one statement each and the response is built from
+the rows already loaded, so the count must not grow with the number of
+profiles. Exits with status 1 if it does or exceeds --max-statements. Run
+from the backend directory:
+
+    python scripts/count_unlock_statements.py --sizes 1 10 30
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/count_unlocks.db"
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.db.session import engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.registration import Registration  # noqa: E402
+
+PASSWORD = "count-password"
+
+
+class _StatementCounter:
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.statements.append(statement)
+
+
+def _register(client: TestClient, name: str, gender: str) -> str:
+    response = client.post("/api/registrations", json={"name": name, "password": PASSWORD, "gender": gender})
+    response.raise_for_status()
+    return response.json()["id"]
+
+
+def _login(client: TestClient, member_id: str) -> dict:
+    response = client.post("/api/member-login", json={"memberId": member_id, "password": PASSWORD})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['token']}"}
+
+
+def _set_credits(member_id: str, credits: int) -> None:
+    with Session(bind=engine) as db:
+        db.execute(Registration.__table__.update().where(Registration.member_id == member_id).values(credits=credits))
+        db.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 30])
+    parser.add_argument("--max-statements", type=int, default=8)
+    args = parser.parse_args()
+
+    failures = []
+    counts = {}
+    with TestClient(app) as client:
+        for size in args.sizes:
+            profiles = [_register(client, f"Bride {size}-{index}", "Female") for index in range(size)]
+            member = _register(client, f"Shortlister {size}", "Male")
+            _set_credits(member, size)
+            headers = _login(client, member)
+            # Warm the member auth cache so only the unlock itself is counted.
+            client.get("/api/member-profiles/recent?pageSize=1&includeTotal=false", headers=headers).raise_for_status()
+
+            counter = _StatementCounter()
+            event.listen(engine, "before_cursor_execute", counter)
+            try:
+                response = client.post("/api/member-profiles/unlock", headers=headers, json={"profileIds": profiles})
+            finally:
+                event.remove(engine, "before_cursor_execute", counter)
+            response.raise_for_status()
+            body = response.json()
+            counts[size] = len(counter.statements)
+            print(f"{size:>3} profiles: {counts[size]} statements, creditsSpent={body['creditsSpent']}")
+            if body["creditsSpent"] != size or len(body["items"]) != size:
+                failures.append(f"{size} profiles: expected every profile unlocked")
+            if counts[size] > args.max_statements:
+                failures.append(f"{size} profiles: {counts[size]} statements > {args.max_statements}")
+                for statement in counter.statements:
+                    print(f"    {' '.join(statement.split())[:140]}")
+
+    if len(set(counts.values())) > 1:
+        failures.append(f"statement count grows with shortlist size: {counts}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Registration enum backfill and index-usage check.
+
+Seeds registrations with legacy free-text status and gender spellings ("verified", "m", " female "),
+restarts init_db so the batched backfill normalizes them, then captures the SQL issued by the member feed
+and the public carousel and prints SQLite's EXPLAIN QUERY PLAN for each. Exits non-zero if a recognised value
+is left unnormalized, an unrecognised one ("??", "other") is rewritten, or a query does not search the
+expected index. Run from the backend directory:
+
+    python scripts/explain_registration_indexes.py --rows 5000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/explain_indexes.db"
+
+from sqlalchemy import CheckConstraint, MetaData, event, func, insert, select, text  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.db.init_db import init_db  # noqa: E402
+from app.db.session import engine  # noqa: E402
+from app.models.registration import Registration  # noqa: E402
+from app.repositories.profile import list_recent_profiles_for_member, list_recent_verified_profiles  # noqa: E402
+from app.services.member_cache import MemberAuthSnapshot  # noqa: E402
+from app.services.registration_enums import normalize_gender, normalize_status  # noqa: E402
+
+LEGACY_STATUSES = ["New", "new", "verified", "Verified", " VERIFIED ", "in review", "approved", "on-hold", "??"]
+LEGACY_GENDERS = ["Male", "m", "male", "Female", "f", " female ", "F", "", None, "other"]
+
+
+def _seed_legacy(count: int) -> None:
+    # Databases created before the checks existed hold these values; create the table the way they had it.
+    legacy = Registration.__table__.to_metadata(MetaData())
+    for constraint in [c for c in legacy.constraints if isinstance(c, CheckConstraint)]:
+        legacy.constraints.remove(constraint)
+    legacy.create(engine)
+    init_db()
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "member_id": f"VV-{index:06d}",
+            "name": f"Member {index}",
+            "password_hash": "x",
+            "gender": random.choice(LEGACY_GENDERS),
+            "status": random.choice(LEGACY_STATUSES),
+            "is_active": index % 10 != 0,
+            "credits": 0,
+            "session_version": 0,
+            "extra_data": {},
+            "has_photo": False,
+            "card_version": 0,
+            "created_at": now - timedelta(minutes=index),
+            "updated_at": now - timedelta(minutes=index),
+        }
+        for index in range(1, count + 1)
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(Registration), rows)
+        conn.execute(
+            text(
+                "CREATE INDEX ix_registrations_recent_verified "
+                "ON registrations (is_active, lower(coalesce(status, '')), created_at)"
+            )
+        )
+
+
+def _check_backfill() -> bool:
+    with Session(bind=engine) as db:
+        statuses = dict(db.execute(select(Registration.status, func.count()).group_by(Registration.status)).all())
+        genders = dict(db.execute(select(Registration.gender, func.count()).group_by(Registration.gender)).all())
+        old_index = db.scalar(
+            text("SELECT count(*) FROM sqlite_master WHERE type = 'index' AND name = 'ix_registrations_recent_verified'")
+        )
+    print(f"statuses: {statuses}")
+    print(f"genders:  {genders}")
+    # Recognised spellings become canonical; unrecognised ones are reported and kept, never reset.
+    expected_statuses = {normalize_status(value) or value for value in LEGACY_STATUSES}
+    expected_genders = {
+        normalize_gender(value) or (value if (value or "").strip() else None) for value in LEGACY_GENDERS
+    }
+    ok = set(statuses) == expected_statuses and set(genders) == expected_genders
+    if old_index:
+        print("expression index ix_registrations_recent_verified was not dropped")
+        ok = False
+    return ok
+
+
+def _captured_statements(run) -> list[tuple[str, object]]:
+    statements: list[tuple[str, object]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        with Session(bind=engine) as db:
+            run(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    return statements
+
+
+def _explain(label: str, run, expected_index: str) -> bool:
+    statement, parameters = _captured_statements(run)[0]
+    with engine.connect() as conn:
+        plan = [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()]
+    print(f"\n{label}:")
+    for step in plan:
+        print(f"  {step}")
+    used = any(expected_index in step for step in plan)
+    print(f"  -> {'uses' if used else 'DOES NOT USE'} {expected_index}")
+    return used
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000)
+    args = parser.parse_args()
+
+    random.seed(25)
+    _seed_legacy(args.rows)
+    init_db()
+    ok = _check_backfill()
+    with engine.connect() as conn:
+        conn.exec_driver_sql("ANALYZE")
+
+    member = MemberAuthSnapshot(member_id="VV-EXPLAIN", gender="Male", is_active=True, credits=0, version=None)
+    ok &= _explain(
+        "member feed",
+        lambda db: list_recent_profiles_for_member(db, member, include_total=False),
+        "ix_registrations_feed",
+    )
+    ok &= _explain(
+        "public carousel",
+        lambda db: list_recent_verified_profiles(db, limit=8),
+        "ix_registrations_verified_recent",
+    )
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Move inline data-URL profile photos out of registrations.extra_data.
+
+Walks registrations in id order, writes each embedded photo to the
+content-addressed photo store and replaces extra_data.profilePhoto with the
+small {hash, url, contentType, size} reference. Commits once per batch, so
+the script can be interrupted and re-run; rows that already hold a reference
+are skipped. Run from the backend directory:
+
+    python scripts/migrate_profile_photos.py --batch-size 200
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select  # noqa: E402
+from sqlalchemy.orm import load_only  # noqa: E402
+
+from app.db.json_columns import json_text  # noqa: E402
+from app.db.session import SessionLocal  # noqa: E402
+from app.models.registration import Registration  # noqa: E402
+from app.services.photo_store import externalize_photo_value  # noqa: E402
+from app.services.profile_card import apply_profile_card_columns  # noqa: E402
+
+
+def _migrate_batch(db, after_id: int, batch_size: int) -> tuple[int, int, int, int]:
+    rows = db.scalars(
+        select(Registration)
+        .options(load_only(Registration.id, Registration.member_id, Registration.extra_data))
+        .where(Registration.id > after_id, json_text(Registration.extra_data, "profilePhoto").like("%data:%"))
+        .order_by(Registration.id)
+        .limit(batch_size)
+    ).all()
+    migrated = failed = 0
+    for row in rows:
+        extra_data = dict(row.extra_data or {})
+        try:
+            reference = externalize_photo_value(extra_data.get("profilePhoto"))
+        except ValueError as exc:
+            failed += 1
+            print(f"  {row.member_id}: skipped ({exc})")
+            continue
+        if reference is extra_data.get("profilePhoto"):
+            continue
+        extra_data["profilePhoto"] = reference
+        row.extra_data = extra_data
+        apply_profile_card_columns(row)
+        migrated += 1
+    db.commit()
+    last_id = rows[-1].id if rows else after_id
+    return len(rows), migrated, failed, last_id
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+
+    scanned = migrated = failed = 0
+    last_id = 0
+    while True:
+        with SessionLocal() as db:
+            batch_rows, batch_migrated, batch_failed, last_id = _migrate_batch(db, last_id, args.batch_size)
+        if batch_rows == 0:
+            break
+        scanned += batch_rows
+        migrated += batch_migrated
+        failed += batch_failed
+        print(f"scanned={scanned} migrated={migrated} failed={failed} last_id={last_id}")
+    print(f"done: migrated {migrated} photo(s), {failed} could not be decoded")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Concurrent unlock stress check.
+
+Fires parallel POST /api/member-profiles/{id}/unlock requests from worker
+threads and verifies the credit ledger afterwards:
+
+- one member with a few credits tapping unlock on many different profiles at
+  once must end at exactly 0 credits with one access row per credit spent;
+- one member tapping unlock on the same profile from every thread must be
+  charged exactly once.
+
+Any 5xx response or ledger mismatch fails the run (exit status 1). Run from
+the backend directory:
+
+    python scripts/stress_unlocks.py --threads 50 --credits 10
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/stress_unlocks.db"
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import func, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.db.session import engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.member_profile_access import MemberProfileAccess  # noqa: E402
+from app.models.registration import Registration  # noqa: E402
+
+PASSWORD = "stress-password"
+
+
+def _register(client: TestClient, name: str, gender: str) -> str:
+    response = client.post("/api/registrations", json={"name": name, "password": PASSWORD, "gender": gender})
+    response.raise_for_status()
+    return response.json()["id"]
+
+
+def _login(client: TestClient, member_id: str) -> dict:
+    response = client.post("/api/member-login", json={"memberId": member_id, "password": PASSWORD})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['token']}"}
+
+
+def _set_credits(member_id: str, credits: int) -> None:
+    with Session(bind=engine) as db:
+        db.execute(Registration.__table__.update().where(Registration.member_id == member_id).values(credits=credits))
+        db.commit()
+
+
+def _ledger(member_id: str) -> tuple[int, int]:
+    with Session(bind=engine) as db:
+        credits = db.scalar(select(Registration.credits).where(Registration.member_id == member_id))
+        unlocked = db.scalar(
+            select(func.count()).select_from(MemberProfileAccess).where(MemberProfileAccess.member_id == member_id)
+        )
+        return credits, unlocked
+
+
+def _burst(client: TestClient, headers: dict, profile_ids: list[str]) -> Counter:
+    barrier = threading.Barrier(len(profile_ids))
+
+    def unlock(profile_id: str) -> int:
+        barrier.wait()
+        return client.post(f"/api/member-profiles/{profile_id}/unlock", headers=headers).status_code
+
+    with ThreadPoolExecutor(max_workers=len(profile_ids)) as pool:
+        return Counter(pool.map(unlock, profile_ids))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=50)
+    parser.add_argument("--credits", type=int, default=10)
+    args = parser.parse_args()
+
+    failures = []
+    with TestClient(app) as client:
+        profiles = [_register(client, f"Bride {index}", "Female") for index in range(args.threads)]
+
+        spender = _register(client, "Many Taps", "Male")
+        _set_credits(spender, args.credits)
+        statuses = _burst(client, _login(client, spender), profiles)
+        server_errors = sum(count for code, count in statuses.items() if code >= 500)
+        credits, unlocked = _ledger(spender)
+        print(f"{args.threads} profiles, {args.credits} credits: statuses={dict(statuses)} credits={credits} unlocked={unlocked}")
+        if credits != 0 or unlocked != args.credits or statuses[200] != args.credits:
+            failures.append("different profiles: credits over- or under-spent")
+
+        repeater = _register(client, "Same Tap", "Male")
+        _set_credits(repeater, args.credits)
+        statuses = _burst(client, _login(client, repeater), [profiles[0]] * args.threads)
+        server_errors += sum(count for code, count in statuses.items() if code >= 500)
+        credits, unlocked = _ledger(repeater)
+        print(f"{args.threads} taps on one profile: statuses={dict(statuses)} credits={credits} unlocked={unlocked}")
+        if credits != args.credits - 1 or unlocked != 1 or statuses[200] != args.threads:
+            failures.append("same profile: charged more than once")
+
+        if server_errors:
+            failures.append(f"{server_errors} server errors")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
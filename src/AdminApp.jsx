@@ -55,7 +55,8 @@ const AdminApp = () => {
     search: "",
     isActive: "all",
     useCreditFilter: false,
-    maxCredits: 50
+    maxCredits: 50,
+    fuzzy: false
   });
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState("");
@@ -118,9 +119,10 @@ const AdminApp = () => {
       query.set("page", String(page));
       query.set("pageSize", String(pageSize));
       if (filters.search.trim()) query.set("search", filters.search.trim());
+      if (filters.search.trim() && filters.fuzzy) query.set("fuzzy", "true");
       if (filters.isActive !== "all") query.set("isActive", filters.isActive);
       if (filters.useCreditFilter) query.set("maxCredits", String(filters.maxCredits));
-      query.set("sortBy", "created_at");
+      query.set("sortBy", filters.search.trim() ? "relevance" : "created_at");
       query.set("sortOrder", "desc");
 
       const data = await apiFetch(`/admin/registrations?${query.toString()}`, {
@@ -286,7 +288,8 @@ const AdminApp = () => {
       search: "",
       isActive: "all",
       useCreditFilter: false,
-      maxCredits: 50
+      maxCredits: 50,
+      fuzzy: false
     });
     setPage(1);
     setQueryVersion((v) => v + 1);
@@ -447,6 +450,15 @@ const AdminApp = () => {
                   <span>Enable credit filter</span>
                 </label>
 
+                <label style={{ display: "flex", alignItems: "center", gap: "8px", marginBottom: "10px", fontSize: "13px" }}>
+                  <input
+                    type="checkbox"
+                    checked={filters.fuzzy}
+                    onChange={(e) => setFilters((cur) => ({ ...cur, fuzzy: e.target.checked }))}
+                  />
+                  <span>Match names that sound alike</span>
+                </label>
+
                 <label style={{ display: "grid", gap: "6px", marginBottom: "12px", fontSize: "13px" }}>
                   <span>Credits less than or equal: {filters.maxCredits}</span>
                   <input
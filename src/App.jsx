@@ -1,5 +1,5 @@
 import { useEffect, useMemo, useState } from "react";
-import { apiFetch } from "./lib/api";
+import { apiFetch, resolveApiUrl } from "./lib/api";
 import PublicSharedProfileView from "./components/PublicSharedProfileView";
 import ShareModal from "./components/ShareModal";
 
@@ -255,14 +255,14 @@ const getGroupedAdditionalDetails = (additionalData = {}) => {
 
 const extractImageFromExtraData = (extraData = {}) => {
   if (!extraData || typeof extraData !== "object") return "";
-  if (typeof extraData.imageUrl === "string" && extraData.imageUrl.trim()) return extraData.imageUrl.trim();
+  if (typeof extraData.imageUrl === "string" && extraData.imageUrl.trim()) return resolveApiUrl(extraData.imageUrl.trim());
 
   const profilePhoto = extraData.profilePhoto;
-  if (typeof profilePhoto === "string" && profilePhoto.trim()) return profilePhoto.trim();
+  if (typeof profilePhoto === "string" && profilePhoto.trim()) return resolveApiUrl(profilePhoto.trim());
   if (profilePhoto && typeof profilePhoto === "object") {
     for (const key of ["url", "dataUrl", "preview", "path"]) {
       const value = profilePhoto[key];
-      if (typeof value === "string" && value.trim()) return value.trim();
+      if (typeof value === "string" && value.trim()) return resolveApiUrl(value.trim());
     }
   }
   return "";
@@ -343,6 +343,7 @@ const App = () => {
   const [profilesTotalPages, setProfilesTotalPages] = useState(1);
   const [selectedProfile, setSelectedProfile] = useState(null);
   const [selectedProfileLoading, setSelectedProfileLoading] = useState(false);
+  const [similarProfiles, setSimilarProfiles] = useState([]);
   const [showUnlockConfirm, setShowUnlockConfirm] = useState(false);
   const [unlockBusy, setUnlockBusy] = useState(false);
   const [profileDraft, setProfileDraft] = useState({
@@ -386,6 +387,7 @@ const App = () => {
   const [inlineSaveBusy, setInlineSaveBusy] = useState(false);
   const [photoModalOpen, setPhotoModalOpen] = useState(false);
   const [photoPreview, setPhotoPreview] = useState("");
+  const [photoFile, setPhotoFile] = useState(null);
   const [photoSaveBusy, setPhotoSaveBusy] = useState(false);
   const [photoError, setPhotoError] = useState("");
 
@@ -495,6 +497,7 @@ const App = () => {
   const openPhotoModal = () => {
     const currentPhoto = extractImageFromExtraData(memberSession?.member?.extraData || {});
     setPhotoPreview(currentPhoto);
+    setPhotoFile(null);
     setPhotoError("");
     setPhotoModalOpen(true);
   };
@@ -517,6 +520,7 @@ const App = () => {
     const reader = new FileReader();
     reader.onload = () => {
       setPhotoPreview(String(reader.result || ""));
+      setPhotoFile(file);
       setPhotoError("");
     };
     reader.onerror = () => {
@@ -530,6 +534,16 @@ const App = () => {
     setPhotoSaveBusy(true);
     setPhotoError("");
     try {
+      let profilePhoto = photoPreview;
+      if (photoFile) {
+        const uploadBody = new FormData();
+        uploadBody.append("file", photoFile);
+        profilePhoto = await apiFetch("/photos", {
+          method: "POST",
+          headers: { Authorization: `Bearer ${memberSession.token}` },
+          body: uploadBody
+        });
+      }
       const updatedMember = await apiFetch("/member-profile", {
         method: "PATCH",
         headers: {
@@ -538,7 +552,7 @@ const App = () => {
         },
         body: JSON.stringify({
           extraData: {
-            profilePhoto: photoPreview
+            profilePhoto
           }
         })
       });
@@ -846,6 +860,23 @@ const App = () => {
     }
   };
 
+  useEffect(() => {
+    if (!showShareModal || !memberSession?.token || !shareMeta?.token) return;
+    let cancelled = false;
+    apiFetch(`/profile/share/${encodeURIComponent(shareMeta.token)}/stats`, {
+      headers: {
+        Authorization: `Bearer ${memberSession.token}`
+      }
+    })
+      .then((data) => {
+        if (!cancelled) setShareMeta((current) => ({ ...(current || {}), ...data }));
+      })
+      .catch(() => {});
+    return () => {
+      cancelled = true;
+    };
+  }, [showShareModal, memberSession?.token, shareMeta?.token]);
+
   useEffect(() => {
     const timer = setTimeout(() => {
       setDebouncedSearchQuery(globalSearchQuery);
@@ -1034,6 +1065,7 @@ const App = () => {
     setInlineSaveBusy(false);
     setPhotoModalOpen(false);
     setPhotoPreview("");
+    setPhotoFile(null);
     setPhotoSaveBusy(false);
     setPhotoError("");
   };
@@ -1072,6 +1104,9 @@ const App = () => {
           newPassword: passwordDraft.newPassword
         })
       });
+      if (response.token) {
+        setMemberSession((prev) => (prev ? { ...prev, token: response.token } : prev));
+      }
       setPasswordMessage(response.message || "Password updated successfully.");
       setPasswordDraft({ currentPassword: "", newPassword: "", confirmPassword: "" });
     } catch (err) {
@@ -1235,6 +1270,14 @@ const App = () => {
         }
       });
       setSelectedProfile(data);
+      setSimilarProfiles([]);
+      apiFetch(`/member-profiles/${profileId}/similar?limit=6`, {
+        headers: {
+          Authorization: `Bearer ${memberSession.token}`
+        }
+      })
+        .then((similar) => setSimilarProfiles(similar.items || []))
+        .catch(() => setSimilarProfiles([]));
       setMemberSession((current) =>
         current
           ? {
@@ -1608,7 +1651,7 @@ const App = () => {
                   <div className="match-detail-head">
                     <img
                       src={
-                        selectedProfile.profile.imageUrl ||
+                        resolveApiUrl(selectedProfile.profile.imageUrl) ||
                         "https://images.unsplash.com/photo-1524504388940-b1c1722653e1?auto=format&fit=crop&w=800&q=80"
                       }
                       alt={selectedProfile.profile.name}
@@ -1721,6 +1764,34 @@ const App = () => {
                       </button>
                     </div>
                   )}
+                  {similarProfiles.length > 0 && (
+                    <div className="card" style={{ marginTop: "14px" }}>
+                      <h3 style={{ marginBottom: "8px" }}>Similar Profiles</h3>
+                      <div className="recent-profile-grid">
+                        {similarProfiles.map((profile) => (
+                          <article
+                            key={profile.profileId}
+                            className="recent-profile-card"
+                            onClick={() => openProfileDetail(profile.profileId)}
+                          >
+                            <img
+                              src={
+                                resolveApiUrl(profile.imageUrl) ||
+                                "https://images.unsplash.com/photo-1524504388940-b1c1722653e1?auto=format&fit=crop&w=800&q=80"
+                              }
+                              alt={profile.name}
+                            />
+                            <div className="recent-profile-content">
+                              <h3>{profile.name}</h3>
+                              <p>{profile.age || "-"} yrs · {profile.city || "-"}</p>
+                              <p>{profile.education || "-"}</p>
+                              <p>{profile.occupation || "-"}</p>
+                            </div>
+                          </article>
+                        ))}
+                      </div>
+                    </div>
+                  )}
                 </div>
               )}
             </div>
@@ -1888,7 +1959,7 @@ const App = () => {
                     >
                       <img
                         src={
-                          profile.imageUrl ||
+                          resolveApiUrl(profile.imageUrl) ||
                           "https://images.unsplash.com/photo-1524504388940-b1c1722653e1?auto=format&fit=crop&w=800&q=80"
                         }
                         alt={profile.name}
@@ -1997,6 +2068,8 @@ const App = () => {
           shareUrl={getShareUrl(shareMeta)}
           shareStatus={resolveShareStatus(shareMeta)}
           expiresAt={shareMeta?.expiresAt}
+          viewCount={shareMeta?.viewCount}
+          lastAccessedAt={shareMeta?.lastAccessedAt}
           includeContactDetails={shareIncludeContactDetails}
           onToggleIncludeContactDetails={setShareIncludeContactDetails}
           expiresInDays={shareExpiresInDays}
@@ -2177,7 +2250,7 @@ const App = () => {
                 <article key={`${profile.profileId}-${index}`} className="home-recent-card">
                   <img
                     src={
-                      profile.imageUrl ||
+                      resolveApiUrl(profile.imageUrl) ||
                       "https://images.unsplash.com/photo-1524504388940-b1c1722653e1?auto=format&fit=crop&w=220&q=80"
                     }
                     alt={`Profile ${profile.profileId}`}
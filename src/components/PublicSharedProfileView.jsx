@@ -1,6 +1,6 @@
 import { useEffect, useState } from "react";
 
-import { apiFetch } from "../lib/api";
+import { apiFetch, resolveApiUrl } from "../lib/api";
 
 const PublicSharedProfileView = ({ token }) => {
   const [loading, setLoading] = useState(true);
@@ -84,7 +84,7 @@ const PublicSharedProfileView = ({ token }) => {
         </div>
 
         {profile.imageUrl && (
-          <img src={profile.imageUrl} alt={`${profile.name} profile`} className="shared-profile-image" />
+          <img src={resolveApiUrl(profile.imageUrl)} alt={`${profile.name} profile`} className="shared-profile-image" />
         )}
 
         <div className="shared-profile-grid">
@@ -10,6 +10,8 @@ const ShareModal = ({
   shareUrl,
   shareStatus,
   expiresAt,
+  viewCount,
+  lastAccessedAt,
   includeContactDetails,
   onToggleIncludeContactDetails,
   expiresInDays,
@@ -75,6 +77,12 @@ const ShareModal = ({
               Expires on: <strong>{new Date(expiresAt).toLocaleString()}</strong>
             </p>
           )}
+          {typeof viewCount === "number" && (
+            <p>
+              Views: <strong>{viewCount}</strong>
+              {lastAccessedAt && <> (last opened {new Date(lastAccessedAt).toLocaleString()})</>}
+            </p>
+          )}
         </div>
 
         {message && <p className={`form-message ${isError ? "error" : "success"}`}>{message}</p>}
@@ -2,6 +2,16 @@ const rawBase = import.meta.env.VITE_API_BASE_URL || "/api";
 
 const API_BASE_URL = rawBase.endsWith("/") ? rawBase.slice(0, -1) : rawBase;
 
+// Server-issued asset URLs (e.g. /api/photos/<hash>) are root-relative; resolve them against the API origin.
+export const resolveApiUrl = (url) => {
+  if (typeof url !== "string" || !url.startsWith("/") || url.startsWith("//")) return url;
+  try {
+    return new URL(url, new URL(API_BASE_URL, window.location.href)).href;
+  } catch {
+    return url;
+  }
+};
+
 export const apiFetch = async (path, options = {}) => {
   const normalizedPath = path.startsWith("/") ? path : `/${path}`;
   const response = await fetch(`${API_BASE_URL}${normalizedPath}`, options);